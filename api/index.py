@@ -1,21 +1,69 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, status, Query, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Float
-from sqlalchemy.orm import declarative_base, sessionmaker, Session
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from sqlalchemy import create_engine, event, Column, Integer, String, DateTime, Boolean, Float, Index, UniqueConstraint, and_, func, inspect, insert, or_, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.orm import declarative_base, sessionmaker, Session, make_transient_to_detached
 from datetime import datetime, timedelta
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextvars import ContextVar
 from pydantic import BaseModel, EmailStr, Field
-from jose import JWTError, jwt
-from mangum import Mangum
 import os
 import hashlib
 import secrets
+import base64
+import gzip
 import json
+import re
+import threading
+import time
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 # Database Configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./safezoneph_prod.db")
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+# WAL so requests on the instance's threadpool read while one writes; the busy
+# timeout queues writers on the lock instead of failing with "database is locked"
+SQLITE_PRAGMAS = (
+    ("journal_mode", os.getenv("SQLITE_JOURNAL_MODE", "WAL")),
+    ("synchronous", os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")),
+    ("busy_timeout", SQLITE_BUSY_TIMEOUT_MS),
+    ("cache_size", int(os.getenv("SQLITE_CACHE_SIZE", -64000))),
+    ("mmap_size", int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))),
+    ("temp_store", "MEMORY"),
+)
+
+if IS_SQLITE:
+    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000})
+
+    @event.listens_for(engine, "connect")
+    def configure_sqlite_connection(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+else:
+    engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
@@ -23,6 +71,18 @@ Base = declarative_base()
 SECRET_KEY = os.getenv("JWT_SECRET_KEY", secrets.token_urlsafe(32))
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", 1440))
+PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", 600000))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 256))
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 60))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", 10000))
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", 1024))
+
+# Cold-start behaviour: "lazy" prepares the schema on the first request that
+# opens a session, "import" does it at import time, "off" leaves it to
+# `python api/index.py migrate` at deploy time
+SCHEMA_SYNC = os.getenv("SCHEMA_SYNC", "lazy").lower()
+SEED_DEMO_USER = os.getenv("SEED_DEMO_USER", "true").lower() in ("1", "true", "yes")
 
 security = HTTPBearer()
 
@@ -48,6 +108,9 @@ class User(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_created_by_status_created_at", "created_by", "status", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -64,6 +127,9 @@ class Task(Base):
 
 class PointsHistory(Base):
     __tablename__ = "points_history"
+    __table_args__ = (
+        Index("ix_points_history_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False)
@@ -74,6 +140,10 @@ class PointsHistory(Base):
 
 class HelpRequest(Base):
     __tablename__ = "help_requests"
+    __table_args__ = (
+        Index("ix_help_requests_created_at", "created_at"),
+        Index("ix_help_requests_status_created_at", "status", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False)
@@ -90,6 +160,9 @@ class HelpRequest(Base):
 
 class GlobalAlert(Base):
     __tablename__ = "global_alerts"
+    __table_args__ = (
+        Index("ix_global_alerts_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False)
@@ -100,11 +173,36 @@ class GlobalAlert(Base):
     message = Column(String, nullable=False)
     affected_areas = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
-    acknowledged_by = Column(String, default="[]")
+    acknowledged_by = Column(String, default="[]")  # legacy, superseded by alert_acknowledgements
+    acknowledged_count = Column(Integer, default=0)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class AlertAcknowledgement(Base):
+    __tablename__ = "alert_acknowledgements"
+    __table_args__ = (
+        UniqueConstraint("alert_id", "user_id", name="uq_alert_acknowledgements_alert_id_user_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    alert_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class GlobalAlertArea(Base):
+    __tablename__ = "global_alert_areas"
+    __table_args__ = (
+        Index("ix_global_alert_areas_area_alert_id", "area", "alert_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    alert_id = Column(Integer, nullable=False, index=True)
+    area = Column(String, nullable=False)  # normalized barangay/city name, "*" for everyone
+
 class CommunityTask(Base):
     __tablename__ = "community_tasks"
+    __table_args__ = (
+        Index("ix_community_tasks_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -113,11 +211,271 @@ class CommunityTask(Base):
     urgency = Column(String, nullable=False)
     points = Column(Integer, nullable=False)
     status = Column(String, default="open")
-    volunteers = Column(String, default="[]")
+    volunteers = Column(String, default="[]")  # legacy, superseded by community_task_volunteers
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class CommunityTaskVolunteer(Base):
+    __tablename__ = "community_task_volunteers"
+    __table_args__ = (
+        UniqueConstraint("community_task_id", "user_id", name="uq_community_task_volunteers_task_id_user_id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    community_task_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False, index=True)
+    personal_task_id = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+class CollectionVersion(Base):
+    """Change counter per polled collection; bumped in the same transaction as each write"""
+    __tablename__ = "collection_versions"
+
+    key = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+class SchemaMigration(Base):
+    """One row per applied migration version"""
+    __tablename__ = "schema_migrations"
+
+    version = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
+
+def migrate_alert_acknowledgements(conn):
+    """Move pre-existing acknowledged_by JSON lists into alert_acknowledgements"""
+    columns = {column["name"] for column in inspect(conn).get_columns("global_alerts")}
+    if "acknowledged_count" in columns:
+        return
+    conn.execute(text("ALTER TABLE global_alerts ADD COLUMN acknowledged_count INTEGER DEFAULT 0"))
+    rows = conn.execute(text("SELECT id, acknowledged_by FROM global_alerts")).all()
+    for alert_id, acknowledged_by in rows:
+        try:
+            user_ids = {int(user_id) for user_id in json.loads(acknowledged_by or "[]")}
+        except ValueError:
+            continue
+        if not user_ids:
+            continue
+        conn.execute(insert(AlertAcknowledgement), [
+            {"alert_id": alert_id, "user_id": user_id, "created_at": datetime.utcnow()}
+            for user_id in user_ids
+        ])
+        conn.execute(
+            update(GlobalAlert.__table__)
+            .where(GlobalAlert.__table__.c.id == alert_id)
+            .values(acknowledged_count=len(user_ids))
+        )
+
+
+def migrate_task_volunteers(conn):
+    """Move legacy volunteers JSON lists into community_task_volunteers"""
+    migrated = select(CommunityTaskVolunteer.community_task_id)
+    tasks = conn.execute(select(CommunityTask.id, CommunityTask.volunteers).where(
+        CommunityTask.volunteers.isnot(None),
+        CommunityTask.volunteers != "[]",
+        ~CommunityTask.id.in_(migrated)
+    )).all()
+    rows = []
+    for task_id, volunteers in tasks:
+        try:
+            user_ids = {int(user_id) for user_id in json.loads(volunteers)}
+        except ValueError:
+            continue
+        rows.extend({"community_task_id": task_id, "user_id": user_id, "created_at": datetime.utcnow()} for user_id in user_ids)
+    if rows:
+        conn.execute(insert(CommunityTaskVolunteer), rows)
+
+
+def conflict_ignoring_insert(db: Session, model):
+    """INSERT ... ON CONFLICT DO NOTHING, or None when the dialect has no such clause"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert(model).on_conflict_do_nothing()
+
+def insert_ignoring_conflicts(db: Session, model, values: dict) -> bool:
+    """Idempotent single-row INSERT; returns False when a unique key already matched"""
+    statement = conflict_ignoring_insert(db, model)
+    if statement is None:
+        try:
+            with db.begin_nested():
+                db.execute(insert(model).values(**values))
+            return True
+        except IntegrityError:
+            return False
+    result = db.execute(statement.values(**values))
+    return result.rowcount == 1
+
+# Collection Versions
+HELP_REQUESTS_COLLECTION = "help_requests"
+GLOBAL_ALERTS_COLLECTION = "global_alerts"
+COMMUNITY_TASKS_COLLECTION = "community_tasks"
+
+def bump_collection_versions(db: Session, *keys: str):
+    """Advance the version of every collection written by the current transaction"""
+    keys = set(keys)
+    if not keys:
+        return
+    known = set(db.scalars(select(CollectionVersion.key).where(CollectionVersion.key.in_(keys))))
+    missing = [{"key": key, "version": 0} for key in sorted(keys - known)]
+    if missing:
+        # First write to a collection on this database; another request may be adding it too
+        statement = conflict_ignoring_insert(db, CollectionVersion)
+        if statement is None:
+            for row in missing:
+                insert_ignoring_conflicts(db, CollectionVersion, row)
+        else:
+            db.execute(statement, missing)
+    db.execute(
+        update(CollectionVersion)
+        .where(CollectionVersion.key.in_(keys))
+        .values(version=CollectionVersion.version + 1)
+    )
+
+def conditional_response(db: Session, key: str, request: Request, response: Response, variant: str = "") -> Optional[Response]:
+    """304 when the client's copy is current; otherwise stamps a strong ETag on the response.
+
+    The version is read before the rows, so a racing write can only make the
+    ETag older than the body, never newer.
+    """
+    version = db.scalar(select(CollectionVersion.version).where(CollectionVersion.key == key)) or 0
+    # Negotiated media type and content coding give distinct byte representations
+    encoding = f"{response_media_type.get()};{negotiate_content_encoding(request.headers.get('accept-encoding', ''))}"
+    digest = hashlib.sha256(f"{key}?{request.url.query}#{variant}#{encoding}".encode()).hexdigest()[:16]
+    etag = f'"{version}-{digest}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+        if "*" in candidates or etag in candidates:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+# Read Models
+HELP_REQUEST_COLUMNS = (
+    HelpRequest.id,
+    HelpRequest.user_name.label("userName"),
+    HelpRequest.type,
+    HelpRequest.title,
+    HelpRequest.description,
+    HelpRequest.location,
+    HelpRequest.urgency,
+    HelpRequest.status,
+    HelpRequest.responders_needed.label("respondersNeeded"),
+    HelpRequest.responders_count.label("respondersCount"),
+    HelpRequest.created_at.label("createdAt"),
+)
+
+GLOBAL_ALERT_COLUMNS = (
+    GlobalAlert.id,
+    GlobalAlert.created_by.label("createdBy"),
+    GlobalAlert.type,
+    GlobalAlert.priority,
+    GlobalAlert.title,
+    GlobalAlert.message,
+    GlobalAlert.affected_areas.label("affectedAreas"),
+    GlobalAlert.is_active.label("isActive"),
+    GlobalAlert.acknowledged_count.label("acknowledgedCount"),
+    GlobalAlert.created_at.label("createdAt"),
+)
+
+COMMUNITY_TASK_COLUMNS = (
+    CommunityTask.id,
+    CommunityTask.title,
+    CommunityTask.description,
+    CommunityTask.location,
+    CommunityTask.urgency,
+    CommunityTask.points,
+    CommunityTask.status,
+    CommunityTask.created_at.label("createdAt"),
+)
+
+def fetch_rows(db: Session, statement) -> list:
+    """Run a column-projected select and return plain dicts keyed by column label.
+
+    Nothing is hydrated into the identity map, so list endpoints skip ORM
+    instrumentation and per-row dict building.
+    """
+    result = db.execute(statement)
+    keys = tuple(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+def read_model_response(rows: list, response: Response) -> Response:
+    # Returned responses bypass FastAPI's header merge, so carry ETag etc. over
+    return FastJSONResponse(rows, headers=dict(response.headers))
+
+# Alert Area Helpers
+# Same namespaced keys as the backend: "city:<city>", "brgy:<city>/<barangay>"
+ALL_AREAS = "*"
+ALL_AREA_NAMES = {"*", "all", "all areas", "all barangays"}
+BARANGAY_PREFIX = re.compile(r"^(?:brgy\.?|barangay)\s+")
+
+def normalize_area(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    normalized = " ".join(name.casefold().split())
+    return normalized or None
+
+def city_key(city: Optional[str]) -> Optional[str]:
+    city = normalize_area(city)
+    return f"city:{city}" if city else None
+
+def barangay_key(city: Optional[str], barangay: Optional[str]) -> Optional[str]:
+    city, barangay = normalize_area(city), normalize_area(barangay)
+    if not city or not barangay:
+        return None
+    return f"brgy:{city}/{BARANGAY_PREFIX.sub('', barangay)}"
+
+def parse_alert_area(area: str, issuer_city: Optional[str]) -> Optional[str]:
+    """"Brgy. <name>" is a barangay in the issuer's city; any other bare name is a city"""
+    name = normalize_area(area)
+    if not name:
+        return None
+    if name in ALL_AREA_NAMES:
+        return ALL_AREAS
+    if name.startswith("city:"):
+        return city_key(name[len("city:"):])
+    if name.startswith("brgy:"):
+        city, _, barangay = name[len("brgy:"):].partition("/")
+        return barangay_key(city, barangay)
+    if BARANGAY_PREFIX.match(name):
+        return barangay_key(issuer_city, name)
+    return city_key(name)
+
+def alert_area_keys(affected_areas: Optional[str], issuer_city: Optional[str]) -> set:
+    """Area keys from the free-text field; alerts without areas reach everyone"""
+    parts = [part for part in re.split(r"[,;\n]", affected_areas or "") if part.strip()]
+    if not parts:
+        return {ALL_AREAS}
+    return {key for key in (parse_alert_area(part, issuer_city) for part in parts) if key}
+
+def user_area_keys(user: User) -> set:
+    keys = {key for key in (city_key(user.city), barangay_key(user.city, user.barangay)) if key}
+    keys.add(ALL_AREAS)
+    return keys
+
+def backfill_alert_areas(conn):
+    """Index alerts created before the area mapping table existed"""
+    mapped = select(GlobalAlertArea.alert_id)
+    alerts = conn.execute(
+        select(GlobalAlert.id, GlobalAlert.affected_areas, User.city)
+        .outerjoin(User, User.id == GlobalAlert.user_id)
+        .where(~GlobalAlert.id.in_(mapped))
+    ).all()
+    rows = [
+        {"alert_id": alert_id, "area": key}
+        for alert_id, affected_areas, issuer_city in alerts
+        for key in alert_area_keys(affected_areas, issuer_city)
+    ]
+    if rows:
+        conn.execute(insert(GlobalAlertArea), rows)
+
 
 # Auto-create demo user on startup
 def init_demo_user():
@@ -149,7 +507,85 @@ def init_demo_user():
     finally:
         db.close()
 
-init_demo_user()
+# Schema Migrations: versions are applied once, in order; never renumber or edit a shipped one
+MIGRATIONS = []  # (version, name, upgrade(conn))
+
+def migration(version: int, name: str):
+    def register(upgrade):
+        MIGRATIONS.append((version, name, upgrade))
+        return upgrade
+    return register
+
+def create_indexes(conn, *indexes: Index):
+    # IF NOT EXISTS keeps steps re-runnable where create_all already built the index
+    for index in indexes:
+        conn.execute(CreateIndex(index, if_not_exists=True))
+
+@migration(1, "baseline schema")
+def create_baseline_schema(conn):
+    Base.metadata.create_all(bind=conn)
+    # create_all skips indexes on tables that already exist
+    create_indexes(conn, *Task.__table__.indexes)
+    migrate_alert_acknowledgements(conn)
+    migrate_task_volunteers(conn)
+    backfill_alert_areas(conn)
+
+@migration(2, "hot predicate indexes")
+def create_hot_predicate_indexes(conn):
+    create_indexes(
+        conn,
+        *PointsHistory.__table__.indexes,
+        *HelpRequest.__table__.indexes,
+        *GlobalAlert.__table__.indexes,
+        *CommunityTask.__table__.indexes
+    )
+
+@migration(3, "help request status index")
+def create_help_request_status_index(conn):
+    create_indexes(conn, *HelpRequest.__table__.indexes)
+
+@migration(4, "namespaced area keys")
+def rekey_alert_areas(conn):
+    conn.execute(GlobalAlertArea.__table__.delete())
+    backfill_alert_areas(conn)
+
+def run_migrations() -> list:
+    """Apply pending migrations, each in its own transaction; returns the versions applied"""
+    SchemaMigration.__table__.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        applied = set(conn.scalars(select(SchemaMigration.version)))
+    newly_applied = []
+    for version, name, upgrade in sorted(MIGRATIONS, key=lambda step: step[0]):
+        if version in applied:
+            continue
+        try:
+            with engine.begin() as conn:
+                upgrade(conn)
+                conn.execute(insert(SchemaMigration).values(version=version, name=name, applied_at=datetime.utcnow()))
+        except IntegrityError:
+            # Another instance recorded this version first
+            continue
+        newly_applied.append(version)
+    return newly_applied
+
+_schema_lock = threading.Lock()
+_schema_ready = False
+
+def ensure_schema():
+    """Apply pending migrations and seed the demo account, once per process"""
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if _schema_ready:
+            return
+        run_migrations()
+        if SEED_DEMO_USER:
+            init_demo_user()
+        _schema_ready = True
+
+if SCHEMA_SYNC == "import":
+    ensure_schema()
 
 # Pydantic Models
 class RegisterRequest(BaseModel):
@@ -211,8 +647,110 @@ class GlobalAlertCreate(BaseModel):
     message: str
     affected_areas: Optional[str] = None
 
+# Response Encoding
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+response_media_type: ContextVar[str] = ContextVar("response_media_type", default="application/json")
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: orjson when installed, MessagePack when negotiated"""
+
+    def __init__(self, content, *args, **kwargs):
+        if response_media_type.get() == MSGPACK_MEDIA_TYPE:
+            self.media_type = MSGPACK_MEDIA_TYPE
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content) -> bytes:
+        if self.media_type == MSGPACK_MEDIA_TYPE:
+            return msgpack.packb(content, use_bin_type=True, default=encode_temporal)
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=encode_temporal).encode("utf-8")
+
+def encode_temporal(value):
+    # Read models hand raw column values to the encoder; match orjson's ISO format
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+def negotiate_content_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, honouring q=0"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip()] = quality
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+class ResponseEncodingMiddleware:
+    """Negotiates MessagePack bodies and compresses buffered responses.
+
+    Only single-chunk bodies of at least minimum_size bytes are compressed;
+    anything sent in several chunks passes through untouched.
+    """
+
+    def __init__(self, app, minimum_size: int):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        wants_msgpack = msgpack is not None and MSGPACK_MEDIA_TYPE in request_headers.get("accept", "")
+        content_encoding = negotiate_content_encoding(request_headers.get("accept-encoding", ""))
+        token = response_media_type.set(MSGPACK_MEDIA_TYPE if wants_msgpack else "application/json")
+        start_message = None
+
+        async def send_encoded(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+    
+            start, start_message = start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            content_type = headers.get("content-type", "")
+            if content_type.startswith(("application/json", MSGPACK_MEDIA_TYPE)):
+                headers.add_vary_header("Accept")
+            body = message.get("body", b"")
+            if (
+                content_encoding
+                and not message.get("more_body", False)
+                and len(body) >= self.minimum_size
+                and "content-encoding" not in headers
+            ):
+                if content_encoding == "br":
+                    body = brotli.compress(body, quality=5)
+                else:
+                    body = gzip.compress(body, compresslevel=6)
+                headers["Content-Encoding"] = content_encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                message = {**message, "body": body}
+            await send(start)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_encoded)
+        finally:
+            response_media_type.reset(token)
+
 # FastAPI App
-app = FastAPI(title="SafeZonePH API")
+app = FastAPI(title="SafeZonePH API", default_response_class=FastJSONResponse)
 
 # CORS Configuration
 app.add_middleware(
@@ -221,63 +759,271 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor", "ETag"],
 )
 
+# Compress and negotiate after CORS has added its headers
+app.add_middleware(ResponseEncodingMiddleware, minimum_size=COMPRESSION_MIN_BYTES)
+
 # Database Dependency
 def get_db():
+    if SCHEMA_SYNC == "lazy":
+        ensure_schema()
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+# Password Hashing
+PASSWORD_HASH_SCHEME = "pbkdf2_sha256"
+
+def _pbkdf2(password: str, salt: str, iterations: int) -> str:
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), iterations).hex()
+
+def _hash_password_job(password: str, iterations: int) -> str:
+    salt = secrets.token_hex(16)
+    return f"{PASSWORD_HASH_SCHEME}${iterations}${salt}${_pbkdf2(password, salt, iterations)}"
+
+def _verify_password_job(plain_password: str, hashed_password: str) -> bool:
+    if hashed_password.startswith(f"{PASSWORD_HASH_SCHEME}$"):
+        try:
+            _, iterations, salt, expected = hashed_password.split("$")
+            return secrets.compare_digest(_pbkdf2(plain_password, salt, int(iterations)), expected)
+        except ValueError:
+            return False
+    # Legacy unsalted SHA-256
+    return secrets.compare_digest(hashlib.sha256(plain_password.encode()).hexdigest(), hashed_password)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    if not hashed_password.startswith(f"{PASSWORD_HASH_SCHEME}$"):
+        return True
+    try:
+        return int(hashed_password.split("$")[1]) < PASSWORD_HASH_ITERATIONS
+    except (IndexError, ValueError):
+        return True
+
+class PasswordHasher:
+    """Runs the password KDF in a bounded worker pool.
+
+    Worker processes let a login storm scale with cores. Serverless runtimes
+    usually lack the semaphores multiprocessing needs, so it falls back to
+    threads, which still run in parallel because hashlib releases the GIL.
+    Callers beyond max_queue_depth get a 503 rather than queueing forever.
+    """
+
+    def __init__(self, max_workers: int, max_queue_depth: int):
+        self.max_workers = max(1, max_workers)
+        self.max_queue_depth = max_queue_depth
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._queue_depth = 0
+        self._peak_queue_depth = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                except (OSError, NotImplementedError):
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    def _run(self, job, *args):
+        with self._lock:
+            if self._queue_depth >= self.max_queue_depth:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Authentication service is busy, please try again",
+                    headers={"Retry-After": "1"},
+                )
+            self._queue_depth += 1
+            self._peak_queue_depth = max(self._peak_queue_depth, self._queue_depth)
+        try:
+            try:
+                return self._get_executor().submit(job, *args).result()
+            except BrokenProcessPool:
+                with self._lock:
+                    self._executor = None
+                return job(*args)
+        finally:
+            with self._lock:
+                self._queue_depth -= 1
+                self._completed += 1
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash_password_job, password, PASSWORD_HASH_ITERATIONS)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._run(_verify_password_job, plain_password, hashed_password)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queueDepth": self._queue_depth,
+                "peakQueueDepth": self._peak_queue_depth,
+                "maxQueueDepth": self.max_queue_depth,
+                "completed": self._completed,
+                "rejected": self._rejected
+            }
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE)
+
 # Helper Functions
 def hash_password(password: str) -> str:
-    return hashlib.sha256(password.encode()).hexdigest()
+    return password_hasher.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return hash_password(plain_password) == hashed_password
+    return password_hasher.verify(plain_password, hashed_password)
 
 def create_access_token(data: dict):
+    # python-jose pulls in the crypto backends; keep it off the cold-start path
+    from jose import jwt
+
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+class PrincipalCache:
+    """In-process TTL/LRU cache of authenticated principals.
+
+    Entries are keyed by a SHA-256 digest of the bearer token and hold the
+    decoded claims plus a detached snapshot of the user row, so a warm
+    function instance skips both the JWT signature check and the user query.
+    Any write that changes a user must call invalidate_user().
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict, User]] = OrderedDict()
+        self._keys_by_user: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[tuple[dict, User]]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims, user = entry
+            if expires_at <= time.time():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return claims, user
+
+    def put(self, token: str, claims: dict, user: User):
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        expires_at = min(time.time() + self.ttl_seconds, claims.get("exp", float("inf")))
+        snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+        make_transient_to_detached(snapshot)
+        key = self._key(token)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (expires_at, claims, snapshot)
+            self._keys_by_user.setdefault(snapshot.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for key in self._keys_by_user.pop(user_id, set()):
+                self._entries.pop(key, None)
+
+    def _discard(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_keys = self._keys_by_user.get(entry[2].id)
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._keys_by_user[entry[2].id]
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_MAX_ENTRIES, PRINCIPAL_CACHE_TTL_SECONDS)
+
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ):
+    token = credentials.credentials
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return db.merge(cached[1], load=False)
+
+    from jose import JWTError, jwt
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("sub")
-        if user_id is None:
+        # "sub" is a string claim (python-jose rejects anything else)
+        subject = payload.get("sub")
+        if subject is None:
             raise HTTPException(status_code=401, detail="Invalid authentication credentials")
-    except JWTError:
+        user_id = int(subject)
+    except (JWTError, ValueError):
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
 
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
+    principal_cache.put(token, payload, user)
     return user
 
+RANK_TIERS = [
+    (0, "Bagong Kaibigan"),
+    (250, "Mabuting Kaibigan"),
+    (500, "Bantay Kaibigan"),
+    (1000, "Pinuno ng Komunidad"),
+]
+RANK_THRESHOLDS = [min_points for min_points, _ in RANK_TIERS]
+
 def calculate_rank(points: int) -> str:
-    if points >= 1000:
-        return "Pinuno ng Komunidad"
-    elif points >= 500:
-        return "Bantay Kaibigan"
-    elif points >= 250:
-        return "Mabuting Kaibigan"
-    else:
-        return "Bagong Kaibigan"
+    return RANK_TIERS[max(bisect_right(RANK_THRESHOLDS, points) - 1, 0)][1]
+
+def award_points(db: Session, user_id: int, points: int, type: str, description: str):
+    """Credit points with an SQL-side increment so concurrent awards never lose updates.
+
+    Runs inside the caller's transaction; the caller commits and must
+    invalidate the principal cache afterwards.
+    """
+    db.execute(update(User).where(User.id == user_id).values(points=User.points + points))
+    new_total = db.execute(select(User.points).where(User.id == user_id)).scalar_one()
+    db.execute(update(User).where(User.id == user_id).values(rank=calculate_rank(new_total)))
+    db.add(PointsHistory(user_id=user_id, type=type, description=description, points=points))
+
+def find_points_mismatches(db: Session, user_ids: Optional[list] = None) -> list:
+    """Users whose stored balance differs from the sum of their ledger entries"""
+    ledger_total = func.coalesce(func.sum(PointsHistory.points), 0)
+    query = db.query(User.id, User.points, ledger_total.label("ledger_total")).outerjoin(
+        PointsHistory, PointsHistory.user_id == User.id
+    ).group_by(User.id, User.points).having(User.points != ledger_total)
+    if user_ids is not None:
+        query = query.filter(User.id.in_(user_ids))
+    return [
+        {"userId": user_id, "points": points, "ledgerTotal": total}
+        for user_id, points, total in query
+    ]
 
 # API Routes
 @app.get("/")
 def read_root():
     return {"message": "SafeZonePH API is running on Vercel!"}
 
+@app.get("/api/metrics/password-hashing")
+def get_password_hashing_metrics():
+    return password_hasher.stats()
+
 @app.post("/api/auth/register")
 def register(user_data: RegisterRequest, db: Session = Depends(get_db)):
     existing_user = db.query(User).filter(User.email == user_data.email).first()
@@ -309,7 +1055,7 @@ def register(user_data: RegisterRequest, db: Session = Depends(get_db)):
     db.add(points_entry)
     db.commit()
 
-    access_token = create_access_token(data={"sub": new_user.id})
+    access_token = create_access_token(data={"sub": str(new_user.id)})
 
     return {
         "access_token": access_token,
@@ -331,7 +1077,14 @@ def login(credentials: LoginRequest, db: Session = Depends(get_db)):
     if not user or not verify_password(credentials.password, user.hashed_password):
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    access_token = create_access_token(data={"sub": user.id})
+    # Transparently move legacy hashes to the current KDF settings
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = hash_password(credentials.password)
+        db.commit()
+        db.refresh(user)
+        principal_cache.invalidate_user(user.id)
+
+    access_token = create_access_token(data={"sub": str(user.id)})
 
     return {
         "access_token": access_token,
@@ -389,6 +1142,7 @@ def update_profile(
         current_user.bio = profile_data.bio
 
     db.commit()
+    principal_cache.invalidate_user(current_user.id)
     db.refresh(current_user)
 
     return {
@@ -441,9 +1195,77 @@ def create_task(
         "createdAt": new_task.created_at.isoformat() if new_task.created_at else None
     }
 
+# Undated tasks sort after every dated one
+UNDATED_DUE_DATE = "9999-12-31"
+TASK_SORT_COLUMNS = {
+    "created_at": Task.created_at,
+    "due_date": func.coalesce(Task.due_date, UNDATED_DUE_DATE),
+    "points": Task.points,
+}
+
+def encode_cursor(value, id: int) -> str:
+    payload = json.dumps([value.isoformat() if isinstance(value, datetime) else value, id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_cursor(cursor: str, sort_field: str) -> tuple:
+    try:
+        value, id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if sort_field == "created_at":
+            value = datetime.fromisoformat(value)
+        return value, int(id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def split_filter(value: Optional[str]) -> list:
+    return [item.strip() for item in value.split(",") if item.strip()] if value else []
+
 @app.get("/api/tasks")
-def get_tasks(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    tasks = db.query(Task).filter(Task.created_by == current_user.id).all()
+def get_tasks(
+    response: Response,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    category: Optional[str] = None,
+    priority: Optional[str] = None,
+    assignee: Optional[str] = None,
+    due_from: Optional[str] = None,
+    due_to: Optional[str] = None,
+    sort: str = Query("-created_at", pattern="^-?(created_at|due_date|points)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    query = db.query(Task).filter(Task.created_by == current_user.id)
+    for column, values in ((Task.status, split_filter(status_filter)), (Task.category, split_filter(category)), (Task.priority, split_filter(priority))):
+        if values:
+            query = query.filter(column.in_(values))
+    if assignee:
+        query = query.filter(Task.assigned_to == assignee)
+    if due_from:
+        query = query.filter(Task.due_date >= due_from)
+    if due_to:
+        query = query.filter(Task.due_date <= f"{due_to}\uffff")
+
+    # Total-count hint only on the first page
+    if cursor is None:
+        response.headers["X-Total-Count"] = str(query.order_by(None).count())
+
+    descending = sort.startswith("-")
+    sort_field = sort.lstrip("-")
+    sort_column = TASK_SORT_COLUMNS[sort_field]
+    if cursor is not None:
+        value, last_id = decode_cursor(cursor, sort_field)
+        if descending:
+            query = query.filter(or_(sort_column < value, and_(sort_column == value, Task.id < last_id)))
+        else:
+            query = query.filter(or_(sort_column > value, and_(sort_column == value, Task.id > last_id)))
+    order = (sort_column.desc(), Task.id.desc()) if descending else (sort_column.asc(), Task.id.asc())
+
+    tasks = query.order_by(*order).limit(limit + 1).all()
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        sort_value = (last.due_date or UNDATED_DUE_DATE) if sort_field == "due_date" else getattr(last, sort_field)
+        response.headers["X-Next-Cursor"] = encode_cursor(sort_value, last.id)
 
     return [
         {
@@ -494,17 +1316,9 @@ def update_task(
     db.refresh(task)
 
     if old_status != "completed" and task.status == "completed":
-        current_user.points += task.points
-        current_user.rank = calculate_rank(current_user.points)
-
-        points_entry = PointsHistory(
-            user_id=current_user.id,
-            type="earned",
-            description=f"Completed task: {task.title}",
-            points=task.points
-        )
-        db.add(points_entry)
+        award_points(db, current_user.id, task.points, "earned", f"Completed task: {task.title}")
         db.commit()
+        principal_cache.invalidate_user(current_user.id)
 
     return {
         "id": task.id,
@@ -535,19 +1349,25 @@ def delete_task(
     return {"message": "Task deleted successfully"}
 
 @app.get("/api/points/history")
-def get_points_history(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    history = db.query(PointsHistory).filter(PointsHistory.user_id == current_user.id).order_by(PointsHistory.created_at.desc()).all()
+def get_points_history(response: Response, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    rows = fetch_rows(
+        db,
+        select(
+            PointsHistory.id,
+            PointsHistory.type,
+            PointsHistory.description,
+            PointsHistory.points,
+            PointsHistory.created_at.label("createdAt")
+        )
+        .where(PointsHistory.user_id == current_user.id)
+        .order_by(PointsHistory.created_at.desc())
+    )
+    return read_model_response(rows, response)
 
-    return [
-        {
-            "id": entry.id,
-            "type": entry.type,
-            "description": entry.description,
-            "points": entry.points,
-            "createdAt": entry.created_at.isoformat() if entry.created_at else None
-        }
-        for entry in history
-    ]
+@app.get("/api/points/reconcile")
+def reconcile_points(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    mismatches = find_points_mismatches(db, [current_user.id])
+    return {"consistent": not mismatches, "mismatches": mismatches}
 
 @app.post("/api/help-requests")
 def create_help_request(
@@ -567,6 +1387,7 @@ def create_help_request(
     )
 
     db.add(new_request)
+    bump_collection_versions(db, HELP_REQUESTS_COLLECTION)
     db.commit()
     db.refresh(new_request)
 
@@ -585,25 +1406,32 @@ def create_help_request(
     }
 
 @app.get("/api/help-requests")
-def get_help_requests(db: Session = Depends(get_db)):
-    requests = db.query(HelpRequest).order_by(HelpRequest.created_at.desc()).all()
-
-    return [
-        {
-            "id": req.id,
-            "userName": req.user_name,
-            "type": req.type,
-            "title": req.title,
-            "description": req.description,
-            "location": req.location,
-            "urgency": req.urgency,
-            "status": req.status,
-            "respondersNeeded": req.responders_needed,
-            "respondersCount": req.responders_count,
-            "createdAt": req.created_at.isoformat() if req.created_at else None
-        }
-        for req in requests
-    ]
+def get_help_requests(
+    request: Request,
+    response: Response,
+    status_filter: Optional[str] = Query(None, alias="status"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db)
+):
+    not_modified = conditional_response(db, HELP_REQUESTS_COLLECTION, request, response)
+    if not_modified:
+        return not_modified
+    statement = select(*HELP_REQUEST_COLUMNS)
+    statuses = split_filter(status_filter)
+    if statuses:
+        statement = statement.where(HelpRequest.status.in_(statuses))
+    if cursor is not None:
+        created_at, last_id = decode_cursor(cursor, "created_at")
+        statement = statement.where(or_(
+            HelpRequest.created_at < created_at,
+            and_(HelpRequest.created_at == created_at, HelpRequest.id < last_id)
+        ))
+    rows = fetch_rows(db, statement.order_by(HelpRequest.created_at.desc(), HelpRequest.id.desc()).limit(limit + 1))
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1]["createdAt"], rows[-1]["id"])
+    return read_model_response(rows, response)
 
 @app.post("/api/global-alerts")
 def create_global_alert(
@@ -621,7 +1449,14 @@ def create_global_alert(
         affected_areas=alert_data.affected_areas or ""
     )
 
+    area_keys = alert_area_keys(alert_data.affected_areas, current_user.city)
+    if not area_keys:
+        raise HTTPException(status_code=400, detail="Affected barangays need a city: set yours or use brgy:<city>/<barangay>")
+
     db.add(new_alert)
+    db.flush()
+    db.add_all(GlobalAlertArea(alert_id=new_alert.id, area=key) for key in area_keys)
+    bump_collection_versions(db, GLOBAL_ALERTS_COLLECTION)
     db.commit()
     db.refresh(new_alert)
 
@@ -634,29 +1469,41 @@ def create_global_alert(
         "message": new_alert.message,
         "affectedAreas": new_alert.affected_areas,
         "isActive": new_alert.is_active,
-        "acknowledgedBy": new_alert.acknowledged_by,
+        "acknowledgedCount": new_alert.acknowledged_count,
         "createdAt": new_alert.created_at.isoformat() if new_alert.created_at else None
     }
 
 @app.get("/api/global-alerts")
-def get_global_alerts(db: Session = Depends(get_db)):
-    alerts = db.query(GlobalAlert).order_by(GlobalAlert.created_at.desc()).all()
-
-    return [
-        {
-            "id": alert.id,
-            "createdBy": alert.created_by,
-            "type": alert.type,
-            "priority": alert.priority,
-            "title": alert.title,
-            "message": alert.message,
-            "affectedAreas": alert.affected_areas,
-            "isActive": alert.is_active,
-            "acknowledgedBy": alert.acknowledged_by,
-            "createdAt": alert.created_at.isoformat() if alert.created_at else None
-        }
-        for alert in alerts
-    ]
+def get_global_alerts(request: Request, response: Response, db: Session = Depends(get_db)):
+    not_modified = conditional_response(db, GLOBAL_ALERTS_COLLECTION, request, response)
+    if not_modified:
+        return not_modified
+    rows = fetch_rows(db, select(*GLOBAL_ALERT_COLUMNS).order_by(GlobalAlert.created_at.desc()))
+    return read_model_response(rows, response)
+
+@app.get("/api/global-alerts/mine")
+def get_my_global_alerts(
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # Area keys come from the profile, so they are part of the representation
+    area_variant = ",".join(sorted(user_area_keys(current_user)))
+    not_modified = conditional_response(db, GLOBAL_ALERTS_COLLECTION, request, response, area_variant)
+    if not_modified:
+        return not_modified
+
+    matching = select(GlobalAlertArea.alert_id).where(GlobalAlertArea.area.in_(user_area_keys(current_user)))
+    rows = fetch_rows(
+        db,
+        select(*GLOBAL_ALERT_COLUMNS)
+        .where(GlobalAlert.id.in_(matching), GlobalAlert.is_active == True)
+        .order_by(GlobalAlert.created_at.desc())
+        .limit(limit)
+    )
+    return read_model_response(rows, response)
 
 @app.put("/api/global-alerts/{alert_id}/acknowledge")
 def acknowledge_alert(
@@ -668,14 +1515,15 @@ def acknowledge_alert(
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
 
-    import json
-    acknowledged = json.loads(alert.acknowledged_by) if alert.acknowledged_by else []
-    user_id = str(current_user.id)
-
-    if user_id not in acknowledged:
-        acknowledged.append(user_id)
-        alert.acknowledged_by = json.dumps(acknowledged)
-        db.commit()
+    # One row per (alert, user); repeat acknowledgements are no-ops
+    if insert_ignoring_conflicts(db, AlertAcknowledgement, {"alert_id": alert_id, "user_id": current_user.id}):
+        db.execute(
+            update(GlobalAlert)
+            .where(GlobalAlert.id == alert_id)
+            .values(acknowledged_count=GlobalAlert.acknowledged_count + 1)
+        )
+        bump_collection_versions(db, GLOBAL_ALERTS_COLLECTION)
+    db.commit()
 
     return {"message": "Alert acknowledged"}
 
@@ -690,28 +1538,30 @@ def toggle_alert(
         raise HTTPException(status_code=404, detail="Alert not found")
 
     alert.is_active = not alert.is_active
+    bump_collection_versions(db, GLOBAL_ALERTS_COLLECTION)
     db.commit()
 
     return {"message": f"Alert {'activated' if alert.is_active else 'deactivated'}"}
 
 @app.get("/api/community-tasks")
-def get_community_tasks(db: Session = Depends(get_db)):
-    tasks = db.query(CommunityTask).order_by(CommunityTask.created_at.desc()).all()
-
-    return [
-        {
-            "id": task.id,
-            "title": task.title,
-            "description": task.description,
-            "location": task.location,
-            "urgency": task.urgency,
-            "points": task.points,
-            "status": task.status,
-            "volunteers": task.volunteers,
-            "createdAt": task.created_at.isoformat() if task.created_at else None
-        }
-        for task in tasks
-    ]
+def get_community_tasks(request: Request, response: Response, db: Session = Depends(get_db)):
+    not_modified = conditional_response(db, COMMUNITY_TASKS_COLLECTION, request, response)
+    if not_modified:
+        return not_modified
+    rows = fetch_rows(db, select(*COMMUNITY_TASK_COLUMNS).order_by(CommunityTask.created_at.desc()))
+
+    # Rosters for every listed task in one query
+    rosters = {row["id"]: [] for row in rows}
+    if rosters:
+        roster_rows = db.query(CommunityTaskVolunteer.community_task_id, CommunityTaskVolunteer.user_id).filter(
+            CommunityTaskVolunteer.community_task_id.in_(list(rosters))
+        ).order_by(CommunityTaskVolunteer.id)
+        for task_id, user_id in roster_rows:
+            rosters[task_id].append(str(user_id))
+
+    for row in rows:
+        row["volunteers"] = json.dumps(rosters[row["id"]])
+    return read_model_response(rows, response)
 
 @app.post("/api/community-tasks/{task_id}/volunteer")
 def volunteer_for_task(
@@ -723,16 +1573,10 @@ def volunteer_for_task(
     if not community_task:
         raise HTTPException(status_code=404, detail="Community task not found")
 
-    import json
-    volunteers = json.loads(community_task.volunteers) if community_task.volunteers else []
-    user_id = str(current_user.id)
-
-    if user_id in volunteers:
+    # The unique (task, user) key makes concurrent sign-ups race-free
+    if not insert_ignoring_conflicts(db, CommunityTaskVolunteer, {"community_task_id": task_id, "user_id": current_user.id}):
         raise HTTPException(status_code=400, detail="You have already volunteered for this task")
 
-    volunteers.append(user_id)
-    community_task.volunteers = json.dumps(volunteers)
-
     personal_task = Task(
         title=community_task.title,
         description=community_task.description,
@@ -744,7 +1588,14 @@ def volunteer_for_task(
         status="pending"
     )
     db.add(personal_task)
+    db.flush()
 
+    db.execute(
+        update(CommunityTaskVolunteer)
+        .where(CommunityTaskVolunteer.community_task_id == task_id, CommunityTaskVolunteer.user_id == current_user.id)
+        .values(personal_task_id=personal_task.id)
+    )
+    bump_collection_versions(db, COMMUNITY_TASKS_COLLECTION)
     db.commit()
 
     return {"message": "Successfully volunteered! Task added to your personal tasks."}
@@ -785,6 +1636,7 @@ def seed_community_tasks(db: Session = Depends(get_db)):
     for task in initial_tasks:
         db.add(task)
 
+    bump_collection_versions(db, COMMUNITY_TASKS_COLLECTION)
     db.commit()
     return {"message": f"Successfully created {len(initial_tasks)} community tasks"}
 
@@ -833,5 +1685,21 @@ def seed_demo_user(db: Session = Depends(get_db)):
         "password": demo_password
     }
 
-# Vercel serverless handler
-handler = Mangum(app)
+# Vercel serverless handler; Mangum is only needed once the first event arrives
+_mangum_handler = None
+
+def handler(event, context):
+    global _mangum_handler
+    if _mangum_handler is None:
+        from mangum import Mangum
+        _mangum_handler = Mangum(app)
+    return _mangum_handler(event, context)
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:] == ["migrate"]:
+        ensure_schema()
+        print("Schema is up to date")
+    else:
+        print("usage: python api/index.py migrate")
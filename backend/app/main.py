@@ -1,30 +1,184 @@
-from fastapi import FastAPI, HTTPException, Depends, status
+from fastapi import FastAPI, HTTPException, Depends, status, Query, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Boolean, Float
-from sqlalchemy.orm import declarative_base, sessionmaker, Session
-from datetime import datetime, timedelta
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+from anyio import to_thread
+from starlette.datastructures import Headers, MutableHeaders
+from sqlalchemy import create_engine, event, make_url, Column, Integer, String, Date, DateTime, Boolean, Float, Index, UniqueConstraint, and_, bindparam, case, func, insert, inspect, null, or_, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import Select
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.orm import declarative_base, sessionmaker, Session, make_transient_to_detached
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from datetime import date, datetime, timedelta
+from bisect import bisect_left, bisect_right, insort
+from math import asin, cos, degrees, pi, radians, sin, sqrt
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextvars import ContextVar
 from pydantic import BaseModel, EmailStr, Field
 from jose import JWTError, jwt
 import os
+import asyncio
+import base64
+import gzip
 import hashlib
+import json
+import logging
 import secrets
+import heapq
+import queue
+import re
+import threading
+import time
+import uuid
 from dotenv import load_dotenv
-from typing import Optional
+from typing import Any, Optional
+import numpy as np
 import uvicorn
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Database Configuration
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./safezoneph_dev.db")
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+# SQLite profile: WAL lets readers run alongside the single writer, and the
+# busy timeout makes other writers wait for the lock instead of failing with
+# "database is locked". synchronous=NORMAL is durable across crashes in WAL
+# mode and only fsyncs at checkpoints.
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+SQLITE_PRAGMAS = (
+    ("journal_mode", os.getenv("SQLITE_JOURNAL_MODE", "WAL")),
+    ("synchronous", os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")),
+    ("busy_timeout", SQLITE_BUSY_TIMEOUT_MS),
+    ("cache_size", int(os.getenv("SQLITE_CACHE_SIZE", -64000))),  # negative = KiB
+    ("mmap_size", int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))),
+    ("temp_store", "MEMORY"),
+)
+SQLITE_WRITE_QUEUE_ENABLED = IS_SQLITE and os.getenv("SQLITE_WRITE_QUEUE", "true").lower() in ("1", "true", "yes")
+SQLITE_GROUP_COMMIT_MAX = int(os.getenv("SQLITE_GROUP_COMMIT_MAX", 256))
+SQLITE_GROUP_COMMIT_WINDOW_MS = float(os.getenv("SQLITE_GROUP_COMMIT_WINDOW_MS", 2))
+SQLITE_READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", 8))
+
+def sqlite_connection_listener(read_only: bool):
+    # journal_mode is a property of the database file, set by writers only
+    pragmas = [(name, value) for name, value in SQLITE_PRAGMAS if not (read_only and name == "journal_mode")]
+
+    def configure(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+    return configure
+
+def sqlite_read_only_url(url: str) -> Optional[str]:
+    """The same database file opened read-only, or None for in-memory databases"""
+    database = make_url(url).database
+    if not database or database == ":memory:" or database.startswith("file:"):
+        return None
+    return f"sqlite:///file:{os.path.abspath(database)}?mode=ro&uri=true"
+
+def begin_immediate(connection):
+    # Take the write lock at BEGIN, where busy_timeout applies, rather than
+    # on the first write, and let pysqlite run SAVEPOINTs inside it
+    connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+def disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+if IS_SQLITE:
+    sqlite_connect_args = {"check_same_thread": False, "timeout": SQLITE_BUSY_TIMEOUT_MS / 1000}
+    engine = create_engine(DATABASE_URL, connect_args=sqlite_connect_args)
+    event.listen(engine, "connect", sqlite_connection_listener(read_only=False))
+
+    # The one connection the group-commit writer owns
+    writer_engine = create_engine(DATABASE_URL, connect_args=sqlite_connect_args, poolclass=QueuePool, pool_size=1, max_overflow=0)
+    event.listen(writer_engine, "connect", sqlite_connection_listener(read_only=False))
+    event.listen(writer_engine, "connect", disable_pysqlite_transactions)
+    event.listen(writer_engine, "begin", begin_immediate)
+
+    read_only_url = sqlite_read_only_url(DATABASE_URL)
+    if read_only_url:
+        read_engine = create_engine(
+            read_only_url,
+            connect_args=sqlite_connect_args,
+            poolclass=QueuePool,
+            pool_size=SQLITE_READ_POOL_SIZE,
+            max_overflow=SQLITE_READ_POOL_SIZE
+        )
+        event.listen(read_engine, "connect", sqlite_connection_listener(read_only=True))
+    else:
+        read_engine = engine
+else:
+    engine = create_engine(DATABASE_URL)
+    writer_engine = read_engine = engine
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+WriterSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=writer_engine)
 Base = declarative_base()
 
+# Async engine for the hot handlers: aiosqlite locally, asyncpg on PostgreSQL.
+# Their concurrency is bounded by this pool, not by the threadpool.
+def to_async_database_url(url: str) -> str:
+    scheme, _, rest = url.partition("://")
+    driver = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg", "postgres": "postgresql+asyncpg"}.get(scheme, scheme)
+    return f"{driver}://{rest}"
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or to_async_database_url(DATABASE_URL)
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    poolclass=AsyncAdaptedQueuePool,  # aiosqlite would otherwise default to NullPool
+    pool_size=int(os.getenv("ASYNC_DB_POOL_SIZE", 10)),
+    max_overflow=int(os.getenv("ASYNC_DB_MAX_OVERFLOW", 10)),
+    pool_timeout=float(os.getenv("ASYNC_DB_POOL_TIMEOUT", 30))
+)
+if IS_SQLITE:
+    event.listen(async_engine.sync_engine, "connect", sqlite_connection_listener(read_only=False))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Security Configuration
 SECRET_KEY = os.getenv("JWT_SECRET_KEY")
 ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", 1440))
+MISSED_CHECK_IN_DETECTOR_ENABLED = os.getenv("MISSED_CHECK_IN_DETECTOR_ENABLED", "true").lower() in ("1", "true", "yes")
+MISSED_CHECK_IN_POLL_SECONDS = float(os.getenv("MISSED_CHECK_IN_POLL_SECONDS", 15))
+NOTIFICATION_FANOUT_CHUNK_SIZE = int(os.getenv("NOTIFICATION_FANOUT_CHUNK_SIZE", 1000))
+POINTS_LEDGER_BATCH_SIZE = int(os.getenv("POINTS_LEDGER_BATCH_SIZE", 500))
+POINTS_LEDGER_POLL_SECONDS = float(os.getenv("POINTS_LEDGER_POLL_SECONDS", 5))
+POINTS_HISTORY_RAW_DAYS = int(os.getenv("POINTS_HISTORY_RAW_DAYS", 30))
+POINTS_ROLLUP_INTERVAL_SECONDS = float(os.getenv("POINTS_ROLLUP_INTERVAL_SECONDS", 3600))
+POINTS_ROLLUP_ENABLED = os.getenv("POINTS_ROLLUP_ENABLED", "true").lower() in ("1", "true", "yes")
+PASSWORD_HASH_ITERATIONS = int(os.getenv("PASSWORD_HASH_ITERATIONS", 600000))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", 256))
+PRINCIPAL_CACHE_TTL_SECONDS = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 60))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", 10000))
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", 1024))
+HELP_DISPATCH_ENABLED = os.getenv("HELP_DISPATCH_ENABLED", "true").lower() in ("1", "true", "yes")
+HELP_DISPATCH_RADII_KM = tuple(float(radius) for radius in os.getenv("HELP_DISPATCH_RADII_KM", "2,5,10,25").split(","))
+HELP_DISPATCH_FANOUT = int(os.getenv("HELP_DISPATCH_FANOUT", 3))
+HELP_DISPATCH_WAVE_SECONDS = float(os.getenv("HELP_DISPATCH_WAVE_SECONDS", 60))
+HELP_DISPATCH_POLL_SECONDS = float(os.getenv("HELP_DISPATCH_POLL_SECONDS", 5))
 
 security = HTTPBearer()
 
@@ -47,9 +201,25 @@ class User(Base):
     is_verified = Column(Boolean, default=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String, nullable=True, index=True)  # nearby search seeks on prefixes of this
+    location_updated_at = Column(DateTime, nullable=True)
+    skills = Column(Integer, default=0)  # bitset over BUDDY_SKILLS
+    availability = Column(Integer, default=0)  # bitset over AVAILABILITY_WINDOWS
+    rating = Column(Float, default=0.0)
+    review_count = Column(Integer, default=0)
+    # Alert fan-out matches on these; see city_key and barangay_key
+    city_area_key = Column(String, nullable=True, index=True)
+    barangay_area_key = Column(String, nullable=True, index=True)
+    # Leaderboard collection version of the last write that moved this user on it
+    leaderboard_version = Column(Integer, nullable=True, index=True)
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_created_by_status_created_at", "created_by", "status", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -66,6 +236,11 @@ class Task(Base):
 
 class PointsHistory(Base):
     __tablename__ = "points_history"
+    __table_args__ = (
+        Index("ix_points_history_user_id_created_at", "user_id", "created_at"),
+        # The ledger worker claims unapplied awards in id order from this index
+        Index("ix_points_history_pending", "pending"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False)
@@ -73,9 +248,31 @@ class PointsHistory(Base):
     description = Column(String, nullable=False)
     points = Column(Integer, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # True until the award is added to users.points
+    pending = Column(Boolean, default=False)
+
+class PointsHistoryRollup(Base):
+    """Per-user, per-day, per-type totals of compacted points_history rows"""
+    __tablename__ = "points_history_rollups"
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", "type", name="uq_points_history_rollups_user_id_day_type"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False)
+    day = Column(Date, nullable=False)
+    type = Column(String, nullable=False)
+    points = Column(Integer, nullable=False)
+    entry_count = Column(Integer, nullable=False)
 
 class HelpRequest(Base):
     __tablename__ = "help_requests"
+    __table_args__ = (
+        # Newest-first list walks this index instead of sorting the table
+        Index("ix_help_requests_created_at", "created_at"),
+        # Status-filtered lists and the dispatcher's open-request warm-up
+        Index("ix_help_requests_status_created_at", "status", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False)
@@ -88,10 +285,31 @@ class HelpRequest(Base):
     status = Column(String, default="open")  # open, in_progress, resolved
     responders_needed = Column(Integer, default=1)
     responders_count = Column(Integer, default=0)
+    latitude = Column(Float, nullable=True)  # where responders are dispatched to
+    longitude = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class HelpRequestDispatch(Base):
+    """One help request pushed to one nearby user by the dispatcher"""
+    __tablename__ = "help_request_dispatches"
+    __table_args__ = (
+        UniqueConstraint("request_id", "user_id", name="uq_help_request_dispatches_request_id_user_id"),
+        # A responder's inbox of requests pushed to them
+        Index("ix_help_request_dispatches_user_id_created_at", "user_id", "created_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    request_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    distance_km = Column(Float, nullable=False)
+    wave = Column(Integer, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
 class GlobalAlert(Base):
     __tablename__ = "global_alerts"
+    __table_args__ = (
+        Index("ix_global_alerts_created_at", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False)
@@ -106,8 +324,34 @@ class GlobalAlert(Base):
     expires_at = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class GlobalAlertArea(Base):
+    __tablename__ = "global_alert_areas"
+    __table_args__ = (
+        # Per-user alert lookups seek on area, then join to the alert
+        Index("ix_global_alert_areas_area_alert_id", "area", "alert_id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    alert_id = Column(Integer, nullable=False, index=True)
+    area = Column(String, nullable=False)  # "city:<city>", "brgy:<city>/<barangay>" or "*" for everyone
+
+class AlertAcknowledgement(Base):
+    __tablename__ = "alert_acknowledgements"
+    __table_args__ = (
+        UniqueConstraint("alert_id", "user_id", name="uq_alert_acknowledgements_alert_id_user_id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    alert_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
 class CommunityTask(Base):
     __tablename__ = "community_tasks"
+    __table_args__ = (
+        # Open tasks, newest first
+        Index("ix_community_tasks_status_created_at", "status", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
@@ -121,8 +365,31 @@ class CommunityTask(Base):
     created_by = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class CommunityTaskVolunteer(Base):
+    __tablename__ = "community_task_volunteers"
+    __table_args__ = (
+        UniqueConstraint("community_task_id", "user_id", name="uq_community_task_volunteers_task_id_user_id"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    community_task_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False, index=True)
+    personal_task_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class CollectionVersion(Base):
+    """Change counter per polled collection; bumped in the same transaction as each write"""
+    __tablename__ = "collection_versions"
+    
+    key = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
 class Conversation(Base):
     __tablename__ = "conversations"
+    __table_args__ = (
+        Index("ix_conversations_user1_id_last_message_at", "user1_id", "last_message_at"),
+        Index("ix_conversations_user2_id_last_message_at", "user2_id", "last_message_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user1_id = Column(Integer, nullable=False)
@@ -133,6 +400,13 @@ class Conversation(Base):
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # Backs incremental (after_id/since) and history (before_id) fetches
+        Index("ix_messages_conversation_id_id", "conversation_id", "id"),
+        Index("ix_messages_conversation_id_created_at", "conversation_id", "created_at"),
+        # Covers the per-conversation unread counts of the inbox query
+        Index("ix_messages_receiver_id_read_conversation_id", "receiver_id", "read", "conversation_id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     conversation_id = Column(Integer, nullable=False)
@@ -142,8 +416,441 @@ class Message(Base):
     read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+# Schema Migrations
+class SchemaMigration(Base):
+    """One row per applied migration version"""
+    __tablename__ = "schema_migrations"
+    
+    version = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False)
+    applied_at = Column(DateTime, default=datetime.utcnow)
+
+MIGRATIONS: list[tuple] = []  # (version, name, upgrade(connection))
+
+def migration(version: int, name: str):
+    """Register an upgrade step. Versions are applied once, in order; never renumber or edit a shipped one."""
+    def register(upgrade):
+        MIGRATIONS.append((version, name, upgrade))
+        return upgrade
+    return register
+
+def create_indexes(connection, *indexes: Index):
+    # IF NOT EXISTS keeps steps re-runnable where create_all already built the
+    # index; checkfirst would miss expression indexes, which are not reflected
+    for index in indexes:
+        connection.execute(CreateIndex(index, if_not_exists=True))
+
+def run_migrations(bind=None) -> list[int]:
+    """Apply pending migrations, each in its own transaction; returns the versions applied"""
+    bind = bind or engine
+    SchemaMigration.__table__.create(bind=bind, checkfirst=True)
+    with bind.connect() as connection:
+        applied = set(connection.scalars(select(SchemaMigration.version)))
+    newly_applied = []
+    for version, name, upgrade in sorted(MIGRATIONS, key=lambda step: step[0]):
+        if version in applied:
+            continue
+        try:
+            with bind.begin() as connection:
+                upgrade(connection)
+                connection.execute(insert(SchemaMigration).values(version=version, name=name, applied_at=datetime.utcnow()))
+        except IntegrityError:
+            # Another process recorded this version first
+            continue
+        newly_applied.append(version)
+    return newly_applied
+
+def conflict_ignoring_insert(db: Session, model):
+    """INSERT ... ON CONFLICT DO NOTHING, or None when the dialect has no such clause"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert(model).on_conflict_do_nothing()
+
+def insert_ignoring_conflicts(db: Session, model, values: dict) -> bool:
+    """Idempotent single-row INSERT; returns False when a unique key already matched"""
+    statement = conflict_ignoring_insert(db, model)
+    if statement is None:
+        try:
+            with db.begin_nested():
+                db.execute(insert(model).values(**values))
+            return True
+        except IntegrityError:
+            return False
+    result = db.execute(statement.values(**values))
+    return result.rowcount == 1
+
+# Collection Versions
+HELP_REQUESTS_COLLECTION = "help_requests"
+GLOBAL_ALERTS_COLLECTION = "global_alerts"
+COMMUNITY_TASKS_COLLECTION = "community_tasks"
+LEADERBOARD_COLLECTION = "leaderboard"
+
+def notifications_collection(user_id: int) -> str:
+    return f"notifications:{user_id}"
+
+def bump_collection_versions(db: Session, *keys: str):
+    """Advance the version of every collection written by the current transaction"""
+    keys = set(keys)
+    if not keys:
+        return
+    known = set(db.scalars(select(CollectionVersion.key).where(CollectionVersion.key.in_(keys))))
+    missing = [{"key": key, "version": 0} for key in sorted(keys - known)]
+    if missing:
+        # A fan-out can create thousands of notifications:<user_id> keys at once
+        statement = conflict_ignoring_insert(db, CollectionVersion)
+        if statement is None:
+            for row in missing:
+                insert_ignoring_conflicts(db, CollectionVersion, row)
+        else:
+            db.execute(statement, missing)
+    db.execute(
+        update(CollectionVersion)
+        .where(CollectionVersion.key.in_(keys))
+        .values(version=CollectionVersion.version + 1)
+    )
+
+def collection_version(db: Session, key: str) -> int:
+    return db.scalar(select(CollectionVersion.version).where(CollectionVersion.key == key)) or 0
+
+def collection_etag(db: Session, key: str, request: Request, variant: str = "") -> str:
+    """Strong ETag for one representation of a collection.
+
+    The query string and any caller-specific variant are folded in, so each
+    representation validates separately. The version is read before the
+    rows, so a write racing the read can only make the ETag older than the
+    body, never newer.
+    """
+    version = collection_version(db, key)
+    # Negotiated media type and content coding give distinct byte representations
+    encoding = f"{response_media_type.get()};{negotiate_content_encoding(request.headers.get('accept-encoding', ''))}"
+    digest = hashlib.sha256(f"{key}?{request.url.query}#{variant}#{encoding}".encode()).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+def conditional_response(db: Session, key: str, request: Request, response: Response, variant: str = "") -> Optional[Response]:
+    """304 when the client's copy is current; otherwise stamps the ETag on the response"""
+    etag = collection_etag(db, key, request, variant)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return None
+
+# Read Models
+def schema_columns(schema: type[BaseModel], model) -> list:
+    """Columns for each field of a response schema; fields without a column project NULL"""
+    return [
+        getattr(model, name).label(name) if hasattr(model, name) else null().label(name)
+        for name in schema.model_fields
+    ]
+
+def fetch_rows(db: Session, statement) -> list[dict]:
+    """Run a column-projected select and return plain dicts keyed by column label.
+
+    Nothing is hydrated into the identity map, so list endpoints pay neither
+    ORM instrumentation nor pydantic validation per row.
+    """
+    result = db.execute(statement)
+    keys = tuple(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+def read_model_response(rows: list[dict], response: Response) -> Response:
+    # Returned responses bypass FastAPI's header merge, so carry ETag etc. over
+    return FastJSONResponse(rows, headers=dict(response.headers))
+
+# Alert Area Helpers
+# Keys are namespaced so a barangay only matches inside its own city, and a
+# barangay named like a city does not match that city:
+# "city:<city>" and "brgy:<city>/<barangay>"
+ALL_AREAS = "*"
+ALL_AREA_NAMES = {"*", "all", "all areas", "all barangays"}
+BARANGAY_PREFIX = re.compile(r"^(?:brgy\.?|barangay)\s+")
+
+def normalize_area(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    normalized = " ".join(name.casefold().split())
+    return normalized or None
+
+def city_key(city: Optional[str]) -> Optional[str]:
+    city = normalize_area(city)
+    return f"city:{city}" if city else None
+
+def barangay_key(city: Optional[str], barangay: Optional[str]) -> Optional[str]:
+    city, barangay = normalize_area(city), normalize_area(barangay)
+    if not city or not barangay:
+        return None
+    return f"brgy:{city}/{BARANGAY_PREFIX.sub('', barangay)}"
+
+def parse_alert_area(area: str, issuer_city: Optional[str]) -> Optional[str]:
+    """Key for one affected area.
+
+    "city:<city>" and "brgy:<city>/<barangay>" are explicit. "Brgy. <name>"
+    is a barangay in the issuer's city, and any other name is a city.
+    """
+    name = normalize_area(area)
+    if not name:
+        return None
+    if name in ALL_AREA_NAMES:
+        return ALL_AREAS
+    if name.startswith("city:"):
+        return city_key(name[len("city:"):])
+    if name.startswith("brgy:"):
+        city, _, barangay = name[len("brgy:"):].partition("/")
+        return barangay_key(city, barangay)
+    if BARANGAY_PREFIX.match(name):
+        return barangay_key(issuer_city, name)
+    return city_key(name)
+
+def alert_area_keys(affected_areas: list[str], issuer_city: Optional[str]) -> set[str]:
+    """Area keys for an alert; alerts without areas reach everyone"""
+    if not any(area and area.strip() for area in affected_areas):
+        return {ALL_AREAS}
+    return {key for key in (parse_alert_area(area, issuer_city) for area in affected_areas) if key}
+
+def user_area_keys(user: User) -> set[str]:
+    keys = {key for key in (city_key(user.city), barangay_key(user.city, user.barangay)) if key}
+    keys.add(ALL_AREAS)
+    return keys
+
+def backfill_alert_areas(connection):
+    """Index alerts created before the area mapping table existed"""
+    mapped = select(GlobalAlertArea.alert_id)
+    alerts = connection.execute(
+        select(GlobalAlert.id, GlobalAlert.affected_areas, User.city)
+        .outerjoin(User, User.id == GlobalAlert.user_id)
+        .where(~GlobalAlert.id.in_(mapped))
+    ).all()
+    rows = []
+    for alert_id, affected_areas, issuer_city in alerts:
+        try:
+            areas = json.loads(affected_areas) if affected_areas else []
+        except ValueError:
+            areas = [affected_areas]
+        rows.extend({"alert_id": alert_id, "area": key} for key in alert_area_keys(areas, issuer_city))
+    if rows:
+        connection.execute(insert(GlobalAlertArea), rows)
+
+# Geo Index
+# Users are indexed by geohash: nearby points share a prefix, so a radius
+# search is a handful of prefix range seeks on ix_users_geohash followed by
+# exact haversine distances on the candidates.
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_PRECISION = 9  # ~5 m cells
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = EARTH_RADIUS_KM * pi / 180  # same sphere as haversine_km, so boxes never undercut it
+
+def geohash_encode(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, value, even = [], 0, 0, True
+    while len(chars) < precision:
+        interval, coordinate = (lon_range, longitude) if even else (lat_range, latitude)
+        middle = (interval[0] + interval[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            interval[0] = middle
+        else:
+            interval[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_BASE32[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+def geohash_cell_degrees(precision: int) -> tuple[float, float]:
+    """(height, width) of a cell in degrees; longitude takes the odd bit"""
+    lat_bits = 5 * precision // 2
+    lon_bits = 5 * precision - lat_bits
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lon_bits
+
+def geohash_search_prefixes(latitude: float, longitude: float, radius_km: float) -> set[str]:
+    """Prefixes of the 3x3 block of cells around a point, with cells at least radius_km on each side.
+
+    Any point within the radius then falls in the centre cell or one of its
+    eight neighbours.
+    """
+    precision = 1
+    for candidate in range(GEOHASH_PRECISION, 0, -1):
+        height, width = geohash_cell_degrees(candidate)
+        # Cells narrow towards the poles; size them at the far edge of the block
+        edge_latitude = min(89.9, abs(latitude) + height)
+        if min(height * KM_PER_DEGREE, width * KM_PER_DEGREE * cos(radians(edge_latitude))) >= radius_km:
+            precision = candidate
+            break
+    height, width = geohash_cell_degrees(precision)
+    return {
+        geohash_encode(
+            max(-90.0, min(90.0, latitude + dy * height)),
+            (longitude + dx * width + 180.0) % 360.0 - 180.0,
+            precision
+        )
+        for dy in (-1, 0, 1)
+        for dx in (-1, 0, 1)
+    }
+
+def haversine_km(latitude1: float, longitude1: float, latitude2: float, longitude2: float) -> float:
+    dlat = radians(latitude2 - latitude1)
+    dlon = radians(longitude2 - longitude1)
+    a = sin(dlat / 2) ** 2 + cos(radians(latitude1)) * cos(radians(latitude2)) * sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+def geohash_prefix_filter(prefixes: set[str]):
+    # Range predicates (not LIKE) so each prefix is an index seek
+    return or_(*(and_(User.geohash >= prefix, User.geohash < prefix + "~") for prefix in sorted(prefixes)))
+
+def search_origin(user: User, lat: Optional[float], lng: Optional[float]) -> tuple[float, float]:
+    """lat/lng when given, otherwise the user's stored location"""
+    if lat is not None and lng is not None:
+        return lat, lng
+    if user.latitude is not None and user.longitude is not None:
+        return user.latitude, user.longitude
+    raise HTTPException(status_code=400, detail="Set your location or pass lat and lng")
+
+def nearby_conditions(latitude: float, longitude: float, radius_km: float, exclude_user_id: int) -> list:
+    """WHERE clauses for active users whose cell can lie within radius_km; callers still check the exact distance"""
+    # A bounding box on top of the prefix seeks trims the rows of the 3x3 block
+    lat_delta = radius_km / KM_PER_DEGREE
+    conditions = [
+        geohash_prefix_filter(geohash_search_prefixes(latitude, longitude, radius_km)),
+        User.latitude.between(latitude - lat_delta, latitude + lat_delta),
+        User.id != exclude_user_id,
+        User.is_active == True
+    ]
+    # Widest longitude offset of any point within the radius (reached north or
+    # south of the origin, not on its parallel); none when the circle spans a pole
+    spread = sin(radius_km / EARTH_RADIUS_KM) / max(cos(radians(latitude)), 1e-9)
+    if spread < 1:
+        lon_delta = degrees(asin(spread))
+        if -180 < longitude - lon_delta and longitude + lon_delta < 180:  # no band across the antimeridian
+            conditions.append(User.longitude.between(longitude - lon_delta, longitude + lon_delta))
+    return conditions
+
+# Buddy Matching
+BUDDY_SKILLS = (
+    "Walking Companion", "Errand Helper", "Night Safety", "Transportation",
+    "Emergency Response", "First Aid", "Local Guide"
+)
+AVAILABILITY_DAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+AVAILABILITY_SLOTS = ("morning", "afternoon", "evening", "night")
+AVAILABILITY_WINDOWS = tuple(f"{day}:{slot}" for day in AVAILABILITY_DAYS for slot in AVAILABILITY_SLOTS)
+
+def encode_flags(values: list[str], vocabulary: tuple, field: str) -> int:
+    mask = 0
+    for value in values:
+        if value not in vocabulary:
+            raise HTTPException(status_code=400, detail=f"Unknown {field}: {value}")
+        mask |= 1 << vocabulary.index(value)
+    return mask
+
+def decode_flags(mask: Optional[int], vocabulary: tuple) -> list[str]:
+    return [value for bit, value in enumerate(vocabulary) if (mask or 0) >> bit & 1]
+
+# Set bits in each byte value, for popcounts over uint32 bitsets
+POPCOUNT_TABLE = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+def popcount32(values: np.ndarray) -> np.ndarray:
+    as_bytes = np.ascontiguousarray(values, dtype=np.uint32).view(np.uint8)
+    return POPCOUNT_TABLE[as_bytes].reshape(-1, 4).sum(axis=1)
+
+class BuddyMatchEngine:
+    """Scores candidate buddies with array arithmetic instead of a per-user loop.
+
+    Candidates are a float64 matrix with one row per user, in the order of
+    CANDIDATE_COLUMNS. Each factor is computed for every row at once and
+    lies in [0, 1]:
+
+    - distance: halves every half_life_km
+    - skills: share of the wanted skills the candidate has (bitset AND, popcount)
+    - availability: share of the seeker's windows the candidate also covers
+    - rating: Bayesian average, so one 5-star review does not outrank fifty 4.8s
+    - verified, online: 0 or 1
+
+    An empty wanted-skills or availability set gives everyone full credit
+    for that factor. The score is the weighted sum. top_k selects with
+    argpartition in O(n) and sorts only the k winners.
+    """
+
+    CANDIDATE_COLUMNS = ("id", "latitude", "longitude", "skills", "availability", "rating", "review_count", "is_verified")
+
+    def __init__(self, weights: dict, half_life_km: float, rating_prior: float = 3.5, rating_prior_weight: float = 5.0):
+        self.weights = weights
+        self.half_life_km = half_life_km
+        self.rating_prior = rating_prior
+        self.rating_prior_weight = rating_prior_weight
+        self.column = {name: index for index, name in enumerate(self.CANDIDATE_COLUMNS)}
+
+    def distances_km(self, candidates: np.ndarray, latitude: float, longitude: float) -> np.ndarray:
+        lat = np.radians(candidates[:, self.column["latitude"]])
+        lon = np.radians(candidates[:, self.column["longitude"]])
+        origin_lat, origin_lon = radians(latitude), radians(longitude)
+        a = np.sin((lat - origin_lat) / 2) ** 2 + cos(origin_lat) * np.cos(lat) * np.sin((lon - origin_lon) / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+    def overlap(self, masks: np.ndarray, wanted: int) -> np.ndarray:
+        if not wanted:
+            return np.ones(len(masks))
+        shared = np.bitwise_and(masks.astype(np.uint32), np.uint32(wanted))
+        return popcount32(shared) / bin(wanted).count("1")
+
+    def score(
+        self,
+        candidates: np.ndarray,
+        distances: np.ndarray,
+        wanted_skills: int,
+        availability: int,
+        online: np.ndarray
+    ) -> np.ndarray:
+        column = self.column
+        reviews = candidates[:, column["review_count"]]
+        rating = (
+            (candidates[:, column["rating"]] * reviews + self.rating_prior * self.rating_prior_weight)
+            / (reviews + self.rating_prior_weight)
+        )
+        weights = self.weights
+        return (
+            weights["distance"] * np.exp2(-distances / self.half_life_km)
+            + weights["skills"] * self.overlap(candidates[:, column["skills"]], wanted_skills)
+            + weights["availability"] * self.overlap(candidates[:, column["availability"]], availability)
+            + weights["rating"] * rating / 5.0
+            + weights["verified"] * candidates[:, column["is_verified"]]
+            + weights["online"] * online
+        )
+
+    @staticmethod
+    def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+        """Indices of the k best scores, best first"""
+        if k < len(scores):
+            best = np.argpartition(-scores, k - 1)[:k]
+        else:
+            best = np.arange(len(scores))
+        return best[np.argsort(-scores[best], kind="stable")]
+
+# Weights sum to 1, so matchScore reads as a percentage
+BUDDY_MATCH_WEIGHTS = {"distance": 0.3, "skills": 0.2, "availability": 0.2, "rating": 0.15, "verified": 0.1, "online": 0.05}
+buddy_matcher = BuddyMatchEngine(BUDDY_MATCH_WEIGHTS, half_life_km=float(os.getenv("BUDDY_MATCH_HALF_LIFE_KM", 3)))
+MATCH_CANDIDATE_COLUMNS = (
+    User.id,
+    User.latitude,
+    User.longitude,
+    func.coalesce(User.skills, 0),
+    func.coalesce(User.availability, 0),
+    func.coalesce(User.rating, 0.0),
+    func.coalesce(User.review_count, 0),
+    func.coalesce(User.is_verified, False)
+)
 
 # Pydantic Models
 class UserCreate(BaseModel):
@@ -176,10 +883,20 @@ class UserResponse(BaseModel):
     rank: str
     is_verified: bool
     created_at: datetime
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
 
     class Config:
         from_attributes = True
 
+class LocationUpdate(BaseModel):
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+
+class BuddyProfileUpdate(BaseModel):
+    skills: list[str] = []
+    availability: list[str] = []  # "mon:evening", see AVAILABILITY_WINDOWS
+
 class Token(BaseModel):
     access_token: str
     token_type: str
@@ -231,6 +948,9 @@ class HelpRequestCreate(BaseModel):
     location: str
     urgency: str
     responders_needed: int = 1
+    # Defaults to the requester's saved location
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
 
 class HelpRequestResponse(BaseModel):
     id: int
@@ -244,6 +964,8 @@ class HelpRequestResponse(BaseModel):
     status: str
     responders_needed: int
     responders_count: int
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
     created_at: datetime
 
     class Config:
@@ -271,6 +993,7 @@ class GlobalAlertResponse(BaseModel):
     acknowledged_count: int
     expires_at: Optional[str]
     created_at: datetime
+    fanout_job_id: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -328,8 +1051,112 @@ class ConversationResponse(BaseModel):
     class Config:
         from_attributes = True
 
+# Response Encoding
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+response_media_type: ContextVar[str] = ContextVar("response_media_type", default="application/json")
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: orjson when installed, MessagePack when negotiated"""
+
+    def __init__(self, content, *args, **kwargs):
+        if response_media_type.get() == MSGPACK_MEDIA_TYPE:
+            self.media_type = MSGPACK_MEDIA_TYPE
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content) -> bytes:
+        if self.media_type == MSGPACK_MEDIA_TYPE:
+            return msgpack.packb(content, use_bin_type=True, default=encode_temporal)
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=encode_temporal).encode("utf-8")
+
+def encode_temporal(value):
+    # Read models hand raw column values to the encoder; match orjson's ISO format
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not serializable")
+
+def negotiate_content_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, honouring q=0"""
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip()] = quality
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+class ResponseEncodingMiddleware:
+    """Negotiates MessagePack bodies and compresses buffered responses.
+
+    Only single-chunk bodies of at least minimum_size bytes are compressed;
+    event streams and anything sent in several chunks pass through untouched
+    so realtime events are never held back in a compressor.
+    """
+
+    def __init__(self, app, minimum_size: int):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request_headers = Headers(scope=scope)
+        wants_msgpack = msgpack is not None and MSGPACK_MEDIA_TYPE in request_headers.get("accept", "")
+        content_encoding = negotiate_content_encoding(request_headers.get("accept-encoding", ""))
+        token = response_media_type.set(MSGPACK_MEDIA_TYPE if wants_msgpack else "application/json")
+        start_message = None
+
+        async def send_encoded(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+            
+            start, start_message = start_message, None
+            headers = MutableHeaders(raw=start["headers"])
+            content_type = headers.get("content-type", "")
+            if content_type.startswith(("application/json", MSGPACK_MEDIA_TYPE)):
+                headers.add_vary_header("Accept")
+            body = message.get("body", b"")
+            if (
+                content_encoding
+                and not message.get("more_body", False)
+                and len(body) >= self.minimum_size
+                and "content-encoding" not in headers
+                and not content_type.startswith("text/event-stream")
+            ):
+                if content_encoding == "br":
+                    body = brotli.compress(body, quality=5)
+                else:
+                    body = gzip.compress(body, compresslevel=6)
+                headers["Content-Encoding"] = content_encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                message = {**message, "body": body}
+            await send(start)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_encoded)
+        finally:
+            response_media_type.reset(token)
+
 # FastAPI App
-app = FastAPI(title="SafeZonePH API", version="1.0.0")
+app = FastAPI(title="SafeZonePH API", version="1.0.0", default_response_class=FastJSONResponse)
 
 # CORS Middleware
 app.add_middleware(
@@ -338,8 +1165,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "X-Next-Cursor", "ETag"],
 )
 
+# Compress and negotiate after CORS has added its headers
+app.add_middleware(ResponseEncodingMiddleware, minimum_size=COMPRESSION_MIN_BYTES)
+
 # Database Dependency
 def get_db():
     db = SessionLocal()
@@ -348,36 +1179,159 @@ def get_db():
     finally:
         db.close()
 
-# Utility Functions
-def verify_password(plain_password, hashed_password):
-    # Simple password verification using stored salt
+def get_read_db():
+    """Session on the read-only pool, for GET handlers that never write"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    """AsyncSession for handlers on the async path.
+
+    Reuse sync helpers (bump_collection_versions, fetch_rows, ...) through
+    `await db.run_sync(helper, ...)` rather than duplicating them.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Password Hashing
+PASSWORD_HASH_SCHEME = "pbkdf2_sha256"
+
+def _pbkdf2(password: str, salt: str, iterations: int) -> str:
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt.encode(), iterations).hex()
+
+def _hash_password_job(password: str, iterations: int) -> str:
+    salt = secrets.token_hex(16)
+    return f"{PASSWORD_HASH_SCHEME}${iterations}${salt}${_pbkdf2(password, salt, iterations)}"
+
+def _verify_password_job(plain_password: str, hashed_password: str) -> bool:
+    if hashed_password.startswith(f"{PASSWORD_HASH_SCHEME}$"):
+        try:
+            _, iterations, salt, expected = hashed_password.split("$")
+            return secrets.compare_digest(_pbkdf2(plain_password, salt, int(iterations)), expected)
+        except ValueError:
+            return False
+    # Legacy salted SHA-256 stored as "hash:salt"
     try:
         stored_hash, salt = hashed_password.split(':')
-        password_hash = hashlib.sha256((plain_password + salt).encode()).hexdigest()
-        return password_hash == stored_hash
-    except:
+    except ValueError:
         return False
+    password_hash = hashlib.sha256((plain_password + salt).encode()).hexdigest()
+    return secrets.compare_digest(password_hash, stored_hash)
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    if not hashed_password.startswith(f"{PASSWORD_HASH_SCHEME}$"):
+        return True
+    try:
+        return int(hashed_password.split("$")[1]) < PASSWORD_HASH_ITERATIONS
+    except (IndexError, ValueError):
+        return True
+
+class PasswordHasher:
+    """Runs the password KDF in a bounded worker pool.
+
+    Hashing happens in worker processes so a login storm scales with cores
+    instead of serialising on the GIL. When processes are unavailable (some
+    sandboxes lack the semaphores multiprocessing needs) it falls back to
+    threads, which still run in parallel because hashlib releases the GIL.
+    Callers beyond max_queue_depth get a 503 rather than queueing forever.
+    Callers are sync endpoints, so at most one per request thread can be
+    waiting: fit_to_threadpool() keeps the bound below that, leaving threads
+    for every other endpoint during a login storm.
+    """
+
+    def __init__(self, max_workers: int, max_queue_depth: int):
+        self.max_workers = max(1, max_workers)
+        self.max_queue_depth = max_queue_depth
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._queue_depth = 0
+        self._peak_queue_depth = 0
+        self._completed = 0
+        self._rejected = 0
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                except (OSError, NotImplementedError):
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    def _run(self, job, *args):
+        with self._lock:
+            if self._queue_depth >= self.max_queue_depth:
+                self._rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service is busy, please try again",
+                    headers={"Retry-After": "1"},
+                )
+            self._queue_depth += 1
+            self._peak_queue_depth = max(self._peak_queue_depth, self._queue_depth)
+        try:
+            try:
+                return self._get_executor().submit(job, *args).result()
+            except BrokenProcessPool:
+                with self._lock:
+                    self._executor = None
+                return job(*args)
+        finally:
+            with self._lock:
+                self._queue_depth -= 1
+                self._completed += 1
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash_password_job, password, PASSWORD_HASH_ITERATIONS)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._run(_verify_password_job, plain_password, hashed_password)
+
+    def fit_to_threadpool(self, threads: int):
+        """Cap the queue at half the request threadpool, or it could never fill"""
+        self.max_queue_depth = max(1, min(self.max_queue_depth, threads // 2))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queueDepth": self._queue_depth,
+                "peakQueueDepth": self._peak_queue_depth,
+                "maxQueueDepth": self.max_queue_depth,
+                "completed": self._completed,
+                "rejected": self._rejected
+            }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE)
+
+# Utility Functions
+def verify_password(plain_password, hashed_password):
+    return password_hasher.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    # Simple password hashing with salt
-    salt = secrets.token_hex(16)
-    password_hash = hashlib.sha256((password + salt).encode()).hexdigest()
-    return f"{password_hash}:{salt}"
+    return password_hasher.hash(password)
+
+RANK_TIERS = [
+    {"name": "Bagong Kaibigan", "min_points": 0},
+    {"name": "Lingkod Kapwa", "min_points": 250},
+    {"name": "Kapit-Bisig Hero", "min_points": 500},
+    {"name": "Bayanihan Champion", "min_points": 1000},
+    {"name": "Community Guardian", "min_points": 2000},
+    {"name": "SafeZone Legend", "min_points": 5000},
+]
+RANK_THRESHOLDS = [tier["min_points"] for tier in RANK_TIERS]
 
 def calculate_rank(points: int) -> str:
-    rank_tiers = [
-        {"name": "Bagong Kaibigan", "min_points": 0},
-        {"name": "Lingkod Kapwa", "min_points": 250},
-        {"name": "Kapit-Bisig Hero", "min_points": 500},
-        {"name": "Bayanihan Champion", "min_points": 1000},
-        {"name": "Community Guardian", "min_points": 2000},
-        {"name": "SafeZone Legend", "min_points": 5000},
-    ]
-    
-    for i in range(len(rank_tiers) - 1, -1, -1):
-        if points >= rank_tiers[i]["min_points"]:
-            return rank_tiers[i]["name"]
-    return rank_tiers[0]["name"]
+    return RANK_TIERS[max(bisect_right(RANK_THRESHOLDS, points) - 1, 0)]["name"]
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -389,33 +1343,789 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+class PrincipalCache:
+    """In-process TTL/LRU cache of authenticated principals.
+
+    Entries are keyed by a SHA-256 digest of the bearer token and hold the
+    decoded claims plus a detached snapshot of the user row, so a hit skips
+    both the JWT signature check and the user query. Any write that changes a
+    user must call invalidate_user().
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, dict, User]] = OrderedDict()
+        self._keys_by_user: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[tuple[dict, User]]:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims, user = entry
+            if expires_at <= time.time():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return claims, user
+
+    def put(self, token: str, claims: dict, user: User):
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        # Never outlive the token itself
+        expires_at = min(time.time() + self.ttl_seconds, claims.get("exp", float("inf")))
+        snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+        make_transient_to_detached(snapshot)
+        key = self._key(token)
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (expires_at, claims, snapshot)
+            self._keys_by_user.setdefault(snapshot.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            for key in self._keys_by_user.pop(user_id, set()):
+                self._entries.pop(key, None)
+
+    def _discard(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_keys = self._keys_by_user.get(entry[2].id)
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._keys_by_user[entry[2].id]
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_MAX_ENTRIES, PRINCIPAL_CACHE_TTL_SECONDS)
+
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
+    return authenticate_token(credentials.credentials, db)
+
+def get_current_reader(credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_read_db)):
+    """get_current_user for read-only handlers; the user is bound to the read session"""
+    return authenticate_token(credentials.credentials, db)
+
+async def get_current_user_async(credentials: HTTPAuthorizationCredentials = Depends(security), db: AsyncSession = Depends(get_async_db)):
+    token = credentials.credentials
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return await db.merge(cached[1], load=False)
+    
+    payload = decode_access_token(token)
+    user = await db.scalar(select(User).where(User.email == payload["sub"]))
+    if user is None:
+        raise credentials_exception()
+    principal_cache.put(token, payload, user)
+    return user
+
+def credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+def decode_access_token(token: str) -> dict:
     try:
-        token = credentials.credentials
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
     except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise credentials_exception()
+    if payload.get("sub") is None:
+        raise credentials_exception()
+    return payload
+
+def authenticate_token(token: str, db: Session) -> User:
+    cached = principal_cache.get(token)
+    if cached is not None:
+        # Attach a copy of the snapshot to this session without a SELECT
+        return db.merge(cached[1], load=False)
     
-    user = db.query(User).filter(User.email == email).first()
+    payload = decode_access_token(token)
+    user = db.query(User).filter(User.email == payload["sub"]).first()
     if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        raise credentials_exception()
+    principal_cache.put(token, payload, user)
     return user
 
+def get_users_by_ids(db: Session, user_ids) -> dict[int, User]:
+    """Resolve many users with one IN query.
+
+    Users already loaded in this request's session (its identity map) are
+    reused without hitting the database.
+    """
+    users = {}
+    missing = []
+    for user_id in set(user_ids):
+        if user_id is None:
+            continue
+        user = db.identity_map.get(db.identity_key(User, user_id))
+        if user is not None:
+            users[user_id] = user
+        else:
+            missing.append(user_id)
+    if missing:
+        for user in db.query(User).filter(User.id.in_(missing)):
+            users[user.id] = user
+    return users
+
+# SQLite Group Commit
+class GroupCommitWriter:
+    """Single writer for SQLite that commits queued write jobs in groups.
+
+    A job is a function `job(db, *args)` that does its reads and writes on
+    the session it is given and returns whatever the handler needs. The
+    worker thread owns the only writer connection. It drains whatever has
+    queued up, up to max_batch, after waiting `window` seconds for
+    stragglers. Each job runs in its own SAVEPOINT, so an HTTPException or
+    conflict only rolls back that job. The group then commits once, one WAL
+    sync for the whole burst. Returned ORM objects are detached with their
+    state loaded.
+
+    Without the queue (PostgreSQL, SQLITE_WRITE_QUEUE=false, scripts) jobs
+    run inline on the caller's session and commit there.
+    """
+
+    def __init__(self, session_factory, enabled: bool, max_batch: int, window_seconds: float):
+        self.session_factory = session_factory
+        self.enabled = enabled
+        self.max_batch = max(1, max_batch)
+        self.window_seconds = window_seconds
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self.groups_committed = 0
+        self.jobs_committed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def submit(self, job, *args) -> Future:
+        future = Future()
+        self._queue.put((future, job, args))
+        return future
+
+    def run(self, db: Session, job, *args):
+        if not self.running:
+            result = job(db, *args)
+            db.commit()
+            return result
+        return self.submit(job, *args).result()
+
+    async def run_async(self, db: AsyncSession, job, *args):
+        if not self.running:
+            result = await db.run_sync(job, *args)
+            await db.commit()
+            return result
+        return await asyncio.wrap_future(self.submit(job, *args))
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.running,
+            "pending": self._queue.qsize(),
+            "groupsCommitted": self.groups_committed,
+            "jobsCommitted": self.jobs_committed,
+            "meanGroupSize": round(self.jobs_committed / self.groups_committed, 2) if self.groups_committed else 0
+        }
+
+    def start(self):
+        if not self.enabled or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            stopping = item is None
+            batch = [] if stopping else [item]
+            deadline = time.monotonic() + self.window_seconds
+            while len(batch) < self.max_batch and not stopping:
+                try:
+                    item = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    continue
+                batch.append(item)
+            if batch:
+                self._commit_group(batch)
+            if stopping:
+                return
+
+    def _commit_group(self, batch: list):
+        db = self.session_factory()
+        done = []
+        try:
+            for future, job, args in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with db.begin_nested():
+                        result = job(db, *args)
+                except Exception as e:
+                    future.set_exception(e)
+                else:
+                    done.append((future, result))
+            db.commit()
+            db.expunge_all()
+        except Exception as e:
+            db.rollback()
+            for future, _, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            db.close()
+        self.groups_committed += 1
+        self.jobs_committed += len(done)
+        for future, result in done:
+            future.set_result(result)
+
+group_commit_writer = GroupCommitWriter(
+    WriterSessionLocal,
+    SQLITE_WRITE_QUEUE_ENABLED,
+    SQLITE_GROUP_COMMIT_MAX,
+    SQLITE_GROUP_COMMIT_WINDOW_MS / 1000
+)
+
+# Points Ledger
+class PointsLedger:
+    """Applies points awards asynchronously and atomically.
+
+    award() writes the points_history row in the caller's transaction with
+    pending set, so an award commits or rolls back with the request that
+    earned it and survives a crash before it is applied. After the commit,
+    notify() wakes a worker thread that claims pending rows in batches
+    (UPDATE ... SET pending = false ... RETURNING, so each row is applied
+    exactly once even with several processes draining the same table) and,
+    in the same transaction, applies one SQL-side increment
+    (points = points + delta) per user and one executemany rank update.
+    User.points is never read-modified-written in Python, so concurrent
+    awards cannot lose increments. A failed batch rolls back with its rows
+    still pending and is retried on the next wake or poll; the poll also
+    picks up rows committed by other processes.
+    """
+
+    def __init__(self, batch_size: int, poll_seconds: float):
+        self.batch_size = max(1, batch_size)
+        self.poll_seconds = poll_seconds
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def award(db: Session, user_id: int, points: int, type: str, description: str):
+        """Add a pending award to db's transaction; call notify() once it commits"""
+        db.add(PointsHistory(user_id=user_id, type=type, description=description, points=points, pending=True))
+
+    def notify(self):
+        if self._thread is None:
+            # Not running as a server (scripts, migrations): apply inline
+            while self.apply_pending() == self.batch_size:
+                pass
+        else:
+            self._wake.set()
+
+    @staticmethod
+    def pending_count(db: Session, user_ids: Optional[list[int]] = None) -> int:
+        query = db.query(func.count(PointsHistory.id)).filter(PointsHistory.pending == True)
+        if user_ids is not None:
+            query = query.filter(PointsHistory.user_id.in_(user_ids))
+        return query.scalar()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._wake.set()  # apply whatever an earlier run left pending
+        self._thread = threading.Thread(target=self._run, name="points-ledger", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stopping = True
+        self._wake.set()
+        self._thread.join(timeout=10)
+        self._thread = None
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+            try:
+                while self.apply_pending() == self.batch_size:
+                    pass
+            except Exception:
+                logger.exception("Points ledger batch failed; its awards stay pending")
+            if self._stopping:
+                return
+
+    def apply_pending(self) -> int:
+        """Apply up to batch_size pending awards; returns how many were claimed"""
+        history = PointsHistory.__table__
+        users = User.__table__
+        db = SessionLocal()
+        try:
+            ids = db.scalars(
+                select(PointsHistory.id).where(PointsHistory.pending == True)
+                .order_by(PointsHistory.id).limit(self.batch_size)
+            ).all()
+            if not ids:
+                return 0
+            claimed = db.execute(
+                update(history)
+                .where(history.c.id.in_(ids), history.c.pending == True)
+                .values(pending=False)
+                .returning(history.c.user_id, history.c.points)
+            ).all()
+            deltas = Counter()
+            for user_id, points in claimed:
+                deltas[user_id] += points
+            bump_collection_versions(db, LEADERBOARD_COLLECTION)
+            version = collection_version(db, LEADERBOARD_COLLECTION)
+            for user_id, delta in deltas.items():
+                db.execute(
+                    update(users)
+                    .where(users.c.id == user_id)
+                    .values(points=users.c.points + delta, leaderboard_version=version)
+                )
+            totals = db.execute(select(User.id, User.points).where(User.id.in_(list(deltas)))).all()
+            if totals:
+                db.execute(
+                    update(users)
+                    .where(users.c.id == bindparam("user_id"))
+                    .values(rank=bindparam("new_rank")),
+                    [{"user_id": user_id, "new_rank": calculate_rank(points)} for user_id, points in totals]
+                )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+        
+        for user_id, points in totals:
+            principal_cache.invalidate_user(user_id)
+        leaderboard.set_points(totals, version)
+        return len(ids)
+
+    @staticmethod
+    def reconcile(db: Session, user_ids: Optional[list[int]] = None) -> list[dict]:
+        """Users whose User.points differs from the sum of their applied ledger entries and rollups"""
+        raw = select(
+            PointsHistory.user_id, func.sum(PointsHistory.points).label("total")
+        ).where(PointsHistory.pending == False).group_by(PointsHistory.user_id).subquery()
+        rolled = select(
+            PointsHistoryRollup.user_id, func.sum(PointsHistoryRollup.points).label("total")
+        ).group_by(PointsHistoryRollup.user_id).subquery()
+        ledger_total = func.coalesce(raw.c.total, 0) + func.coalesce(rolled.c.total, 0)
+        query = db.query(User.id, User.points, ledger_total.label("ledger_total")).outerjoin(
+            raw, raw.c.user_id == User.id
+        ).outerjoin(
+            rolled, rolled.c.user_id == User.id
+        ).filter(User.points != ledger_total)
+        if user_ids is not None:
+            query = query.filter(User.id.in_(user_ids))
+        return [
+            {"userId": user_id, "points": points, "ledgerTotal": total}
+            for user_id, points, total in query
+        ]
+
+points_ledger = PointsLedger(POINTS_LEDGER_BATCH_SIZE, POINTS_LEDGER_POLL_SECONDS)
+
+# Points History Rollups
+# Users per rollup lookup, well under SQLite's bound parameter limit
+ROLLUP_LOOKUP_CHUNK_SIZE = 500
+
+def as_date(value) -> date:
+    # SQLite returns DATE() results as ISO strings
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+def compact_points_history(db: Session, cutoff: datetime) -> int:
+    """Fold points_history rows older than cutoff into daily rollups.
+
+    Aggregation, rollup upserts and deletion of the folded rows happen in one
+    transaction, so per-user totals are unchanged at every commit. New ledger
+    rows are always stamped now, so nothing lands behind the cutoff while
+    this runs. Pending awards stay raw until the ledger worker has applied
+    them. Returns the number of raw rows compacted.
+    """
+    day = func.date(PointsHistory.created_at)
+    aggregates = db.execute(
+        select(
+            PointsHistory.user_id, day, PointsHistory.type,
+            func.sum(PointsHistory.points), func.count(PointsHistory.id)
+        )
+        .where(PointsHistory.created_at < cutoff, PointsHistory.pending == False)
+        .group_by(PointsHistory.user_id, day, PointsHistory.type)
+    ).all()
+    if not aggregates:
+        return 0
+    
+    aggregates = [(user_id, as_date(day), type, points, count) for user_id, day, type, points, count in aggregates]
+    user_ids = sorted({row[0] for row in aggregates})
+    first_day = min(row[1] for row in aggregates)
+    existing = {}
+    for start in range(0, len(user_ids), ROLLUP_LOOKUP_CHUNK_SIZE):
+        for rollup in db.query(PointsHistoryRollup).filter(
+            PointsHistoryRollup.user_id.in_(user_ids[start:start + ROLLUP_LOOKUP_CHUNK_SIZE]),
+            PointsHistoryRollup.day >= first_day
+        ):
+            existing[(rollup.user_id, rollup.day, rollup.type)] = rollup
+    new_rollups = []
+    for user_id, day, type, points, count in aggregates:
+        rollup = existing.get((user_id, day, type))
+        if rollup is not None:
+            rollup.points += points
+            rollup.entry_count += count
+        else:
+            new_rollups.append({"user_id": user_id, "day": day, "type": type, "points": points, "entry_count": count})
+    if new_rollups:
+        db.execute(insert(PointsHistoryRollup), new_rollups)
+    
+    compacted = db.query(PointsHistory).filter(
+        PointsHistory.created_at < cutoff, PointsHistory.pending == False
+    ).delete(synchronize_session=False)
+    db.commit()
+    return compacted
+
+class PointsRollupWorker:
+    """Periodically compacts points history older than the raw retention window"""
+
+    def __init__(self, raw_days: int, interval_seconds: float):
+        self.raw_days = raw_days
+        self.interval_seconds = interval_seconds
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def cutoff(self) -> datetime:
+        # Compact whole days only, so a rollup never overlaps raw rows
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        return today - timedelta(days=self.raw_days)
+
+    def run_once(self) -> int:
+        db = SessionLocal()
+        try:
+            return compact_points_history(db, self.cutoff())
+        except Exception:
+            db.rollback()
+            logger.exception("Points history compaction failed")
+            return 0
+        finally:
+            db.close()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="points-rollup", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=10)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval_seconds)
+
+points_rollup_worker = PointsRollupWorker(POINTS_HISTORY_RAW_DAYS, POINTS_ROLLUP_INTERVAL_SECONDS)
+
+# Community Leaderboard
+class Leaderboard:
+    """In-memory rankings kept in step with the points ledger.
+
+    Every scope (global, each city, each barangay within a city) holds a list
+    of (-points, user_id) keys kept sorted with insort, so top-N is a slice
+    and a user's rank is a single bisect.
+
+    Each process keeps its own copy, loaded once by warm() at startup.
+    Every write that changes rankings bumps the leaderboard collection
+    version in its transaction and stamps the users it moved with that
+    version. A process applies its own writes in place when they are the
+    next version; a read that finds the stored version ahead of the copy
+    (another worker wrote in between) reloads only the users stamped after
+    the copy's version, through the index on the stamp. Reads otherwise
+    cost one primary-key lookup.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._users: dict[int, dict] = {}
+        self._scopes: dict[tuple, list[tuple[int, int]]] = {}
+
+    @staticmethod
+    def _scope_keys(entry: dict) -> list[tuple]:
+        keys = [("global", None)]
+        if entry["city"]:
+            keys.append(("city", entry["city"]))
+            if entry["barangay"]:
+                keys.append(("barangay", (entry["city"], entry["barangay"])))
+        return keys
+
+    def scope_key(self, scope: str, user: User) -> Optional[tuple]:
+        """The user's ordering for a scope, or None if their profile lacks that area"""
+        entry = {"city": normalize_area(user.city), "barangay": normalize_area(user.barangay)}
+        return next((key for key in self._scope_keys(entry) if key[0] == scope), None)
+
+    def _insert(self, user_id: int, entry: dict):
+        self._users[user_id] = entry
+        for key in self._scope_keys(entry):
+            insort(self._scopes.setdefault(key, []), (-entry["points"], user_id))
+
+    def _remove(self, user_id: int) -> Optional[dict]:
+        entry = self._users.pop(user_id, None)
+        if entry is None:
+            return None
+        for key in self._scope_keys(entry):
+            ordering = self._scopes[key]
+            index = bisect_left(ordering, (-entry["points"], user_id))
+            del ordering[index]
+            if not ordering:
+                del self._scopes[key]
+        return entry
+
+    @staticmethod
+    def _entry(first_name: str, last_name: str, city: Optional[str], barangay: Optional[str], points: Optional[int], rank: str) -> dict:
+        return {
+            "name": f"{first_name} {last_name}",
+            "city": normalize_area(city),
+            "barangay": normalize_area(barangay),
+            "points": points or 0,
+            "rank": rank
+        }
+
+    def warm(self):
+        """Load every active user; each process does this once, at startup"""
+        db = SessionLocal()
+        try:
+            # Read before the rows, so a racing write is caught up on the next read
+            version = collection_version(db, LEADERBOARD_COLLECTION)
+            rows = db.execute(
+                select(User.id, User.first_name, User.last_name, User.city, User.barangay, User.points, User.rank)
+                .where(User.is_active == True)
+            ).all()
+        finally:
+            db.close()
+        with self._lock:
+            self._users = {}
+            self._scopes = {}
+            for user_id, *profile in rows:
+                entry = self._entry(*profile)
+                self._users[user_id] = entry
+                for key in self._scope_keys(entry):
+                    self._scopes.setdefault(key, []).append((-entry["points"], user_id))
+            for ordering in self._scopes.values():
+                ordering.sort()
+            self._version = version
+
+    def _ensure_current(self, version: int):
+        # Caller holds the lock. Rows stamped with the version just read have
+        # committed, so they are all visible; rows from a later write may be
+        # too, and applying their absolute points twice is harmless.
+        if self._version >= version:
+            return
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(
+                    User.id, User.is_active, User.first_name, User.last_name,
+                    User.city, User.barangay, User.points, User.rank
+                ).where(User.leaderboard_version > self._version)
+            ).all()
+        finally:
+            db.close()
+        for user_id, is_active, *profile in rows:
+            self._remove(user_id)
+            if is_active:
+                self._insert(user_id, self._entry(*profile))
+        self._version = version
+
+    def _advance(self, version: int) -> bool:
+        # Caller holds the lock. A local write is applied in place only when
+        # it is the very next version; otherwise the next read catches up.
+        if self._version is None or self._version != version - 1:
+            return False
+        self._version = version
+        return True
+
+    def add_user(self, user: User, version: int):
+        with self._lock:
+            if not self._advance(version):
+                return
+            self._remove(user.id)
+            self._insert(user.id, self._entry(user.first_name, user.last_name, user.city, user.barangay, user.points, user.rank))
+
+    def set_points(self, totals: list[tuple[int, int]], version: int):
+        with self._lock:
+            if not self._advance(version):
+                return
+            for user_id, points in totals:
+                entry = self._remove(user_id)
+                if entry is None:
+                    continue
+                entry["points"] = points
+                entry["rank"] = calculate_rank(points)
+                self._insert(user_id, entry)
+
+    def _serialize(self, ordering: list[tuple[int, int]], start: int, stop: int) -> list[dict]:
+        results = []
+        for index in range(max(start, 0), min(stop, len(ordering))):
+            points = -ordering[index][0]
+            user_id = ordering[index][1]
+            entry = self._users[user_id]
+            results.append({
+                "position": bisect_left(ordering, (-points,)) + 1,
+                "userId": user_id,
+                "name": entry["name"],
+                "points": points,
+                "rank": entry["rank"]
+            })
+        return results
+
+    def _ensure_warm(self):
+        if self._version is None:
+            # Not running as a server (scripts, tests): load on first read
+            self.warm()
+
+    def top(self, key: tuple, limit: int, version: int) -> dict:
+        self._ensure_warm()
+        with self._lock:
+            self._ensure_current(version)
+            ordering = self._scopes.get(key, [])
+            return {"total": len(ordering), "entries": self._serialize(ordering, 0, limit)}
+
+    def standing(self, key: tuple, user_id: int, radius: int, version: int) -> Optional[dict]:
+        """A user's position (ties share a position) and the users around it"""
+        self._ensure_warm()
+        with self._lock:
+            self._ensure_current(version)
+            entry = self._users.get(user_id)
+            ordering = self._scopes.get(key, [])
+            if entry is None or key not in self._scope_keys(entry):
+                return None
+            index = bisect_left(ordering, (-entry["points"], user_id))
+            return {
+                "total": len(ordering),
+                "position": bisect_left(ordering, (-entry["points"],)) + 1,
+                "points": entry["points"],
+                "neighbours": self._serialize(ordering, index - radius, index + radius + 1)
+            }
+
+leaderboard = Leaderboard()
+
+# Realtime Push Gateway
+class PushHub:
+    """Per-user fan-out of realtime events to WebSocket and SSE clients.
+
+    Sync handlers run in Starlette's thread pool, so events are handed over to
+    the event loop with call_soon_threadsafe. Each connection gets a bounded
+    queue; a slow client loses its oldest events instead of stalling publishers.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: dict[int, set[asyncio.Queue]] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        with self._lock:
+            queues = self._subscribers.get(user_id)
+            if queues is None:
+                return
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[user_id]
+
+    def is_online(self, user_id: int) -> bool:
+        with self._lock:
+            return user_id in self._subscribers
+
+    def online_user_ids(self) -> set[int]:
+        with self._lock:
+            return set(self._subscribers)
+
+    def publish(self, user_id: int, event_type: str, data):
+        with self._lock:
+            queues = list(self._subscribers.get(user_id, ()))
+        self._dispatch(queues, event_type, data)
+
+    def broadcast(self, event_type: str, data):
+        with self._lock:
+            queues = [q for user_queues in self._subscribers.values() for q in user_queues]
+        self._dispatch(queues, event_type, data)
+
+    def _dispatch(self, queues, event_type: str, data):
+        if not queues or self._loop is None or self._loop.is_closed():
+            return
+        event = {"type": event_type, "data": jsonable_encoder(data)}
+        for queue in queues:
+            self._loop.call_soon_threadsafe(self._enqueue, queue, event)
+
+    @staticmethod
+    def _enqueue(queue: asyncio.Queue, event: dict):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+push_hub = PushHub()
+
+def serialize_notification(n: "Notification") -> dict:
+    return {
+        "id": n.id,
+        "type": n.type,
+        "title": n.title,
+        "message": n.message,
+        "relatedId": n.related_id,
+        "isRead": n.is_read,
+        "createdAt": n.created_at.isoformat() if n.created_at else None
+    }
+
+def publish_notification(notification: "Notification"):
+    """Push a committed notification to its recipient's open connections"""
+    push_hub.publish(notification.user_id, "notification", serialize_notification(notification))
+
+def resolve_push_user_id(token: str) -> int:
+    db = SessionLocal()
+    try:
+        return authenticate_token(token, db).id
+    finally:
+        db.close()
+
 # API Endpoints
 @app.post("/api/auth/register", response_model=Token)
 def register(user_data: UserCreate, db: Session = Depends(get_db)):
@@ -438,6 +2148,8 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         phone=user_data.phone,
         barangay=user_data.barangay,
         city=user_data.city,
+        city_area_key=city_key(user_data.city),
+        barangay_area_key=barangay_key(user_data.city, user_data.barangay),
         location=location,
         hashed_password=hashed_password,
         points=100,  # Welcome points
@@ -456,7 +2168,11 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         points=100
     )
     db.add(points_entry)
+    bump_collection_versions(db, LEADERBOARD_COLLECTION)
+    leaderboard_version = collection_version(db, LEADERBOARD_COLLECTION)
+    db_user.leaderboard_version = leaderboard_version
     db.commit()
+    leaderboard.add_user(db_user, leaderboard_version)
     
     # Create access token
     access_token = create_access_token(data={"sub": db_user.email})
@@ -478,6 +2194,13 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Transparently move legacy hashes to the current KDF settings
+    if password_needs_rehash(user.hashed_password):
+        user.hashed_password = get_password_hash(user_credentials.password)
+        db.commit()
+        db.refresh(user)
+        principal_cache.invalidate_user(user.id)
+    
     access_token = create_access_token(data={"sub": user.email})
     
     return {
@@ -487,12 +2210,85 @@ def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     }
 
 @app.get("/api/auth/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+def get_current_user_info(current_user: User = Depends(get_current_reader)):
     return UserResponse.from_orm(current_user)
 
-@app.get("/api/tasks")
-def get_tasks(db: Session = Depends(get_db)):
-    tasks = db.query(Task).all()
+# Undated tasks sort after every dated one
+UNDATED_DUE_DATE = "9999-12-31"
+TASK_SORT_COLUMNS = {
+    "created_at": Task.created_at,
+    "due_date": func.coalesce(Task.due_date, UNDATED_DUE_DATE),
+    "points": Task.points,
+}
+
+def encode_cursor(value, id: int) -> str:
+    payload = json.dumps([value.isoformat() if isinstance(value, datetime) else value, id])
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+def decode_cursor(cursor: str, sort_field: str) -> tuple:
+    try:
+        value, id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if sort_field == "created_at":
+            value = datetime.fromisoformat(value)
+        return value, int(id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def split_filter(value: Optional[str]) -> list[str]:
+    return [item.strip() for item in value.split(",") if item.strip()] if value else []
+
+@app.get("/api/tasks", response_model=list[TaskResponse])
+def get_tasks(
+    response: Response,
+    status_filter: Optional[str] = Query(None, alias="status", description="Comma-separated statuses"),
+    category: Optional[str] = Query(None, description="Comma-separated categories"),
+    priority: Optional[str] = Query(None, description="Comma-separated priorities"),
+    assignee: Optional[str] = None,
+    due_from: Optional[str] = Query(None, description="Inclusive ISO date"),
+    due_to: Optional[str] = Query(None, description="Inclusive ISO date"),
+    sort: str = Query("-created_at", pattern="^-?(created_at|due_date|points)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    current_user: User = Depends(get_current_reader),
+    db: Session = Depends(get_read_db)
+):
+    """The caller's tasks, filtered and keyset-paginated on the server.
+
+    The first page carries X-Total-Count for the whole filtered set; every
+    page that has a successor carries X-Next-Cursor.
+    """
+    query = db.query(Task).filter(Task.created_by == current_user.id)
+    for column, values in ((Task.status, split_filter(status_filter)), (Task.category, split_filter(category)), (Task.priority, split_filter(priority))):
+        if values:
+            query = query.filter(column.in_(values))
+    if assignee:
+        query = query.filter(Task.assigned_to == assignee)
+    if due_from:
+        query = query.filter(Task.due_date >= due_from)
+    if due_to:
+        # Due dates may carry a time component; compare against the end of the day
+        query = query.filter(Task.due_date <= f"{due_to}\uffff")
+    
+    if cursor is None:
+        response.headers["X-Total-Count"] = str(query.order_by(None).count())
+    
+    descending = sort.startswith("-")
+    sort_field = sort.lstrip("-")
+    sort_column = TASK_SORT_COLUMNS[sort_field]
+    if cursor is not None:
+        value, last_id = decode_cursor(cursor, sort_field)
+        if descending:
+            query = query.filter(or_(sort_column < value, and_(sort_column == value, Task.id < last_id)))
+        else:
+            query = query.filter(or_(sort_column > value, and_(sort_column == value, Task.id > last_id)))
+    order = (sort_column.desc(), Task.id.desc()) if descending else (sort_column.asc(), Task.id.asc())
+    
+    tasks = query.order_by(*order).limit(limit + 1).all()
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        last = tasks[-1]
+        sort_value = (last.due_date or UNDATED_DUE_DATE) if sort_field == "due_date" else getattr(last, sort_field)
+        response.headers["X-Next-Cursor"] = encode_cursor(sort_value, last.id)
     return [TaskResponse.from_orm(task) for task in tasks]
 
 @app.post("/api/tasks", response_model=TaskResponse)
@@ -527,23 +2323,16 @@ def update_task(task_id: int, task_update: TaskUpdate, current_user: User = Depe
     # Update task fields
     for field, value in task_update.dict(exclude_unset=True).items():
         setattr(task, field, value)
-
+    
     # If task was just completed (status changed from non-completed to completed), award points
-    if task_update.status == "completed" and old_status != "completed":
-        current_user.points += task.points
-        current_user.rank = calculate_rank(current_user.points)
-
-        # Add to points history
-        points_entry = PointsHistory(
-            user_id=current_user.id,
-            type="task_completed",
-            description=f"Completed task: {task.title}",
-            points=task.points
-        )
-        db.add(points_entry)
-
+    completed = task_update.status == "completed" and old_status != "completed"
+    if completed:
+        points_ledger.award(db, current_user.id, task.points, "task_completed", f"Completed task: {task.title}")
+    
     db.commit()
     db.refresh(task)
+    if completed:
+        points_ledger.notify()
     
     # Return the updated task
     return {
@@ -562,32 +2351,164 @@ def update_task(task_id: int, task_update: TaskUpdate, current_user: User = Depe
 
 # Points History Endpoint
 @app.get("/api/points/history")
-def get_points_history(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Get points history for the current user"""
-    history = db.query(PointsHistory).filter(
-        PointsHistory.user_id == current_user.id
-    ).order_by(PointsHistory.created_at.desc()).all()
+def get_points_history(response: Response, current_user: User = Depends(get_current_reader), db: Session = Depends(get_read_db)):
+    """Get points history for the current user.
+
+    Recent entries are returned individually, followed by one entry per day
+    and type for history that has been compacted into rollups.
+    """
+    history = db.execute(
+        select(PointsHistory.id, PointsHistory.type, PointsHistory.description, PointsHistory.points, PointsHistory.created_at)
+        .where(PointsHistory.user_id == current_user.id)
+        .order_by(PointsHistory.created_at.desc())
+    )
+    rollups = db.execute(
+        select(PointsHistoryRollup.id, PointsHistoryRollup.type, PointsHistoryRollup.points, PointsHistoryRollup.day, PointsHistoryRollup.entry_count)
+        .where(PointsHistoryRollup.user_id == current_user.id)
+        .order_by(PointsHistoryRollup.day.desc(), PointsHistoryRollup.type)
+    )
     
-    return [
+    rows = [
         {
-            "id": entry.id,
-            "type": entry.type,
-            "description": entry.description,
-            "points": entry.points,
-            "timestamp": entry.created_at.isoformat(),
-            "date": entry.created_at.date().isoformat()
+            "id": id,
+            "type": type,
+            "description": description,
+            "points": points,
+            "timestamp": created_at,
+            "date": created_at.date()
         }
-        for entry in history
+        for id, type, description, points, created_at in history
     ]
+    rows.extend(
+        {
+            "id": f"rollup-{id}",
+            "type": type,
+            "description": f"{entry_count} × {type.replace('_', ' ')}",
+            "points": points,
+            "timestamp": datetime.combine(day, datetime.min.time()),
+            "date": day,
+            "entryCount": entry_count,
+            "isRollup": True
+        }
+        for id, type, points, day, entry_count in rollups
+    )
+    return read_model_response(rows, response)
+
+@app.get("/api/points/summary")
+def get_points_summary(
+    months: int = Query(12, ge=1, le=120),
+    current_user: User = Depends(get_current_reader),
+    db: Session = Depends(get_read_db)
+):
+    """Monthly points totals by type, built from rollups plus recent raw entries"""
+    start = (datetime.utcnow().replace(day=1) - timedelta(days=31 * (months - 1))).replace(day=1).date()
+    day = func.date(PointsHistory.created_at)
+    raw = db.execute(
+        select(day, PointsHistory.type, func.sum(PointsHistory.points))
+        .where(PointsHistory.user_id == current_user.id, PointsHistory.created_at >= start)
+        .group_by(day, PointsHistory.type)
+    ).all()
+    rolled = db.execute(
+        select(PointsHistoryRollup.day, PointsHistoryRollup.type, PointsHistoryRollup.points)
+        .where(PointsHistoryRollup.user_id == current_user.id, PointsHistoryRollup.day >= start)
+    ).all()
+    
+    summary: dict[str, dict] = {}
+    for entry_day, type, points in list(raw) + list(rolled):
+        month = summary.setdefault(as_date(entry_day).strftime("%Y-%m"), {"total": 0, "byType": {}})
+        month["total"] += points
+        month["byType"][type] = month["byType"].get(type, 0) + points
+    return [{"month": month, **totals} for month, totals in sorted(summary.items(), reverse=True)]
+
+@app.get("/api/points/reconcile")
+def reconcile_points(current_user: User = Depends(get_current_reader), db: Session = Depends(get_read_db)):
+    """Check the current user's balance against the sum of their ledger entries"""
+    mismatches = PointsLedger.reconcile(db, [current_user.id])
+    return {
+        "consistent": not mismatches,
+        "mismatches": mismatches,
+        "pendingAwards": points_ledger.pending_count(db, [current_user.id])
+    }
+
+# Leaderboard Endpoints
+@app.get("/api/leaderboard")
+def get_leaderboard(
+    scope: str = Query("global", pattern="^(global|city|barangay)$"),
+    limit: int = Query(10, ge=1, le=100),
+    radius: int = Query(2, ge=0, le=25),
+    current_user: User = Depends(get_current_reader),
+    db: Session = Depends(get_read_db)
+):
+    """Top users in the caller's scope plus the caller's own standing"""
+    key = leaderboard.scope_key(scope, current_user)
+    if key is None:
+        raise HTTPException(status_code=400, detail=f"Set your {scope} in your profile to see this leaderboard")
+    
+    version = collection_version(db, LEADERBOARD_COLLECTION)
+    board = leaderboard.top(key, limit, version)
+    return {
+        "scope": scope,
+        "total": board["total"],
+        "top": board["entries"],
+        "me": leaderboard.standing(key, current_user.id, radius, version)
+    }
 
 # Help Request Endpoints
 @app.get("/api/help-requests")
-def get_help_requests(db: Session = Depends(get_db)):
-    requests = db.query(HelpRequest).order_by(HelpRequest.created_at.desc()).all()
-    return [HelpRequestResponse.from_orm(req) for req in requests]
+async def get_help_requests(
+    request: Request,
+    response: Response,
+    status_filter: Optional[str] = Query(None, alias="status", description="Comma-separated statuses"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Help requests, newest first, keyset-paginated; X-Next-Cursor marks a further page"""
+    not_modified = await db.run_sync(conditional_response, HELP_REQUESTS_COLLECTION, request, response)
+    if not_modified:
+        return not_modified
+    statement = select(*schema_columns(HelpRequestResponse, HelpRequest))
+    statuses = split_filter(status_filter)
+    if statuses:
+        statement = statement.where(HelpRequest.status.in_(statuses))
+    if cursor is not None:
+        created_at, last_id = decode_cursor(cursor, "created_at")
+        statement = statement.where(or_(
+            HelpRequest.created_at < created_at,
+            and_(HelpRequest.created_at == created_at, HelpRequest.id < last_id)
+        ))
+    rows = await db.run_sync(fetch_rows, statement.order_by(HelpRequest.created_at.desc(), HelpRequest.id.desc()).limit(limit + 1))
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+    return read_model_response(rows, response)
+
+@app.get("/api/help-requests/dispatched")
+def get_dispatched_help_requests(current_user: User = Depends(get_current_reader), db: Session = Depends(get_read_db)):
+    """Open requests the dispatcher pushed to the caller, most urgent and oldest first"""
+    rows = db.execute(
+        select(HelpRequest, HelpRequestDispatch.distance_km)
+        .join(HelpRequestDispatch, HelpRequestDispatch.request_id == HelpRequest.id)
+        .where(HelpRequestDispatch.user_id == current_user.id, HelpRequest.status == "open")
+        .order_by(HelpRequestDispatch.created_at.desc())
+        .limit(100)
+    ).all()
+    rows.sort(key=lambda row: dispatch_priority(row.HelpRequest.urgency, row.HelpRequest.created_at, row.HelpRequest.id))
+    return [
+        {**HelpRequestResponse.from_orm(help_request).model_dump(), "distance": round(distance_km, 3)}
+        for help_request, distance_km in rows
+    ]
+
+def insert_help_request(db: Session, db_request: HelpRequest) -> HelpRequest:
+    """Write job: file a new help request"""
+    db.add(db_request)
+    bump_collection_versions(db, HELP_REQUESTS_COLLECTION)
+    db.flush()
+    db.refresh(db_request)
+    return db_request
 
 @app.post("/api/help-requests", response_model=HelpRequestResponse)
-def create_help_request(request_data: HelpRequestCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+def create_help_request(request_data: HelpRequestCreate, current_user: User = Depends(get_current_reader), db: Session = Depends(get_db)):
     db_request = HelpRequest(
         user_id=current_user.id,
         user_name=f"{current_user.first_name} {current_user.last_name}",
@@ -598,50 +2519,76 @@ def create_help_request(request_data: HelpRequestCreate, current_user: User = De
         urgency=request_data.urgency,
         responders_needed=request_data.responders_needed
     )
-    
-    db.add(db_request)
-    db.commit()
-    db.refresh(db_request)
+    if request_data.latitude is not None and request_data.longitude is not None:
+        db_request.latitude, db_request.longitude = request_data.latitude, request_data.longitude
+    else:
+        db_request.latitude, db_request.longitude = current_user.latitude, current_user.longitude
+    db_request = group_commit_writer.run(db, insert_help_request, db_request)
+    help_request_dispatcher.enqueue(db_request.id, db_request.urgency, db_request.created_at)
     
     return HelpRequestResponse.from_orm(db_request)
 
-@app.patch("/api/help-requests/{request_id}/respond")
-def respond_to_help_request(request_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    help_request = db.query(HelpRequest).filter(HelpRequest.id == request_id).first()
+def record_help_response(db: Session, request_id: int, user_id: int) -> HelpRequest:
+    """Write job: count one more responder on a help request and award the responder"""
+    help_request = db.get(HelpRequest, request_id)
     if not help_request:
         raise HTTPException(status_code=404, detail="Help request not found")
     
-    help_request.responders_count += 1
-    if help_request.responders_count >= help_request.responders_needed:
-        help_request.status = "in_progress"
+    # SQL-side increment, so responders are counted even without the writer queue
+    help_request.responders_count = HelpRequest.responders_count + 1
+    help_request.status = case(
+        (HelpRequest.responders_count + 1 >= HelpRequest.responders_needed, "in_progress"),
+        else_=HelpRequest.status
+    )
     
-    db.commit()
+    bump_collection_versions(db, HELP_REQUESTS_COLLECTION)
+    db.flush()
     db.refresh(help_request)
-    
-    # Award points for responding
-    current_user.points += 25
-    current_user.rank = calculate_rank(current_user.points)
-    
-    points_entry = PointsHistory(
-        user_id=current_user.id,
-        type="help_response",
-        description=f"Responded to help request: {help_request.title}",
-        points=25
-    )
-    db.add(points_entry)
-    db.commit()
+    points_ledger.award(db, user_id, 25, "help_response", f"Responded to help request: {help_request.title}")
+    return help_request
+
+@app.patch("/api/help-requests/{request_id}/respond")
+def respond_to_help_request(request_id: int, current_user: User = Depends(get_current_reader), db: Session = Depends(get_db)):
+    help_request = group_commit_writer.run(db, record_help_response, request_id, current_user.id)
+    points_ledger.notify()
     
     return {"message": "Response recorded", "request": HelpRequestResponse.from_orm(help_request)}
 
 # Global Alert Endpoints
 @app.get("/api/global-alerts")
-def get_global_alerts(db: Session = Depends(get_db)):
-    alerts = db.query(GlobalAlert).order_by(GlobalAlert.created_at.desc()).all()
-    return [GlobalAlertResponse.from_orm(alert) for alert in alerts]
+def get_global_alerts(request: Request, response: Response, db: Session = Depends(get_read_db)):
+    not_modified = conditional_response(db, GLOBAL_ALERTS_COLLECTION, request, response)
+    if not_modified:
+        return not_modified
+    rows = fetch_rows(db, select(*schema_columns(GlobalAlertResponse, GlobalAlert)).order_by(GlobalAlert.created_at.desc()))
+    return read_model_response(rows, response)
+
+@app.get("/api/global-alerts/mine")
+def get_my_global_alerts(
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(get_current_reader),
+    db: Session = Depends(get_read_db)
+):
+    """Active alerts targeting the current user's barangay or city"""
+    # Area keys come from the profile, so they are part of the representation
+    area_variant = ",".join(sorted(user_area_keys(current_user)))
+    not_modified = conditional_response(db, GLOBAL_ALERTS_COLLECTION, request, response, area_variant)
+    if not_modified:
+        return not_modified
+    matching = select(GlobalAlertArea.alert_id).where(GlobalAlertArea.area.in_(user_area_keys(current_user)))
+    rows = fetch_rows(
+        db,
+        select(*schema_columns(GlobalAlertResponse, GlobalAlert))
+        .where(GlobalAlert.id.in_(matching), GlobalAlert.is_active == True)
+        .order_by(GlobalAlert.created_at.desc())
+        .limit(limit)
+    )
+    return read_model_response(rows, response)
 
 @app.post("/api/global-alerts", response_model=GlobalAlertResponse)
 def create_global_alert(alert_data: GlobalAlertCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    import json
     db_alert = GlobalAlert(
         user_id=current_user.id,
         created_by=f"{current_user.first_name} {current_user.last_name}",
@@ -653,11 +2600,38 @@ def create_global_alert(alert_data: GlobalAlertCreate, current_user: User = Depe
         expires_at=f"{alert_data.expires_in} hours" if alert_data.expires_in else None
     )
     
+    area_keys = alert_area_keys(alert_data.affected_areas, current_user.city)
+    if not area_keys:
+        raise HTTPException(status_code=400, detail="Affected barangays need a city: set yours or use brgy:<city>/<barangay>")
+    
     db.add(db_alert)
+    db.flush()
+    db.add_all(GlobalAlertArea(alert_id=db_alert.id, area=key) for key in area_keys)
+    bump_collection_versions(db, GLOBAL_ALERTS_COLLECTION)
     db.commit()
     db.refresh(db_alert)
     
-    return GlobalAlertResponse.from_orm(db_alert)
+    # Residents of the affected areas get a persistent notification; written in the background
+    alert_response = GlobalAlertResponse.from_orm(db_alert)
+    targets = select(User.id).where(User.is_active == True)
+    if ALL_AREAS not in area_keys:
+        targets = targets.where(or_(User.city_area_key.in_(area_keys), User.barangay_area_key.in_(area_keys)))
+    fanout_job_id = notification_fanout.submit(
+        targets,
+        {
+            "type": "global_alert",
+            "title": db_alert.title,
+            "message": db_alert.message,
+            "related_id": db_alert.id
+        },
+        # Area-scoped alerts reach connected residents along with their notification
+        push=None if ALL_AREAS in area_keys else ("alert", alert_response)
+    )
+    alert_response.fanout_job_id = fanout_job_id
+    if ALL_AREAS in area_keys:
+        push_hub.broadcast("alert", alert_response)
+    
+    return alert_response
 
 @app.patch("/api/global-alerts/{alert_id}/acknowledge")
 def acknowledge_alert(alert_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -665,7 +2639,14 @@ def acknowledge_alert(alert_id: int, current_user: User = Depends(get_current_us
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
     
-    alert.acknowledged_count += 1
+    # One row per (alert, user); repeat acknowledgements are no-ops
+    if insert_ignoring_conflicts(db, AlertAcknowledgement, {"alert_id": alert_id, "user_id": current_user.id}):
+        db.execute(
+            update(GlobalAlert)
+            .where(GlobalAlert.id == alert_id)
+            .values(acknowledged_count=GlobalAlert.acknowledged_count + 1)
+        )
+        bump_collection_versions(db, GLOBAL_ALERTS_COLLECTION)
     db.commit()
     db.refresh(alert)
     
@@ -678,6 +2659,7 @@ def toggle_alert_status(alert_id: int, current_user: User = Depends(get_current_
         raise HTTPException(status_code=404, detail="Alert not found")
     
     alert.is_active = not alert.is_active
+    bump_collection_versions(db, GLOBAL_ALERTS_COLLECTION)
     db.commit()
     db.refresh(alert)
     
@@ -685,9 +2667,17 @@ def toggle_alert_status(alert_id: int, current_user: User = Depends(get_current_
 
 # Community Tasks Endpoints
 @app.get("/api/community-tasks")
-def get_community_tasks(db: Session = Depends(get_db)):
-    tasks = db.query(CommunityTask).filter(CommunityTask.status == "open").order_by(CommunityTask.created_at.desc()).all()
-    return [CommunityTaskResponse.from_orm(task) for task in tasks]
+def get_community_tasks(request: Request, response: Response, db: Session = Depends(get_read_db)):
+    not_modified = conditional_response(db, COMMUNITY_TASKS_COLLECTION, request, response)
+    if not_modified:
+        return not_modified
+    rows = fetch_rows(
+        db,
+        select(*schema_columns(CommunityTaskResponse, CommunityTask))
+        .where(CommunityTask.status == "open")
+        .order_by(CommunityTask.created_at.desc())
+    )
+    return read_model_response(rows, response)
 
 @app.post("/api/community-tasks", response_model=CommunityTaskResponse)
 def create_community_task(task_data: CommunityTaskCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -701,6 +2691,7 @@ def create_community_task(task_data: CommunityTaskCreate, current_user: User = D
     )
     
     db.add(db_task)
+    bump_collection_versions(db, COMMUNITY_TASKS_COLLECTION)
     db.commit()
     db.refresh(db_task)
     
@@ -715,10 +2706,19 @@ def volunteer_for_task(task_id: int, current_user: User = Depends(get_current_us
     if community_task.status != "open":
         raise HTTPException(status_code=400, detail="Task is no longer available")
     
-    # Mark community task as assigned
-    community_task.status = "assigned"
-    community_task.volunteer_id = current_user.id
-    community_task.volunteer_name = f"{current_user.first_name} {current_user.last_name}"
+    # Compare-and-set claim: only one concurrent volunteer can move it out of "open"
+    claimed = db.execute(
+        update(CommunityTask)
+        .where(CommunityTask.id == task_id, CommunityTask.status == "open")
+        .values(
+            status="assigned",
+            volunteer_id=current_user.id,
+            volunteer_name=f"{current_user.first_name} {current_user.last_name}"
+        )
+    ).rowcount
+    if not claimed:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Task is no longer available")
     
     # Create a personal task for the user
     personal_task = Task(
@@ -734,6 +2734,13 @@ def volunteer_for_task(task_id: int, current_user: User = Depends(get_current_us
     )
     
     db.add(personal_task)
+    db.flush()
+    db.add(CommunityTaskVolunteer(
+        community_task_id=task_id,
+        user_id=current_user.id,
+        personal_task_id=personal_task.id
+    ))
+    bump_collection_versions(db, COMMUNITY_TASKS_COLLECTION)
     db.commit()
     db.refresh(community_task)
     db.refresh(personal_task)
@@ -751,9 +2758,9 @@ def read_root():
 @app.post("/api/seed-community-tasks")
 def seed_community_tasks(db: Session = Depends(get_db)):
     """Seed initial community tasks if none exist"""
-    existing_count = db.query(CommunityTask).count()
-    if existing_count > 0:
-        return {"message": f"Database already has {existing_count} community tasks"}
+    # One primary-key seek instead of counting the whole table
+    if db.scalar(select(CommunityTask.id).where(CommunityTask.id > 0).limit(1)) is not None:
+        return {"message": "Database already has community tasks"}
     
     initial_tasks = [
         CommunityTask(
@@ -785,6 +2792,7 @@ def seed_community_tasks(db: Session = Depends(get_db)):
     for task in initial_tasks:
         db.add(task)
     
+    bump_collection_versions(db, COMMUNITY_TASKS_COLLECTION)
     db.commit()
     return {"message": f"Successfully created {len(initial_tasks)} community tasks"}
 
@@ -794,6 +2802,13 @@ def seed_community_tasks(db: Session = Depends(get_db)):
 
 class BuddySession(Base):
     __tablename__ = "buddy_sessions"
+    __table_args__ = (
+        # Either side of a session looks it up by participant and status
+        Index("ix_buddy_sessions_user_id_status", "user_id", "status"),
+        Index("ix_buddy_sessions_buddy_id_status", "buddy_id", "status"),
+        # The missed check-in detector polls for active sessions falling due
+        Index("ix_buddy_sessions_status_next_check_in", "status", "next_check_in"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False)
@@ -801,6 +2816,7 @@ class BuddySession(Base):
     status = Column(String, default="active")  # active, completed, emergency
     check_in_interval = Column(Integer, default=30)  # minutes
     last_check_in = Column(DateTime, default=datetime.utcnow)
+    next_check_in = Column(DateTime, nullable=True)  # live missed check-in deadline
     location = Column(String, nullable=True)
     destination = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -808,6 +2824,11 @@ class BuddySession(Base):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Inbox (newest first) and unread filters/counts for one user
+        Index("ix_notifications_user_id_created_at", "user_id", "created_at"),
+        Index("ix_notifications_user_id_is_read_created_at", "user_id", "is_read", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, nullable=False)
@@ -818,9 +2839,117 @@ class Notification(Base):
     is_read = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-# Create the new tables
-BuddySession.__table__.create(bind=engine, checkfirst=True)
-Notification.__table__.create(bind=engine, checkfirst=True)
+@migration(1, "baseline schema")
+def create_baseline_schema(connection):
+    # Everything the app used to create at import: tables, the indexes
+    # create_all skips on existing tables, and the alert area backfill
+    Base.metadata.create_all(bind=connection)
+    create_indexes(connection, *Task.__table__.indexes, *Conversation.__table__.indexes, *Message.__table__.indexes)
+    create_indexes(connection, *named_indexes(PointsHistory, "ix_points_history_id", "ix_points_history_user_id_created_at"))
+    backfill_alert_areas(connection)
+
+def named_indexes(model, *names: str) -> list[Index]:
+    # Earlier migrations name their indexes: a model's full set includes ones
+    # on columns that later migrations add
+    return [index for index in model.__table__.indexes if index.name in names]
+
+@migration(2, "hot predicate indexes")
+def create_hot_predicate_indexes(connection):
+    create_indexes(
+        connection,
+        *HelpRequest.__table__.indexes,
+        *GlobalAlert.__table__.indexes,
+        *CommunityTask.__table__.indexes,
+        *named_indexes(BuddySession, "ix_buddy_sessions_user_id_status", "ix_buddy_sessions_buddy_id_status"),
+        *Notification.__table__.indexes
+    )
+
+def add_missing_columns(connection, *columns):
+    # create_all already built these on fresh databases
+    table = columns[0].table.name
+    existing = {column["name"] for column in inspect(connection).get_columns(table)}
+    for column in columns:
+        if column.name not in existing:
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column.name} {column_type}"))
+
+@migration(3, "user coordinates")
+def add_user_coordinates(connection):
+    add_missing_columns(connection, User.latitude, User.longitude, User.geohash, User.location_updated_at)
+    create_indexes(connection, *named_indexes(User, "ix_users_geohash"))
+
+@migration(4, "buddy match profile")
+def add_buddy_match_profile(connection):
+    add_missing_columns(connection, User.skills, User.availability, User.rating, User.review_count)
+
+@migration(5, "help request dispatch")
+def add_help_request_dispatch(connection):
+    add_missing_columns(connection, HelpRequest.latitude, HelpRequest.longitude)
+    HelpRequestDispatch.__table__.create(bind=connection, checkfirst=True)
+    create_indexes(connection, *HelpRequest.__table__.indexes)
+
+@migration(6, "namespaced area keys")
+def add_area_keys(connection):
+    add_missing_columns(connection, User.city_area_key, User.barangay_area_key)
+    # Replaced by the key columns: lower(trim()) neither collapsed inner
+    # whitespace nor folded non-ASCII letters the way normalize_area does
+    connection.execute(text("DROP INDEX IF EXISTS ix_users_barangay_key"))
+    connection.execute(text("DROP INDEX IF EXISTS ix_users_city_key"))
+    users = connection.execute(select(User.id, User.city, User.barangay)).all()
+    if users:
+        users_table = User.__table__
+        connection.execute(
+            update(users_table)
+            .where(users_table.c.id == bindparam("user_id"))
+            .values(city_area_key=bindparam("city_key"), barangay_area_key=bindparam("barangay_key")),
+            [
+                {"user_id": user_id, "city_key": city_key(city), "barangay_key": barangay_key(city, barangay)}
+                for user_id, city, barangay in users
+            ]
+        )
+    create_indexes(connection, *named_indexes(User, "ix_users_city_area_key", "ix_users_barangay_area_key"))
+    # Re-key every alert in the namespaced format
+    connection.execute(GlobalAlertArea.__table__.delete())
+    backfill_alert_areas(connection)
+
+@migration(7, "stored check-in deadlines")
+def add_check_in_deadlines(connection):
+    add_missing_columns(connection, BuddySession.next_check_in)
+    # Replaced by the (status, next_check_in) index the detector polls
+    connection.execute(text("DROP INDEX IF EXISTS ix_buddy_sessions_status"))
+    sessions = connection.execute(
+        select(BuddySession.id, BuddySession.last_check_in, BuddySession.created_at, BuddySession.check_in_interval)
+        .where(BuddySession.status == "active", BuddySession.next_check_in.is_(None))
+    ).all()
+    if sessions:
+        sessions_table = BuddySession.__table__
+        connection.execute(
+            update(sessions_table)
+            .where(sessions_table.c.id == bindparam("session_id"))
+            .values(next_check_in=bindparam("deadline")),
+            [
+                {"session_id": session_id, "deadline": (last_check_in or created_at) + timedelta(minutes=interval or 30)}
+                for session_id, last_check_in, created_at, interval in sessions
+            ]
+        )
+    create_indexes(connection, *named_indexes(BuddySession, "ix_buddy_sessions_status_next_check_in"))
+
+@migration(8, "points ledger outbox")
+def add_points_history_pending(connection):
+    add_missing_columns(connection, PointsHistory.pending)
+    # Every existing row was written together with its users.points increment
+    history = PointsHistory.__table__
+    connection.execute(update(history).where(history.c.pending.is_(None)).values(pending=False))
+    create_indexes(connection, *named_indexes(PointsHistory, "ix_points_history_pending"))
+
+@migration(9, "leaderboard change stamps")
+def add_leaderboard_versions(connection):
+    # Existing rows stay unstamped: every process warms its copy in full at startup
+    add_missing_columns(connection, User.leaderboard_version)
+    create_indexes(connection, *named_indexes(User, "ix_users_leaderboard_version"))
+
+# Every model is declared by now
+run_migrations(engine)
 
 # Pydantic models for buddy system
 class BuddySessionCreate(BaseModel):
@@ -835,6 +2964,542 @@ class NotificationCreate(BaseModel):
     message: str
     related_id: Optional[int] = None
 
+def add_notification(db: Session, notification: Notification):
+    db.add(notification)
+    bump_collection_versions(db, notifications_collection(notification.user_id))
+
+def build_missed_check_in_notification(missed_user: User, notify_user_id: int, session_id: int) -> Notification:
+    return Notification(
+        user_id=notify_user_id,
+        type="missed_check_in",
+        title="⚠️ Missed Check-In Alert",
+        message=f"{missed_user.first_name} {missed_user.last_name} missed their check-in! Please try to contact them.",
+        related_id=session_id
+    )
+
+def check_in_deadline(session: BuddySession) -> datetime:
+    return (session.last_check_in or session.created_at or datetime.utcnow()) + timedelta(minutes=session.check_in_interval)
+
+class CheckInScheduler:
+    """Server-side missed check-in detector driven by a min-heap of deadlines.
+
+    Every active session stores its live deadline in next_check_in, written
+    by whichever process starts the session or records the check-in. The
+    detector runs on one process and polls ix_buddy_sessions_status_next_check_in
+    every poll_seconds for deadlines due before the following poll, so
+    sessions from every worker are seen. Due deadlines wait in a heap;
+    rescheduling pushes a new entry and entries that no longer match the
+    session's deadline are skipped when they reach the top. A single daemon
+    thread sleeps until the earliest deadline or the next poll and emits the
+    missed_check_in notification itself. Once fired, the session is re-armed
+    one interval later so the buddy keeps getting reminded until someone
+    checks in or the session ends.
+
+    schedule() and cancel() only short-cut the poll for writes made on the
+    detector's own process; everywhere else they do nothing.
+    """
+
+    def __init__(self, poll_seconds: float):
+        self.poll_seconds = poll_seconds
+        self._heap: list[tuple[datetime, int]] = []
+        self._deadlines: dict[int, datetime] = {}
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._stopping = False
+        self._next_poll = 0.0
+
+    def schedule(self, session_id: int, deadline: datetime):
+        with self._condition:
+            if not self._running or self._deadlines.get(session_id) == deadline:
+                return
+            self._deadlines[session_id] = deadline
+            heapq.heappush(self._heap, (deadline, session_id))
+            if self._heap[0][1] == session_id:
+                self._condition.notify()
+
+    def cancel(self, session_id: int):
+        with self._condition:
+            if self._running:
+                self._deadlines.pop(session_id, None)
+
+    def pending_count(self) -> int:
+        with self._condition:
+            return len(self._deadlines)
+
+    def poll_due_sessions(self) -> int:
+        """Schedule every active session whose deadline falls before the next poll"""
+        horizon = datetime.utcnow() + timedelta(seconds=2 * self.poll_seconds)
+        db = SessionLocal()
+        try:
+            due = db.execute(
+                select(BuddySession.id, BuddySession.next_check_in)
+                .where(BuddySession.status == "active", BuddySession.next_check_in <= horizon)
+            ).all()
+        finally:
+            db.close()
+        for session_id, deadline in due:
+            self.schedule(session_id, deadline)
+        return len(due)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._condition:
+            self._running = True
+            self._stopping = False
+            self._next_poll = 0.0
+        self._thread = threading.Thread(target=self._run, name="check-in-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        with self._condition:
+            self._running = False
+            self._heap.clear()
+            self._deadlines.clear()
+
+    def _next_expired(self) -> Optional[int]:
+        """Block until a live deadline expires; None when a poll is due or the scheduler is stopping"""
+        with self._condition:
+            while not self._stopping:
+                until_poll = self._next_poll - time.monotonic()
+                if until_poll <= 0:
+                    return None
+                if not self._heap:
+                    self._condition.wait(timeout=until_poll)
+                    continue
+                deadline, session_id = self._heap[0]
+                if self._deadlines.get(session_id) != deadline:
+                    heapq.heappop(self._heap)
+                    continue
+                delay = (deadline - datetime.utcnow()).total_seconds()
+                if delay > 0:
+                    self._condition.wait(timeout=min(delay, until_poll))
+                    continue
+                heapq.heappop(self._heap)
+                del self._deadlines[session_id]
+                return session_id
+            return None
+
+    def _run(self):
+        while not self._stopping:
+            if time.monotonic() >= self._next_poll:
+                try:
+                    self.poll_due_sessions()
+                except Exception:
+                    logger.exception("Missed check-in detector poll failed")
+                self._next_poll = time.monotonic() + self.poll_seconds
+            session_id = self._next_expired()
+            if session_id is None:
+                continue
+            try:
+                self._fire(session_id)
+            except Exception:
+                logger.exception("Missed check-in detector error for session %s", session_id)
+
+    def _fire(self, session_id: int):
+        db = SessionLocal()
+        try:
+            session = db.get(BuddySession, session_id)
+            if not session or session.status != "active":
+                return
+            
+            deadline = session.next_check_in or check_in_deadline(session)
+            now = datetime.utcnow()
+            if deadline > now:
+                # A check-in landed after this deadline was armed
+                self.schedule(session_id, deadline)
+                return
+            
+            missed_user = db.get(User, session.user_id)
+            if missed_user is None:
+                return
+            notification = build_missed_check_in_notification(missed_user, session.buddy_id, session_id)
+            add_notification(db, notification)
+            session.next_check_in = now + timedelta(minutes=session.check_in_interval)
+            db.commit()
+            publish_notification(notification)
+            
+            self.schedule(session_id, session.next_check_in)
+        finally:
+            db.close()
+
+check_in_scheduler = CheckInScheduler(MISSED_CHECK_IN_POLL_SECONDS)
+
+class NotificationFanout:
+    """Bulk delivery of one notification template to a large set of users.
+
+    Jobs run on a single background thread, off the request path. Targets are
+    a SELECT of user ids that is walked in keyset chunks; each chunk is
+    written with one multi-row INSERT ... RETURNING and committed on its
+    own, so a 50,000-resident alert is ~50 short transactions rather than
+    50,000 ORM inserts, and every push carries the id of the row it
+    announces. Progress is kept per job for the status endpoint.
+    """
+
+    def __init__(self, chunk_size: int, max_tracked_jobs: int = 200):
+        self.chunk_size = max(1, chunk_size)
+        self.max_tracked_jobs = max_tracked_jobs
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notification-fanout")
+        self._jobs: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, target: Select, template: dict, push: Optional[tuple[str, Any]] = None) -> str:
+        """Queue delivery of template (type, title, message, related_id) to every user id selected by target.
+
+        push, an (event type, data) pair, is also published to every
+        connected target as its chunk commits.
+        """
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._jobs[job_id] = {
+                "id": job_id,
+                "status": "queued",
+                "total": None,
+                "delivered": 0,
+                "createdAt": datetime.utcnow().isoformat(),
+                "finishedAt": None,
+                "error": None
+            }
+            while len(self._jobs) > self.max_tracked_jobs:
+                self._jobs.popitem(last=False)
+        self._executor.submit(self._run, job_id, target, template, push)
+        return job_id
+
+    def status(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def _run(self, job_id: str, target: Select, template: dict, push: Optional[tuple[str, Any]]):
+        db = SessionLocal()
+        try:
+            total = db.scalar(select(func.count()).select_from(target.subquery()))
+            self._update(job_id, status="running", total=total)
+            
+            delivered = 0
+            last_user_id = 0
+            while True:
+                user_ids = db.scalars(
+                    target.where(User.id > last_user_id).order_by(User.id).limit(self.chunk_size)
+                ).all()
+                if not user_ids:
+                    break
+                
+                created_at = datetime.utcnow()
+                notification_ids = dict(db.execute(
+                    insert(Notification).returning(Notification.user_id, Notification.id), [
+                        {**template, "user_id": user_id, "is_read": False, "created_at": created_at}
+                        for user_id in user_ids
+                    ]
+                ).all())
+                bump_collection_versions(db, *(notifications_collection(user_id) for user_id in user_ids))
+                db.commit()
+                
+                online = push_hub.online_user_ids()
+                payload = {
+                    "type": template["type"],
+                    "title": template["title"],
+                    "message": template["message"],
+                    "relatedId": template.get("related_id"),
+                    "isRead": False,
+                    "createdAt": created_at.isoformat()
+                }
+                for user_id in online.intersection(user_ids):
+                    if push is not None:
+                        push_hub.publish(user_id, *push)
+                    push_hub.publish(user_id, "notification", {"id": notification_ids[user_id], **payload})
+                
+                delivered += len(user_ids)
+                last_user_id = user_ids[-1]
+                self._update(job_id, delivered=delivered)
+            
+            self._update(job_id, status="completed", finishedAt=datetime.utcnow().isoformat())
+        except Exception as e:
+            db.rollback()
+            self._update(job_id, status="failed", error=str(e), finishedAt=datetime.utcnow().isoformat())
+        finally:
+            db.close()
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+notification_fanout = NotificationFanout(NOTIFICATION_FANOUT_CHUNK_SIZE)
+
+URGENCY_RANKS = {"critical": 0, "high": 1, "normal": 2, "medium": 2, "low": 3}
+
+def dispatch_priority(urgency: str, created_at: datetime, request_id: int) -> tuple:
+    """Heap key: most urgent first, then oldest"""
+    return URGENCY_RANKS.get(urgency, URGENCY_RANKS["normal"]), created_at, request_id
+
+def record_dispatch_wave(db: Session, request_id: int, title: str, urgency: str, offers: list[tuple[float, int]], wave: int) -> list[Notification]:
+    """Write job: record the users a wave reached and notify each of them.
+
+    One lookup, one multi-row insert per table and one version bump for the
+    whole wave, not per user.
+    """
+    already_offered = set(db.scalars(
+        select(HelpRequestDispatch.user_id).where(
+            HelpRequestDispatch.request_id == request_id,
+            HelpRequestDispatch.user_id.in_([user_id for _, user_id in offers])
+        )
+    ))
+    offers = [(distance_km, user_id) for distance_km, user_id in offers if user_id not in already_offered]
+    if not offers:
+        return []
+    now = datetime.utcnow()
+    db.execute(insert(HelpRequestDispatch), [
+        {"request_id": request_id, "user_id": user_id, "distance_km": distance_km, "wave": wave, "created_at": now}
+        for distance_km, user_id in offers
+    ])
+    notifications = [
+        Notification(
+            user_id=user_id,
+            type="help_request",
+            title=f"🆘 {urgency.capitalize()} help request {distance_km:.1f} km away",
+            message=title,
+            related_id=request_id,
+            is_read=False,
+            created_at=now
+        )
+        for distance_km, user_id in offers
+    ]
+    db.add_all(notifications)
+    bump_collection_versions(db, *(notifications_collection(user_id) for _, user_id in offers))
+    db.flush()
+    return notifications
+
+class HelpRequestDispatcher:
+    """Pushes open help requests to the nearest available users, in waves.
+
+    Open requests wait in a priority heap keyed by urgency, then age, so a
+    critical request filed behind a backlog is dispatched next. A wave looks
+    up users around the request with the geohash index. It skips the
+    requester, users already offered the request, and users busy in an
+    active buddy session. It then notifies the nearest FANOUT per missing
+    responder. While the request is still short of responders_needed, it
+    comes back after wave_seconds with the next, wider radius. Once the
+    radii run out, the request stays open without further waves.
+
+    Waves that are not due yet sit in a second heap keyed by due time and
+    move over to the priority heap when they come due. A single daemon
+    thread does the dispatching. Requests are re-read before every wave, so
+    responses and resolutions need no cancellation.
+
+    The dispatcher runs on one process. Every poll_seconds it picks up open
+    requests filed on any process with a primary-key range scan past the
+    highest id it has seen. enqueue() only short-cuts that poll for requests
+    filed on the dispatching process; everywhere else it does nothing.
+    """
+
+    def __init__(self, radii_km: tuple, fanout: int, wave_seconds: float, poll_seconds: float):
+        self.radii_km = radii_km
+        self.fanout = max(1, fanout)
+        self.wave_seconds = wave_seconds
+        self.poll_seconds = poll_seconds
+        self._ready: list[tuple] = []
+        self._waiting: list[tuple] = []
+        self._enqueued_at: dict[int, float] = {}
+        # First waves already queued: ids up to _last_seen_id plus any newer ones filed here
+        self._last_seen_id = 0
+        self._seen: set[int] = set()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._stopping = False
+        self._next_poll = 0.0
+        self.waves_dispatched = 0
+        self.users_notified = 0
+        self.first_wave_latencies: deque = deque(maxlen=1000)
+
+    def enqueue(self, request_id: int, urgency: str, created_at: datetime, wave: int = 0, delay: float = 0):
+        with self._condition:
+            if not self._running:
+                return
+            if wave == 0:
+                if request_id <= self._last_seen_id or request_id in self._seen:
+                    return
+                self._seen.add(request_id)
+            entry = (*dispatch_priority(urgency, created_at, request_id), urgency, wave)
+            if delay > 0:
+                heapq.heappush(self._waiting, (time.monotonic() + delay, entry))
+            else:
+                if wave == 0:
+                    self._enqueued_at.setdefault(request_id, time.monotonic())
+                heapq.heappush(self._ready, entry)
+            self._condition.notify()
+
+    def pending_count(self) -> int:
+        with self._condition:
+            return len(self._ready) + len(self._waiting)
+
+    def stats(self) -> dict:
+        latencies = sorted(self.first_wave_latencies)
+        return {
+            "enabled": self._thread is not None,
+            "ready": len(self._ready),
+            "waiting": len(self._waiting),
+            "awaitingFirstWave": len(self._enqueued_at),
+            "wavesDispatched": self.waves_dispatched,
+            "usersNotified": self.users_notified,
+            "firstWaveP50Ms": round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+            "firstWaveP99Ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 1) if latencies else None
+        }
+
+    def poll_open_requests(self) -> int:
+        """Queue the first wave of every open request filed since the last poll.
+
+        The first poll after a start picks up the whole open backlog. Waves
+        restart at the smallest radius; users offered before a restart are
+        still skipped.
+        """
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(HelpRequest.id, HelpRequest.urgency, HelpRequest.created_at)
+                .where(HelpRequest.id > self._last_seen_id, HelpRequest.status == "open", HelpRequest.latitude.is_not(None))
+                .order_by(HelpRequest.id)
+            ).all()
+        finally:
+            db.close()
+        for row in rows:
+            self.enqueue(row.id, row.urgency, row.created_at)
+        if rows:
+            with self._condition:
+                self._last_seen_id = max(self._last_seen_id, rows[-1].id)
+                self._seen = {request_id for request_id in self._seen if request_id > self._last_seen_id}
+        return len(rows)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._condition:
+            self._running = True
+            self._stopping = False
+            self._next_poll = 0.0
+        self._thread = threading.Thread(target=self._run, name="help-request-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        with self._condition:
+            self._running = False
+            self._ready.clear()
+            self._waiting.clear()
+            self._enqueued_at.clear()
+            self._last_seen_id = 0
+            self._seen.clear()
+
+    def _next_ready(self) -> Optional[tuple]:
+        """Block until a wave is due; None when a poll is due or the dispatcher is stopping"""
+        with self._condition:
+            while not self._stopping:
+                now = time.monotonic()
+                if now >= self._next_poll:
+                    return None
+                while self._waiting and self._waiting[0][0] <= now:
+                    heapq.heappush(self._ready, heapq.heappop(self._waiting)[1])
+                if self._ready:
+                    return heapq.heappop(self._ready)
+                timeout = self._next_poll - now
+                if self._waiting:
+                    timeout = min(timeout, self._waiting[0][0] - now)
+                self._condition.wait(timeout=timeout)
+            return None
+
+    def _run(self):
+        while not self._stopping:
+            if time.monotonic() >= self._next_poll:
+                try:
+                    self.poll_open_requests()
+                except Exception:
+                    logger.exception("Help request dispatch poll failed")
+                self._next_poll = time.monotonic() + self.poll_seconds
+            entry = self._next_ready()
+            if entry is None:
+                continue
+            _, created_at, request_id, urgency, wave = entry
+            try:
+                if self.dispatch(request_id, wave) is not None and wave + 1 < len(self.radii_km):
+                    self.enqueue(request_id, urgency, created_at, wave + 1, delay=self.wave_seconds)
+            except Exception:
+                logger.exception("Help request dispatch error for request %s", request_id)
+            enqueued_at = self._enqueued_at.pop(request_id, None)
+            if enqueued_at is not None:
+                self.first_wave_latencies.append(time.monotonic() - enqueued_at)
+
+    def dispatch(self, request_id: int, wave: int) -> Optional[list[int]]:
+        """Run one wave; returns the users notified, or None once the request needs no more waves"""
+        # Notifications are published after the commit without reloading them
+        db = SessionLocal(expire_on_commit=False)
+        try:
+            help_request = db.get(HelpRequest, request_id)
+            if not help_request or help_request.status != "open" or help_request.latitude is None:
+                return None
+            missing = (help_request.responders_needed or 1) - (help_request.responders_count or 0)
+            if missing <= 0:
+                return None
+            
+            latitude, longitude = help_request.latitude, help_request.longitude
+            radius_km = self.radii_km[min(wave, len(self.radii_km) - 1)]
+            candidates = db.execute(
+                select(User.id, User.latitude, User.longitude)
+                .where(*nearby_conditions(latitude, longitude, radius_km, help_request.user_id))
+            ).all()
+            nearby = {
+                row.id: distance
+                for row in candidates
+                if (distance := haversine_km(latitude, longitude, row.latitude, row.longitude)) <= radius_km
+            }
+            if nearby:
+                unavailable = set(db.scalars(
+                    select(HelpRequestDispatch.user_id).where(HelpRequestDispatch.request_id == request_id)
+                ))
+                for user_id, buddy_id in db.execute(
+                    select(BuddySession.user_id, BuddySession.buddy_id).where(
+                        BuddySession.status == "active",
+                        or_(BuddySession.user_id.in_(nearby), BuddySession.buddy_id.in_(nearby))
+                    )
+                ):
+                    unavailable.update((user_id, buddy_id))
+                offers = heapq.nsmallest(
+                    missing * self.fanout,
+                    ((round(distance, 3), user_id) for user_id, distance in nearby.items() if user_id not in unavailable)
+                )
+            else:
+                offers = []
+            
+            notifications = group_commit_writer.run(
+                db, record_dispatch_wave, request_id, help_request.title, help_request.urgency, offers, wave
+            ) if offers else []
+            for notification in notifications:
+                publish_notification(notification)
+            self.waves_dispatched += 1
+            self.users_notified += len(notifications)
+            return [notification.user_id for notification in notifications]
+        finally:
+            db.close()
+
+help_request_dispatcher = HelpRequestDispatcher(
+    HELP_DISPATCH_RADII_KM, HELP_DISPATCH_FANOUT, HELP_DISPATCH_WAVE_SECONDS, HELP_DISPATCH_POLL_SECONDS
+)
+
 # Buddy Session Endpoints
 @app.post("/api/buddy/sessions")
 def create_buddy_session(
@@ -844,19 +3509,24 @@ def create_buddy_session(
 ):
     """Start a new buddy session"""
     # Check if buddy exists
-    buddy = db.query(User).filter(User.id == session_data.buddy_id).first()
+    buddy = db.get(User, session_data.buddy_id)
     if not buddy:
         raise HTTPException(status_code=404, detail="Buddy not found")
     
     # Create session
+    started_at = datetime.utcnow()
     new_session = BuddySession(
         user_id=current_user.id,
         buddy_id=session_data.buddy_id,
         check_in_interval=session_data.check_in_interval,
+        last_check_in=started_at,
+        next_check_in=started_at + timedelta(minutes=session_data.check_in_interval),
         location=session_data.location,
-        destination=session_data.destination
+        destination=session_data.destination,
+        created_at=started_at
     )
     db.add(new_session)
+    db.flush()
     
     # Notify buddy
     notification = Notification(
@@ -866,10 +3536,12 @@ def create_buddy_session(
         message=f"{current_user.first_name} {current_user.last_name} has started a buddy session with you.",
         related_id=new_session.id
     )
-    db.add(notification)
+    add_notification(db, notification)
     
     db.commit()
     db.refresh(new_session)
+    check_in_scheduler.schedule(new_session.id, new_session.next_check_in)
+    publish_notification(notification)
     
     return {
         "id": new_session.id,
@@ -885,23 +3557,22 @@ def create_buddy_session(
 
 @app.get("/api/buddy/sessions")
 def get_buddy_sessions(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_reader),
+    db: Session = Depends(get_read_db)
 ):
     """Get all buddy sessions for current user"""
     sessions = db.query(BuddySession).filter(
         (BuddySession.user_id == current_user.id) | (BuddySession.buddy_id == current_user.id)
     ).order_by(BuddySession.created_at.desc()).all()
     
+    # Resolve every other participant in one query
+    other_ids = [s.buddy_id if s.user_id == current_user.id else s.user_id for s in sessions]
+    users = get_users_by_ids(db, other_ids)
+    
     result = []
-    for s in sessions:
-        # Get buddy info
-        if s.user_id == current_user.id:
-            other_user = db.query(User).filter(User.id == s.buddy_id).first()
-            role = "initiator"
-        else:
-            other_user = db.query(User).filter(User.id == s.user_id).first()
-            role = "buddy"
+    for s, other_id in zip(sessions, other_ids):
+        other_user = users.get(other_id)
+        role = "initiator" if s.user_id == current_user.id else "buddy"
         
         result.append({
             "id": s.id,
@@ -919,25 +3590,25 @@ def get_buddy_sessions(
     return result
 
 @app.get("/api/buddy/sessions/active")
-def get_active_buddy_session(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_active_buddy_session(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get currently active buddy session"""
-    session = db.query(BuddySession).filter(
+    session = await db.scalar(select(BuddySession).where(
         ((BuddySession.user_id == current_user.id) | (BuddySession.buddy_id == current_user.id)),
         BuddySession.status == "active"
-    ).first()
+    ).limit(1))
     
     if not session:
         return None
     
     # Get buddy info
     if session.user_id == current_user.id:
-        buddy = db.query(User).filter(User.id == session.buddy_id).first()
+        buddy = await db.get(User, session.buddy_id)
         role = "initiator"
     else:
-        buddy = db.query(User).filter(User.id == session.user_id).first()
+        buddy = await db.get(User, session.user_id)
         role = "buddy"
     
     return {
@@ -953,50 +3624,52 @@ def get_active_buddy_session(
         "createdAt": session.created_at.isoformat() if session.created_at else None
     }
 
-@app.post("/api/buddy/sessions/{session_id}/check-in")
-def buddy_check_in(
-    session_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Perform a check-in for a buddy session"""
-    session = db.query(BuddySession).filter(BuddySession.id == session_id).first()
+def record_check_in(db: Session, session_id: int, user_id: int, first_name: str):
+    """Write job: stamp the check-in, notify the buddy and award the check-in"""
+    session = db.get(BuddySession, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    if session.user_id != current_user.id and session.buddy_id != current_user.id:
+    if session.user_id != user_id and session.buddy_id != user_id:
         raise HTTPException(status_code=403, detail="Not authorized for this session")
     
     if session.status != "active":
         raise HTTPException(status_code=400, detail="Session is not active")
     
-    # Update last check-in time
+    # Update last check-in time and push the missed check-in deadline out
     session.last_check_in = datetime.utcnow()
+    session.next_check_in = check_in_deadline(session)
     
     # Get buddy to notify
-    buddy_id = session.buddy_id if session.user_id == current_user.id else session.user_id
+    buddy_id = session.buddy_id if session.user_id == user_id else session.user_id
     
     # Notify buddy of check-in
     notification = Notification(
         user_id=buddy_id,
         type="check_in_success",
         title="Buddy Checked In",
-        message=f"{current_user.first_name} has checked in safely.",
+        message=f"{first_name} has checked in safely.",
         related_id=session_id
     )
-    db.add(notification)
+    add_notification(db, notification)
     
     # Award points for regular check-ins
-    current_user.points += 5
-    points_entry = PointsHistory(
-        user_id=current_user.id,
-        type="buddy_check_in",
-        description="Regular buddy check-in",
-        points=5
+    points_ledger.award(db, user_id, 5, "buddy_check_in", "Regular buddy check-in")
+    return session, notification
+
+@app.post("/api/buddy/sessions/{session_id}/check-in")
+async def buddy_check_in(
+    session_id: int,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Perform a check-in for a buddy session"""
+    session, notification = await group_commit_writer.run_async(
+        db, record_check_in, session_id, current_user.id, current_user.first_name
     )
-    db.add(points_entry)
-    
-    db.commit()
+    points_ledger.notify()
+    check_in_scheduler.schedule(session.id, session.next_check_in)
+    publish_notification(notification)
     
     return {
         "message": "Check-in successful",
@@ -1004,63 +3677,68 @@ def buddy_check_in(
         "pointsEarned": 5
     }
 
-@app.post("/api/buddy/sessions/{session_id}/missed")
-def missed_check_in(
-    session_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Report a missed check-in (triggers notifications)"""
-    session = db.query(BuddySession).filter(BuddySession.id == session_id).first()
+def record_missed_check_in(db: Session, session_id: int, user_id: int) -> Notification:
+    """Write job: raise an urgent missed check-in notification for the buddy"""
+    session = db.get(BuddySession, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
     # Determine who missed and who to notify
-    if session.user_id == current_user.id:
-        missed_user = current_user
+    missed_user = db.get(User, session.user_id)
+    if session.user_id == user_id:
         buddy_id = session.buddy_id
     else:
-        missed_user = db.query(User).filter(User.id == session.user_id).first()
-        buddy_id = session.buddy_id if session.buddy_id != current_user.id else session.user_id
-    
-    # Create urgent notification for buddy
-    notification = Notification(
-        user_id=buddy_id,
-        type="missed_check_in",
-        title="⚠️ Missed Check-In Alert",
-        message=f"{missed_user.first_name} {missed_user.last_name} missed their check-in! Please try to contact them.",
-        related_id=session_id
-    )
-    db.add(notification)
-    db.commit()
+        buddy_id = session.buddy_id if session.buddy_id != user_id else session.user_id
     
-    return {"message": "Missed check-in reported", "notificationSent": True}
+    notification = build_missed_check_in_notification(missed_user, buddy_id, session_id)
+    add_notification(db, notification)
+    return notification
 
-@app.post("/api/buddy/sessions/{session_id}/emergency")
-def buddy_emergency(
+@app.post("/api/buddy/sessions/{session_id}/missed")
+async def missed_check_in(
     session_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Trigger emergency for a buddy session"""
-    session = db.query(BuddySession).filter(BuddySession.id == session_id).first()
+    """Report a missed check-in (triggers notifications)"""
+    notification = await group_commit_writer.run_async(db, record_missed_check_in, session_id, current_user.id)
+    publish_notification(notification)
+    
+    return {"message": "Missed check-in reported", "notificationSent": True}
+
+def record_emergency(db: Session, session_id: int, user_id: int, user_name: str) -> Notification:
+    """Write job: flag the session as an emergency and alert the buddy"""
+    session = db.get(BuddySession, session_id)
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
     session.status = "emergency"
     
     # Notify buddy
-    buddy_id = session.buddy_id if session.user_id == current_user.id else session.user_id
+    buddy_id = session.buddy_id if session.user_id == user_id else session.user_id
     
     notification = Notification(
         user_id=buddy_id,
         type="emergency",
         title="🚨 EMERGENCY ALERT",
-        message=f"{current_user.first_name} {current_user.last_name} triggered an emergency! Last known location: {session.location or 'Unknown'}",
+        message=f"{user_name} triggered an emergency! Last known location: {session.location or 'Unknown'}",
         related_id=session_id
     )
-    db.add(notification)
-    db.commit()
+    add_notification(db, notification)
+    return notification
+
+@app.post("/api/buddy/sessions/{session_id}/emergency")
+async def buddy_emergency(
+    session_id: int,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Trigger emergency for a buddy session"""
+    notification = await group_commit_writer.run_async(
+        db, record_emergency, session_id, current_user.id, f"{current_user.first_name} {current_user.last_name}"
+    )
+    check_in_scheduler.cancel(session_id)
+    publish_notification(notification)
     
     return {"message": "Emergency triggered", "sessionStatus": "emergency"}
 
@@ -1091,60 +3769,60 @@ def end_buddy_session(
         message=f"{current_user.first_name} has ended the buddy session safely.",
         related_id=session_id
     )
-    db.add(notification)
+    add_notification(db, notification)
     
     # Award completion points
-    current_user.points += 25
-    points_entry = PointsHistory(
-        user_id=current_user.id,
-        type="buddy_session_completed",
-        description="Completed buddy session",
-        points=25
-    )
-    db.add(points_entry)
-    
+    points_ledger.award(db, current_user.id, 25, "buddy_session_completed", "Completed buddy session")
     db.commit()
+    points_ledger.notify()
+    check_in_scheduler.cancel(session_id)
+    publish_notification(notification)
     
     return {"message": "Session ended successfully", "pointsEarned": 25}
 
 # Notification Endpoints
 @app.get("/api/notifications")
-def get_notifications(
+async def get_notifications(
+    request: Request,
+    response: Response,
     unread_only: bool = False,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all notifications for current user"""
-    query = db.query(Notification).filter(Notification.user_id == current_user.id)
+    not_modified = await db.run_sync(conditional_response, notifications_collection(current_user.id), request, response)
+    if not_modified:
+        return not_modified
+    query = select(Notification).where(Notification.user_id == current_user.id)
     
     if unread_only:
-        query = query.filter(Notification.is_read == False)
+        query = query.where(Notification.is_read == False)
     
-    notifications = query.order_by(Notification.created_at.desc()).limit(50).all()
+    notifications = await db.scalars(query.order_by(Notification.created_at.desc()).limit(50))
     
-    return [
-        {
-            "id": n.id,
-            "type": n.type,
-            "title": n.title,
-            "message": n.message,
-            "relatedId": n.related_id,
-            "isRead": n.is_read,
-            "createdAt": n.created_at.isoformat() if n.created_at else None
-        }
-        for n in notifications
-    ]
+    return [serialize_notification(n) for n in notifications]
+
+@app.get("/api/notifications/fanout/{job_id}")
+def get_notification_fanout_status(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Progress of a bulk notification delivery"""
+    job = notification_fanout.status(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Fan-out job not found")
+    return job
 
 @app.get("/api/notifications/unread-count")
-def get_unread_count(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_unread_count(
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get count of unread notifications"""
-    count = db.query(Notification).filter(
+    count = await db.scalar(select(func.count(Notification.id)).where(
         Notification.user_id == current_user.id,
         Notification.is_read == False
-    ).count()
+    ))
     
     return {"unreadCount": count}
 
@@ -1164,6 +3842,7 @@ def mark_notification_read(
         raise HTTPException(status_code=404, detail="Notification not found")
     
     notification.is_read = True
+    bump_collection_versions(db, notifications_collection(current_user.id))
     db.commit()
     
     return {"message": "Notification marked as read"}
@@ -1179,6 +3858,7 @@ def mark_all_notifications_read(
         Notification.is_read == False
     ).update({"is_read": True})
     
+    bump_collection_versions(db, notifications_collection(current_user.id))
     db.commit()
     
     return {"message": "All notifications marked as read"}
@@ -1197,9 +3877,10 @@ def create_notification(
         message=notification_data.message,
         related_id=notification_data.related_id
     )
-    db.add(notification)
+    add_notification(db, notification)
     db.commit()
     db.refresh(notification)
+    publish_notification(notification)
     
     return {
         "id": notification.id,
@@ -1213,57 +3894,87 @@ def create_notification(
 
 @app.get("/api/conversations", response_model=list[ConversationResponse])
 def get_conversations(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    current_user: User = Depends(get_current_reader),
+    db: Session = Depends(get_read_db)
 ):
-    """Get all conversations for the current user"""
-    # Find all conversations where user is participant
-    conversations_data = []
-    
-    # Get conversations where user is user1
-    convs1 = db.query(Conversation).filter(Conversation.user1_id == current_user.id).all()
-    # Get conversations where user is user2
-    convs2 = db.query(Conversation).filter(Conversation.user2_id == current_user.id).all()
-    
-    all_convs = convs1 + convs2
+    """Get the current user's conversations, most recent first.
+
+    Keyset-paginated on (last_message_at, id); a page with a successor
+    carries X-Next-Cursor.
+    """
+    # Participant, unread count and ordering are resolved in a single query
+    participant_id = case(
+        (Conversation.user1_id == current_user.id, Conversation.user2_id),
+        else_=Conversation.user1_id
+    )
+    unread = db.query(
+        Message.conversation_id.label("conversation_id"),
+        func.count(Message.id).label("unread_count")
+    ).filter(
+        Message.receiver_id == current_user.id,
+        Message.read == False
+    ).group_by(Message.conversation_id).subquery()
     
-    for conv in all_convs:
-        # Determine the other participant
-        participant_id = conv.user2_id if conv.user1_id == current_user.id else conv.user1_id
-        participant = db.query(User).filter(User.id == participant_id).first()
-        
-        if not participant:
-            continue
-        
-        # Count unread messages
-        unread_count = db.query(Message).filter(
-            Message.conversation_id == conv.id,
-            Message.receiver_id == current_user.id,
-            Message.read == False
-        ).count()
-        
-        conversations_data.append({
-            "id": conv.id,
-            "participant_id": participant.id,
-            "participant_name": f"{participant.first_name} {participant.last_name}",
-            "participant_email": participant.email,
-            "last_message": conv.last_message,
-            "last_message_at": conv.last_message_at,
-            "unread_count": unread_count
-        })
+    query = db.query(
+        Conversation.id,
+        User.id.label("participant_id"),
+        User.first_name,
+        User.last_name,
+        User.email,
+        Conversation.last_message,
+        Conversation.last_message_at,
+        func.coalesce(unread.c.unread_count, 0).label("unread_count")
+    ).join(
+        User, User.id == participant_id
+    ).outerjoin(
+        unread, unread.c.conversation_id == Conversation.id
+    ).filter(
+        or_(Conversation.user1_id == current_user.id, Conversation.user2_id == current_user.id)
+    )
+    if cursor is not None:
+        last_message_at, last_id = decode_cursor(cursor, "created_at")
+        query = query.filter(or_(
+            Conversation.last_message_at < last_message_at,
+            and_(Conversation.last_message_at == last_message_at, Conversation.id < last_id)
+        ))
     
-    # Sort by last message time
-    conversations_data.sort(key=lambda x: x["last_message_at"], reverse=True)
+    rows = query.order_by(Conversation.last_message_at.desc(), Conversation.id.desc()).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].last_message_at, rows[-1].id)
     
-    return conversations_data
+    return [
+        {
+            "id": row.id,
+            "participant_id": row.participant_id,
+            "participant_name": f"{row.first_name} {row.last_name}",
+            "participant_email": row.email,
+            "last_message": row.last_message,
+            "last_message_at": row.last_message_at,
+            "unread_count": row.unread_count
+        }
+        for row in rows
+    ]
 
 @app.get("/api/conversations/{user_id}/messages", response_model=list[MessageResponse])
 def get_conversation_messages(
     user_id: int,
+    after_id: Optional[int] = None,
+    since: Optional[datetime] = None,
+    before_id: Optional[int] = None,
+    limit: Optional[int] = Query(None, ge=1, le=200),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all messages in a conversation with a specific user"""
+    """Get messages in a conversation with a specific user.
+
+    after_id/since return only newer messages for incremental refreshes;
+    before_id (with limit) pages backwards through history. Without any of
+    them the whole conversation is returned, oldest first.
+    """
     # Find or create conversation
     conversation = db.query(Conversation).filter(
         ((Conversation.user1_id == current_user.id) & (Conversation.user2_id == user_id)) |
@@ -1282,10 +3993,24 @@ def get_conversation_messages(
         db.refresh(conversation)
         return []
     
-    # Get all messages in this conversation
-    messages = db.query(Message).filter(
-        Message.conversation_id == conversation.id
-    ).order_by(Message.created_at).all()
+    query = db.query(Message).filter(Message.conversation_id == conversation.id)
+    
+    if before_id is not None or (limit is not None and after_id is None and since is None):
+        # Scrolling back: newest page below the cursor, returned oldest first
+        if before_id is not None:
+            query = query.filter(Message.id < before_id)
+        messages = query.order_by(Message.id.desc()).limit(limit or 50).all()
+        messages.reverse()
+    else:
+        if after_id is not None:
+            query = query.filter(Message.id > after_id).order_by(Message.id)
+        elif since is not None:
+            query = query.filter(Message.created_at > since).order_by(Message.created_at, Message.id)
+        else:
+            query = query.order_by(Message.created_at)
+        if limit is not None:
+            query = query.limit(limit)
+        messages = query.all()
     
     # Mark messages as read
     db.query(Message).filter(
@@ -1305,7 +4030,7 @@ def send_message(
 ):
     """Send a message to another user"""
     # Verify receiver exists
-    receiver = db.query(User).filter(User.id == message_data.receiver_id).first()
+    receiver = db.get(User, message_data.receiver_id)
     if not receiver:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1354,27 +4079,309 @@ def send_message(
         message=f"{current_user.first_name} {current_user.last_name} sent you a message",
         related_id=str(conversation.id)
     )
-    db.add(notification)
+    add_notification(db, notification)
     db.commit()
     
-    return message
+    message_response = MessageResponse.from_orm(message)
+    push_hub.publish(message.receiver_id, "message", message_response)
+    push_hub.publish(message.sender_id, "message", message_response)
+    publish_notification(notification)
+    
+    return message_response
 
 @app.get("/api/users/buddies")
 def get_buddies(
+    response: Response,
+    current_user: User = Depends(get_current_reader),
+    db: Session = Depends(get_read_db)
+):
+    """Get all users (potential buddies) for messaging"""
+    rows = fetch_rows(
+        db,
+        select(
+            User.id,
+            (User.first_name + " " + User.last_name).label("name"),
+            User.email,
+            User.location,
+            User.points,
+            User.rank
+        ).where(User.id != current_user.id)
+    )
+    return read_model_response(rows, response)
+
+@app.put("/api/users/me/location")
+def update_my_location(
+    location: LocationUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all users (potential buddies) for messaging"""
-    users = db.query(User).filter(User.id != current_user.id).all()
-    
-    return [{
-        "id": user.id,
-        "name": f"{user.first_name} {user.last_name}",
-        "email": user.email,
-        "location": user.location,
-        "points": user.points,
-        "rank": user.rank
-    } for user in users]
+    """Store the caller's coordinates for nearby search"""
+    db.execute(
+        update(User)
+        .where(User.id == current_user.id)
+        .values(
+            latitude=location.latitude,
+            longitude=location.longitude,
+            geohash=geohash_encode(location.latitude, location.longitude),
+            location_updated_at=datetime.utcnow()
+        )
+    )
+    db.commit()
+    principal_cache.invalidate_user(current_user.id)
+    return {"latitude": location.latitude, "longitude": location.longitude}
+
+@app.get("/api/users/nearby")
+def get_nearby_buddies(
+    response: Response,
+    radius_km: float = Query(10, gt=0, le=100),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    current_user: User = Depends(get_current_reader),
+    db: Session = Depends(get_read_db)
+):
+    """The nearest users within radius_km, closest first.
+
+    Searches around lat/lng when given, otherwise around the caller's stored
+    location. Pages continue from X-Next-Cursor, which encodes the last
+    (distance, id) returned.
+    """
+    latitude, longitude = search_origin(current_user, lat, lng)
+    after = decode_cursor(cursor, "distance") if cursor else None
+    
+    candidates = db.execute(
+        select(
+            User.id,
+            (User.first_name + " " + User.last_name).label("name"),
+            User.location,
+            User.barangay,
+            User.city,
+            User.latitude,
+            User.longitude,
+            User.points,
+            User.rank,
+            User.is_verified
+        ).where(*nearby_conditions(latitude, longitude, radius_km, current_user.id))
+    ).all()
+    
+    ranked = []
+    for row in candidates:
+        distance = haversine_km(latitude, longitude, row.latitude, row.longitude)
+        if distance > radius_km:
+            continue
+        key = (round(distance, 3), row.id)
+        if after is not None and key <= after:
+            continue
+        ranked.append((key, row))
+    page = heapq.nsmallest(limit + 1, ranked, key=lambda item: item[0])
+    
+    if len(page) > limit:
+        page = page[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(*page[-1][0])
+    return read_model_response([
+        {
+            "id": row.id,
+            "name": row.name,
+            "location": row.location,
+            "barangay": row.barangay,
+            "city": row.city,
+            "distance": distance,
+            "points": row.points,
+            "rank": row.rank,
+            "isVerified": bool(row.is_verified),
+            "isOnline": push_hub.is_online(row.id)
+        }
+        for (distance, _), row in page
+    ], response)
+
+@app.put("/api/users/me/buddy-profile")
+def update_my_buddy_profile(
+    profile: BuddyProfileUpdate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Set the skills and availability windows used for buddy matching"""
+    skills = encode_flags(profile.skills, BUDDY_SKILLS, "skill")
+    availability = encode_flags(profile.availability, AVAILABILITY_WINDOWS, "availability window")
+    db.execute(update(User).where(User.id == current_user.id).values(skills=skills, availability=availability))
+    db.commit()
+    principal_cache.invalidate_user(current_user.id)
+    return {"skills": decode_flags(skills, BUDDY_SKILLS), "availability": decode_flags(availability, AVAILABILITY_WINDOWS)}
+
+@app.get("/api/users/matches")
+def get_buddy_matches(
+    response: Response,
+    radius_km: float = Query(25, gt=0, le=100),
+    limit: int = Query(20, ge=1, le=100),
+    skills: Optional[str] = Query(None, description="Comma-separated skills wanted"),
+    lat: Optional[float] = Query(None, ge=-90, le=90),
+    lng: Optional[float] = Query(None, ge=-180, le=180),
+    current_user: User = Depends(get_current_reader),
+    db: Session = Depends(get_read_db)
+):
+    """Best buddy matches within radius_km, highest matchScore (0-100) first.
+
+    Candidates come from the geohash index, are scored together by
+    buddy_matcher against the wanted skills and the caller's availability,
+    and only the top `limit` are loaded in full.
+    """
+    latitude, longitude = search_origin(current_user, lat, lng)
+    wanted_skills = encode_flags(split_filter(skills), BUDDY_SKILLS, "skill") if skills else 0
+    
+    candidates = np.array(
+        db.execute(select(*MATCH_CANDIDATE_COLUMNS).where(*nearby_conditions(latitude, longitude, radius_km, current_user.id))).all(),
+        dtype=np.float64
+    ).reshape(-1, len(MATCH_CANDIDATE_COLUMNS))
+    distances = buddy_matcher.distances_km(candidates, latitude, longitude)
+    within = distances <= radius_km
+    candidates, distances = candidates[within], distances[within]
+    ids = candidates[:, 0].astype(np.int64)
+    online = np.isin(ids, np.fromiter(push_hub.online_user_ids(), dtype=np.int64))
+    scores = buddy_matcher.score(candidates, distances, wanted_skills, current_user.availability or 0, online)
+    best = buddy_matcher.top_k(scores, limit)
+    
+    profiles = {
+        row.id: row
+        for row in db.execute(
+            select(
+                User.id,
+                (User.first_name + " " + User.last_name).label("name"),
+                User.location,
+                User.barangay,
+                User.city,
+                User.skills,
+                User.availability,
+                User.rating,
+                User.review_count,
+                User.is_verified
+            ).where(User.id.in_(ids[best].tolist()))
+        )
+    }
+    matches = []
+    for index in best:
+        profile = profiles[int(ids[index])]
+        matches.append({
+            "id": profile.id,
+            "name": profile.name,
+            "location": profile.location,
+            "barangay": profile.barangay,
+            "city": profile.city,
+            "distance": round(float(distances[index]), 3),
+            "rating": profile.rating or 0.0,
+            "reviewCount": profile.review_count or 0,
+            "isVerified": bool(profile.is_verified),
+            "isOnline": bool(online[index]),
+            "skills": decode_flags(profile.skills, BUDDY_SKILLS),
+            "availability": decode_flags(profile.availability, AVAILABILITY_WINDOWS),
+            "matchScore": round(float(scores[index]) * 100, 1)
+        })
+    return read_model_response(matches, response)
+
+# ===== REALTIME ENDPOINTS =====
+
+@app.on_event("startup")
+async def bind_push_hub():
+    push_hub.bind_loop(asyncio.get_running_loop())
+
+@app.on_event("startup")
+async def fit_password_hash_queue():
+    # Sync endpoints run on this loop's default threadpool
+    password_hasher.fit_to_threadpool(to_thread.current_default_thread_limiter().total_tokens)
+
+@app.on_event("startup")
+def start_background_workers():
+    leaderboard.warm()
+    group_commit_writer.start()
+    points_ledger.start()
+    if POINTS_ROLLUP_ENABLED:
+        points_rollup_worker.start()
+    if MISSED_CHECK_IN_DETECTOR_ENABLED:
+        check_in_scheduler.start()
+    if HELP_DISPATCH_ENABLED:
+        help_request_dispatcher.start()
+
+@app.on_event("shutdown")
+async def dispose_async_engine():
+    await async_engine.dispose()
+
+@app.on_event("shutdown")
+def stop_background_workers():
+    check_in_scheduler.stop()
+    help_request_dispatcher.stop()
+    notification_fanout.shutdown()
+    points_ledger.stop()
+    points_rollup_worker.stop()
+    group_commit_writer.stop()
+    password_hasher.shutdown()
+
+@app.get("/api/metrics/help-dispatch")
+def get_help_dispatch_metrics():
+    """Queue depth and first-wave latency of the help request dispatcher"""
+    return help_request_dispatcher.stats()
+
+@app.get("/api/metrics/sqlite-writer")
+def get_sqlite_writer_metrics():
+    """Queue depth and group sizes of the SQLite group-commit writer"""
+    return group_commit_writer.stats()
+
+@app.get("/api/metrics/password-hashing")
+def get_password_hashing_metrics():
+    """Queue depth and throughput of the password hashing pool"""
+    return password_hasher.stats()
+
+@app.websocket("/api/ws")
+async def realtime_websocket(websocket: WebSocket, token: str):
+    """Push channel for messages, notifications and alerts"""
+    try:
+        user_id = await run_in_threadpool(resolve_push_user_id, token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    
+    await websocket.accept()
+    queue = push_hub.subscribe(user_id)
+    
+    async def forward_events():
+        while True:
+            event = await queue.get()
+            await websocket.send_json(event)
+    
+    sender = asyncio.create_task(forward_events())
+    try:
+        # Clients may send pings; anything received just keeps the socket alive
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        push_hub.unsubscribe(user_id, queue)
+
+@app.get("/api/events")
+async def realtime_event_stream(request: Request, token: str):
+    """Server-Sent Events fallback for clients that cannot open a WebSocket"""
+    user_id = await run_in_threadpool(resolve_push_user_id, token)
+    queue = push_hub.subscribe(user_id)
+    
+    async def event_source():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+        finally:
+            push_hub.unsubscribe(user_id, queue)
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 if __name__ == "__main__":
     uvicorn.run(
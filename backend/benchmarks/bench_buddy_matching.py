@@ -0,0 +1,104 @@
+"""Buddy match scoring: a per-candidate Python loop versus BuddyMatchEngine.
+
+Both paths score the same synthetic candidates around Metro Manila with
+the same formula and keep the best k. The loop is what a straightforward
+handler would do: haversine, popcounts and a heap over one row at a time.
+The engine computes every factor over the whole candidate matrix and picks
+the winners with argpartition. The top-k ids must agree.
+
+Run from the repository root:
+
+    python backend/benchmarks/bench_buddy_matching.py [candidates] [k]
+"""
+import heapq
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Import the app against a throwaway database
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import numpy as np  # noqa: E402
+import main  # noqa: E402
+
+CANDIDATES = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+K = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+ROUNDS = 5
+ORIGIN = (14.5995, 120.9842)
+WANTED_SKILLS = 0b0100101
+AVAILABILITY = 0x0F0F0F0
+
+
+def synthetic_candidates(count: int) -> np.ndarray:
+    rng = random.Random(7)
+    rows = []
+    for user_id in range(1, count + 1):
+        reviews = rng.randint(0, 60)
+        rows.append((
+            user_id,
+            ORIGIN[0] + rng.uniform(-0.25, 0.25),
+            ORIGIN[1] + rng.uniform(-0.25, 0.25),
+            rng.getrandbits(len(main.BUDDY_SKILLS)),
+            rng.getrandbits(len(main.AVAILABILITY_WINDOWS)),
+            rng.uniform(3.0, 5.0) if reviews else 0.0,
+            reviews,
+            rng.random() < 0.3,
+        ))
+    return np.array(rows, dtype=np.float64)
+
+
+def python_loop(rows: list, online: set) -> list:
+    engine = main.buddy_matcher
+    weights = engine.weights
+    wanted_bits = bin(WANTED_SKILLS).count("1")
+    available_bits = bin(AVAILABILITY).count("1")
+    scored = []
+    for user_id, latitude, longitude, skills, availability, rating, reviews, verified in rows:
+        distance = main.haversine_km(ORIGIN[0], ORIGIN[1], latitude, longitude)
+        smoothed = (rating * reviews + engine.rating_prior * engine.rating_prior_weight) / (reviews + engine.rating_prior_weight)
+        score = (
+            weights["distance"] * 2 ** (-distance / engine.half_life_km)
+            + weights["skills"] * bin(int(skills) & WANTED_SKILLS).count("1") / wanted_bits
+            + weights["availability"] * bin(int(availability) & AVAILABILITY).count("1") / available_bits
+            + weights["rating"] * smoothed / 5.0
+            + weights["verified"] * verified
+            + weights["online"] * (user_id in online)
+        )
+        scored.append((score, int(user_id)))
+    return [user_id for _, user_id in heapq.nlargest(K, scored)]
+
+
+def vectorized(candidates: np.ndarray, online_ids: np.ndarray) -> list:
+    engine = main.buddy_matcher
+    distances = engine.distances_km(candidates, *ORIGIN)
+    online = np.isin(candidates[:, 0].astype(np.int64), online_ids)
+    scores = engine.score(candidates, distances, WANTED_SKILLS, AVAILABILITY, online)
+    return candidates[engine.top_k(scores, K), 0].astype(int).tolist()
+
+
+def best_of(call) -> tuple:
+    timings = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        result = call()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+if __name__ == "__main__":
+    candidates = synthetic_candidates(CANDIDATES)
+    rows = candidates.tolist()
+    online = set(range(1, CANDIDATES + 1, 10))
+    online_ids = np.fromiter(online, dtype=np.int64)
+
+    print(f"{CANDIDATES} candidates, top {K}, best of {ROUNDS}")
+    loop_seconds, loop_top = best_of(lambda: python_loop(rows, online))
+    print(f"  {'python loop':<12}{loop_seconds * 1000:>9.1f} ms")
+    numpy_seconds, numpy_top = best_of(lambda: vectorized(candidates, online_ids))
+    print(f"  {'vectorized':<12}{numpy_seconds * 1000:>9.1f} ms  ({loop_seconds / numpy_seconds:.0f}x)")
+    assert loop_top == numpy_top, "top-k mismatch"
+    print("  top-k ids match")
@@ -0,0 +1,92 @@
+"""Cold start of the serverless entry point (api/index.py) under each SCHEMA_SYNC mode.
+
+Every sample is a fresh interpreter against a SQLite database that was
+already migrated (`python api/index.py migrate`), as in production. It
+reports three timings: the time to import the module, the first request
+through the Mangum handler (which absorbs lazy schema checks and the
+deferred imports), and a warm second request.
+
+Run from the repository root:
+
+    python backend/benchmarks/bench_cold_start.py [samples]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "api")
+
+
+def http_event(path: str) -> dict:
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": path,
+        "rawQueryString": "",
+        "headers": {"host": "bench.local", "accept": "application/json"},
+        "requestContext": {
+            "http": {"method": "GET", "path": path, "protocol": "HTTP/1.1", "sourceIp": "127.0.0.1", "userAgent": "bench"},
+            "stage": "$default",
+            "requestId": "bench",
+            "routeKey": "$default",
+            "accountId": "bench",
+            "apiId": "bench",
+            "domainName": "bench.local",
+            "domainPrefix": "bench",
+            "timeEpoch": 0,
+        },
+        "isBase64Encoded": False,
+    }
+
+
+def child():
+    sys.path.insert(0, API_DIR)
+    started = time.perf_counter()
+    import index
+    imported = time.perf_counter()
+    first = index.handler(http_event("/api/help-requests"), None)
+    first_done = time.perf_counter()
+    index.handler(http_event("/api/help-requests"), None)
+    second_done = time.perf_counter()
+    assert first["statusCode"] == 200, first
+    print(json.dumps({
+        "import": imported - started,
+        "first_request": first_done - imported,
+        "warm_request": second_done - first_done,
+    }))
+
+
+def sample(mode: str) -> dict:
+    env = dict(
+        os.environ,
+        SCHEMA_SYNC=mode,
+        DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/bench.db",
+        JWT_SECRET_KEY="benchmark",
+    )
+    subprocess.run([sys.executable, os.path.join(API_DIR, "index.py"), "migrate"], env=env, check=True, capture_output=True)
+    output = subprocess.run(
+        [sys.executable, __file__, "--child"], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    samples = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"median of {samples} cold starts, milliseconds")
+    print(f"  {'SCHEMA_SYNC':<14}{'import':>10}{'1st request':>14}{'warm':>8}{'total':>10}")
+    for mode in ("import", "lazy", "off"):
+        results = [sample(mode) for _ in range(samples)]
+        medians = {key: statistics.median(result[key] for result in results) * 1e3 for key in results[0]}
+        total = medians["import"] + medians["first_request"]
+        print(f"  {mode:<14}{medians['import']:>10.1f}{medians['first_request']:>14.1f}{medians['warm_request']:>8.1f}{total:>10.1f}")
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        child()
+    else:
+        main()
@@ -0,0 +1,128 @@
+"""Help request dispatch latency with thousands of requests already open.
+
+Seeds residents around Metro Manila and a backlog of open help requests,
+then starts HelpRequestDispatcher:
+
+1. Warm-up: every open request is queued at once and gets its first wave.
+   Each wave is a geohash lookup, an exclusion check and one
+   group-committed batch of notifications.
+2. Steady state: the backlog now waits in the wave heap. New requests of
+   mixed urgency arrive at a steady rate, and each one's latency from
+   enqueue to notified responders is recorded.
+
+A critical request filed during the warm-up is dispatched ahead of the
+queued backlog.
+
+Run from the repository root:
+
+    python backend/benchmarks/bench_help_dispatch.py [residents] [open requests] [new requests]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Import the app against a throwaway database
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from sqlalchemy import insert  # noqa: E402
+import main  # noqa: E402
+
+RESIDENTS = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+REQUESTS = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+NEW_REQUESTS = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+ARRIVALS_PER_SECOND = 20
+ORIGIN = (14.5995, 120.9842)
+URGENCIES = ("low", "normal", "high")
+
+
+def seed(db) -> list:
+    rng = random.Random(11)
+    residents = []
+    for i in range(RESIDENTS):
+        latitude = ORIGIN[0] + rng.uniform(-0.2, 0.2)
+        longitude = ORIGIN[1] + rng.uniform(-0.2, 0.2)
+        residents.append({
+            "email": f"resident{i}@example.ph", "hashed_password": "-", "first_name": "Resident", "last_name": str(i),
+            "latitude": latitude, "longitude": longitude, "geohash": main.geohash_encode(latitude, longitude),
+            "is_active": True
+        })
+    db.execute(insert(main.User), residents)
+    requests = []
+    for i in range(REQUESTS):
+        requester = rng.randrange(1, RESIDENTS + 1)
+        resident = residents[requester - 1]
+        requests.append({
+            "user_id": requester, "user_name": f"Resident {requester}", "type": "rescue", "title": f"Flooded street {i}",
+            "description": "Water rising", "location": "Metro Manila", "urgency": rng.choice(URGENCIES),
+            "status": "open", "responders_needed": rng.randint(1, 3), "responders_count": 0,
+            "latitude": resident["latitude"], "longitude": resident["longitude"]
+        })
+    db.execute(insert(main.HelpRequest), requests)
+    db.commit()
+
+
+def file_request(db, urgency: str, latitude: float = ORIGIN[0], longitude: float = ORIGIN[1]) -> "main.HelpRequest":
+    help_request = main.HelpRequest(
+        user_id=1, user_name="Resident 1", type="rescue", title="Trapped on roof", description="Family of four",
+        location="Marikina", urgency=urgency, status="open", responders_needed=3, responders_count=0,
+        latitude=latitude, longitude=longitude
+    )
+    db.add(help_request)
+    db.commit()
+    main.help_request_dispatcher.enqueue(help_request.id, urgency, help_request.created_at)
+    return help_request
+
+
+def drain(dispatcher):
+    while dispatcher.stats()["awaitingFirstWave"]:
+        time.sleep(0.005)
+
+
+if __name__ == "__main__":
+    db = main.SessionLocal()
+    seed(db)
+    dispatcher = main.help_request_dispatcher
+    dispatcher.wave_seconds = 3600  # follow-up waves stay queued for the whole run
+
+    main.group_commit_writer.start()
+    started = time.perf_counter()
+    dispatcher.start()  # the first poll queues every open request at once
+    while not dispatcher.pending_count():
+        time.sleep(0.001)
+    critical_id = file_request(db, "critical").id
+    critical_filed = time.perf_counter()
+    critical_notified = None
+    while dispatcher.stats()["ready"]:
+        if critical_notified is None and db.query(main.HelpRequestDispatch).filter_by(request_id=critical_id).first():
+            critical_notified = time.perf_counter()
+        time.sleep(0.005)
+    warm_up = time.perf_counter() - started
+    warm_up_waves = dispatcher.waves_dispatched
+
+    print(f"{RESIDENTS} residents, {REQUESTS} open requests")
+    print(f"  warm-up: first waves for the whole backlog in {warm_up:.2f} s ({warm_up_waves / warm_up:.0f} waves/s)")
+    if critical_notified is not None:
+        print(f"  critical request filed behind the backlog: notified after {(critical_notified - critical_filed) * 1000:.0f} ms")
+
+    drain(dispatcher)
+    dispatcher.first_wave_latencies.clear()
+    rng = random.Random(5)
+    for _ in range(NEW_REQUESTS):
+        file_request(
+            db, rng.choice(URGENCIES + ("critical",)),
+            ORIGIN[0] + rng.uniform(-0.2, 0.2), ORIGIN[1] + rng.uniform(-0.2, 0.2)
+        )
+        time.sleep(1 / ARRIVALS_PER_SECOND)
+    drain(dispatcher)
+    stats = dispatcher.stats()
+    print(f"  steady state: {NEW_REQUESTS} new requests at {ARRIVALS_PER_SECOND}/s with {stats['waiting']} requests waiting for their next wave")
+    print(f"  first-wave latency: p50 {stats['firstWaveP50Ms']} ms, p99 {stats['firstWaveP99Ms']} ms")
+    print(f"  users notified overall: {stats['usersNotified']}")
+
+    dispatcher.stop()
+    main.group_commit_writer.stop()
+    db.close()
@@ -0,0 +1,97 @@
+"""Throughput of a large help-request list: ORM hydration versus column-projected read models.
+
+The ORM path is what get_help_requests did before: load full instances into
+the session, validate each through HelpRequestResponse, run
+jsonable_encoder, then render. The read-model path selects only the response
+columns into plain dicts and renders them directly.
+
+Run from the repository root:
+
+    python backend/benchmarks/bench_read_models.py [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Import the app against a throwaway database
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+import main  # noqa: E402
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+REPEAT = 5
+
+
+def seed(count: int):
+    now = datetime.utcnow()
+    db = main.SessionLocal()
+    try:
+        db.execute(insert(main.HelpRequest), [
+            {
+                "user_id": i % 97,
+                "user_name": f"Juan Dela Cruz {i}",
+                "type": ("medical", "food", "evacuation", "rescue")[i % 4],
+                "title": f"Need assistance near Barangay {i % 40}",
+                "description": "Elderly resident needs maintenance medication and drinking water delivered.",
+                "location": f"Brgy. {i % 40}, Quezon City",
+                "urgency": ("low", "medium", "high")[i % 3],
+                "status": "open",
+                "responders_needed": 3,
+                "responders_count": i % 3,
+                "created_at": now - timedelta(minutes=i),
+            }
+            for i in range(count)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def orm_path() -> bytes:
+    db = main.SessionLocal()
+    try:
+        requests = db.query(main.HelpRequest).order_by(main.HelpRequest.created_at.desc()).all()
+        content = jsonable_encoder([main.HelpRequestResponse.model_validate(req) for req in requests])
+        return main.FastJSONResponse(content).body
+    finally:
+        db.close()
+
+
+def read_model_path() -> bytes:
+    db = main.SessionLocal()
+    try:
+        rows = main.fetch_rows(
+            db,
+            select(*main.schema_columns(main.HelpRequestResponse, main.HelpRequest))
+            .order_by(main.HelpRequest.created_at.desc())
+        )
+        return main.FastJSONResponse(rows).body
+    finally:
+        db.close()
+
+
+def measure(fn) -> float:
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - started) / REPEAT
+
+
+if __name__ == "__main__":
+    seed(ROWS)
+    assert len(orm_path()) == len(read_model_path())
+
+    orm_seconds = measure(orm_path)
+    read_model_seconds = measure(read_model_path)
+    print(f"{ROWS} help requests, mean of {REPEAT} runs")
+    print(f"  {'path':<14}{'ms/request':>12}{'us/row':>10}{'rows/s':>12}")
+    for name, seconds in (("ORM", orm_seconds), ("read model", read_model_seconds)):
+        print(f"  {name:<14}{seconds * 1e3:>12.1f}{seconds / ROWS * 1e6:>10.2f}{ROWS / seconds:>12.0f}")
+    print(f"  speedup: {orm_seconds / read_model_seconds:.1f}x")
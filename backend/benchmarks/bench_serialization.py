@@ -0,0 +1,101 @@
+"""Per-row cost of serializing help-request lists and the bytes they put on the wire.
+
+Compares the stdlib JSON encoder FastAPI used before with FastJSONResponse
+(orjson when installed, MessagePack when negotiated), then shows the size of
+each body after gzip and brotli.
+
+Run from the repository root:
+
+    python backend/benchmarks/bench_serialization.py [rows]
+"""
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Import the app against a throwaway database
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+import main  # noqa: E402
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+REPEAT = 20
+
+
+def make_rows(count: int) -> list:
+    now = datetime.utcnow()
+    return [
+        main.HelpRequest(
+            id=i,
+            user_id=i % 97,
+            user_name=f"Juan Dela Cruz {i}",
+            type=("medical", "food", "evacuation", "rescue")[i % 4],
+            title=f"Need assistance near Barangay {i % 40}",
+            description="Elderly resident needs maintenance medication and drinking water delivered. " * 2,
+            location=f"Brgy. {i % 40}, Quezon City",
+            urgency=("low", "medium", "high")[i % 3],
+            status="open",
+            responders_needed=3,
+            responders_count=i % 3,
+            created_at=now - timedelta(minutes=i),
+        )
+        for i in range(count)
+    ]
+
+
+def per_row_microseconds(fn, rows: int) -> float:
+    fn()  # warm up
+    started = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - started) / REPEAT / rows * 1e6
+
+
+def main_benchmark():
+    orm_rows = make_rows(ROWS)
+    encoded = jsonable_encoder([main.HelpRequestResponse.model_validate(row) for row in orm_rows])
+
+    def stdlib_json():
+        return json.dumps(encoded, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+    def fast_json():
+        return main.FastJSONResponse(encoded).body
+
+    def msgpack_body():
+        token = main.response_media_type.set(main.MSGPACK_MEDIA_TYPE)
+        try:
+            return main.FastJSONResponse(encoded).body
+        finally:
+            main.response_media_type.reset(token)
+
+    def model_and_encode():
+        return jsonable_encoder([main.HelpRequestResponse.model_validate(row) for row in orm_rows])
+
+    print(f"{ROWS} help requests, mean of {REPEAT} runs")
+    print(f"  orjson installed: {main.orjson is not None}, msgpack: {main.msgpack is not None}, brotli: {main.brotli is not None}")
+    print(f"  {'step':<34}{'us/row':>10}")
+    print(f"  {'model_validate + jsonable_encoder':<34}{per_row_microseconds(model_and_encode, ROWS):>10.2f}")
+    print(f"  {'stdlib json.dumps':<34}{per_row_microseconds(stdlib_json, ROWS):>10.2f}")
+    print(f"  {'FastJSONResponse (json)':<34}{per_row_microseconds(fast_json, ROWS):>10.2f}")
+    if main.msgpack is not None:
+        print(f"  {'FastJSONResponse (msgpack)':<34}{per_row_microseconds(msgpack_body, ROWS):>10.2f}")
+
+    bodies = {"json": fast_json()}
+    if main.msgpack is not None:
+        bodies["msgpack"] = msgpack_body()
+    print(f"  {'body':<12}{'raw':>10}{'gzip':>10}{'br':>10}   gzip us/row")
+    for name, body in bodies.items():
+        gzipped = gzip.compress(body, compresslevel=6)
+        brotli_size = len(main.brotli.compress(body, quality=5)) if main.brotli is not None else "-"
+        gzip_cost = per_row_microseconds(lambda: gzip.compress(body, compresslevel=6), ROWS)
+        print(f"  {name:<12}{len(body):>10}{len(gzipped):>10}{brotli_size:>10}   {gzip_cost:.2f}")
+
+
+if __name__ == "__main__":
+    main_benchmark()
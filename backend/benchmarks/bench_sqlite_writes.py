@@ -0,0 +1,87 @@
+"""Disaster-day write burst against SQLite: one commit per request versus the group-commit writer.
+
+Many threads each file help requests at once. The per-request path is
+what handlers did before: its own session on the shared engine and one
+commit per write, with every writer contending for the database lock.
+The group-commit path submits the same insert as a write job to
+GroupCommitWriter, whose single connection commits whatever has queued
+up in one transaction.
+
+Run from the repository root:
+
+    python backend/benchmarks/bench_sqlite_writes.py [writes] [threads]
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Import the app against a throwaway database
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+os.environ.setdefault("SQLITE_SYNCHRONOUS", "FULL")  # make every commit pay for its fsync
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
+
+import main  # noqa: E402
+
+WRITES = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+THREADS = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+
+
+def help_request(i: int) -> "main.HelpRequest":
+    return main.HelpRequest(
+        user_id=i % 97,
+        user_name=f"Juan Dela Cruz {i}",
+        type="rescue",
+        title=f"Trapped on roof near Barangay {i % 40}",
+        description="Family of four, floodwater rising.",
+        location=f"Brgy. {i % 40}, Marikina",
+        urgency="high",
+        responders_needed=3,
+    )
+
+
+def per_request_commit(i: int):
+    db = main.SessionLocal()
+    try:
+        main.insert_help_request(db, help_request(i))
+        db.commit()
+    finally:
+        db.close()
+
+
+def group_commit(i: int):
+    main.group_commit_writer.submit(main.insert_help_request, help_request(i)).result()
+
+
+def burst(write) -> tuple:
+    errors = 0
+
+    def attempt(i):
+        nonlocal errors
+        try:
+            write(i)
+        except Exception:
+            errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as pool:
+        list(pool.map(attempt, range(WRITES)))
+    return time.perf_counter() - started, errors
+
+
+if __name__ == "__main__":
+    print(f"{WRITES} help requests from {THREADS} threads, synchronous={os.environ['SQLITE_SYNCHRONOUS']}")
+    print(f"  {'path':<20}{'seconds':>9}{'writes/s':>10}{'errors':>8}")
+    seconds, errors = burst(per_request_commit)
+    print(f"  {'commit per request':<20}{seconds:>9.2f}{WRITES / seconds:>10.0f}{errors:>8}")
+
+    main.group_commit_writer.start()
+    try:
+        seconds, errors = burst(group_commit)
+    finally:
+        main.group_commit_writer.stop()
+    print(f"  {'group commit':<20}{seconds:>9.2f}{WRITES / seconds:>10.0f}{errors:>8}")
+    stats = main.group_commit_writer.stats()
+    print(f"  {stats['groupsCommitted']} groups, mean {stats['meanGroupSize']} writes per commit")
@@ -0,0 +1,10 @@
+"""Every test module drives the same imported app, so the database and
+secrets are configured here, once, before the first import of main."""
+import os
+import sys
+import tempfile
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'tests.db')}"
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ["PASSWORD_HASH_ITERATIONS"] = "1000"
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "app"))
@@ -0,0 +1,309 @@
+"""Write paths keep their guarantees under the conditions they were built for.
+
+Drives the API through TestClient against the shared test database:
+concurrent community task claims leave exactly one volunteer, collection
+ETags revalidate and move on every write, repeated acknowledgements stay
+no-ops, alert fan-out pushes the ids of the notifications it stored, keyset cursors walk a list without gaps or repeats, and ledger
+balances match /api/points/reconcile whether awards apply inline or
+through the batching worker, awards committed before a crash are
+applied once the worker is back, the leaderboard picks up points another
+worker applied, and the missed check-in detector finds
+sessions that were started on a process where it was not running, as
+the help request dispatcher does for requests filed elsewhere.
+
+Run from the repository root:
+
+    python -m pytest backend/tests
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main  # configured by conftest.py
+
+CLAIMANTS = 8
+
+
+@pytest.fixture(scope="module")
+def client():
+    # No startup events: background workers stay off unless a test starts one
+    return TestClient(main.app)
+
+
+def register(client, email, first, last, **profile):
+    response = client.post("/api/auth/register", json={
+        "email": email, "password": "pw123456", "firstName": first, "lastName": last, **profile
+    })
+    assert response.status_code == 200, response.text
+    body = response.json()
+    return body["user"]["id"], {"Authorization": f"Bearer {body['access_token']}"}
+
+
+def create_community_task(client, headers, title):
+    response = client.post("/api/community-tasks", json={
+        "title": title, "description": "Barangay hall", "location": "Batasan Hills", "urgency": "high"
+    }, headers=headers)
+    assert response.status_code == 200, response.text
+    return response.json()["id"]
+
+
+def test_concurrent_volunteers_leave_one_winner(client):
+    _, organiser = register(client, "consistency-organiser@example.ph", "Olga", "Organiser")
+    task_id = create_community_task(client, organiser, "Repack relief goods")
+    claimants = [
+        register(client, f"consistency-claimant{i}@example.ph", "Claire", f"Claimant{i}")
+        for i in range(CLAIMANTS)
+    ]
+
+    start = threading.Barrier(CLAIMANTS)
+
+    def claim(headers):
+        start.wait()
+        return client.post(f"/api/community-tasks/{task_id}/volunteer", headers=headers)
+
+    with ThreadPoolExecutor(CLAIMANTS) as pool:
+        responses = list(pool.map(claim, [headers for _, headers in claimants]))
+
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200] + [400] * (CLAIMANTS - 1), [response.text for response in responses]
+    winner = next(response.json() for response in responses if response.status_code == 200)
+
+    db = main.SessionLocal()
+    try:
+        roster = db.query(main.CommunityTaskVolunteer).filter_by(community_task_id=task_id).all()
+        task = db.get(main.CommunityTask, task_id)
+    finally:
+        db.close()
+    assert [row.user_id for row in roster] == [task.volunteer_id]
+    assert task.status == "assigned"
+    assert winner["personal_task"]["id"] == roster[0].personal_task_id
+
+
+def test_collection_etag_revalidates_until_a_write(client):
+    _, headers = register(client, "consistency-etag@example.ph", "Eli", "Etag")
+    first = client.get("/api/community-tasks")
+    etag = first.headers["ETag"]
+
+    repeat = client.get("/api/community-tasks", headers={"If-None-Match": etag})
+    assert repeat.status_code == 304
+    assert repeat.headers["ETag"] == etag
+    assert not repeat.content
+
+    create_community_task(client, headers, "Clear the drainage canal")
+    changed = client.get("/api/community-tasks", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert "Clear the drainage canal" in [task["title"] for task in changed.json()]
+
+
+def test_repeat_acknowledgement_is_a_no_op(client):
+    _, issuer = register(client, "consistency-issuer@example.ph", "Ivy", "Issuer", city="Pasig")
+    _, resident = register(client, "consistency-resident@example.ph", "Rey", "Resident", city="Pasig")
+    alert_id = client.post("/api/global-alerts", json={
+        "type": "weather", "priority": "high", "title": "Flood warning",
+        "message": "Move to higher ground", "affected_areas": ["Pasig"]
+    }, headers=issuer).json()["id"]
+
+    counts = []
+    for _ in range(3):
+        response = client.patch(f"/api/global-alerts/{alert_id}/acknowledge", headers=resident)
+        assert response.status_code == 200, response.text
+        counts.append(response.json()["alert"]["acknowledged_count"])
+    assert counts == [1, 1, 1]
+
+    db = main.SessionLocal()
+    try:
+        assert db.query(main.AlertAcknowledgement).filter_by(alert_id=alert_id).count() == 1
+    finally:
+        db.close()
+
+
+def test_fanout_pushes_stored_notification_ids(client, monkeypatch):
+    _, issuer = register(client, "consistency-announcer@example.ph", "Ana", "Announcer", city="Marikina")
+    resident_id, resident = register(client, "consistency-listener@example.ph", "Lito", "Listener", city="Marikina")
+    pushed = []
+    monkeypatch.setattr(main.push_hub, "online_user_ids", lambda: {resident_id})
+    monkeypatch.setattr(main.push_hub, "publish", lambda user_id, event_type, data: pushed.append((user_id, event_type, data)))
+
+    alert = client.post("/api/global-alerts", json={
+        "type": "weather", "priority": "high", "title": "River at critical level",
+        "message": "Prepare to evacuate", "affected_areas": ["Marikina"]
+    }, headers=issuer).json()
+    job_id = alert.get("fanoutJobId") or alert.get("fanout_job_id")
+    for _ in range(100):
+        if client.get(f"/api/notifications/fanout/{job_id}", headers=issuer).json()["status"] == "completed":
+            break
+        time.sleep(0.05)
+    else:
+        pytest.fail("fan-out never completed")
+
+    stored = client.get("/api/notifications", headers=resident).json()
+    notification_ids = [data["id"] for user_id, event_type, data in pushed if event_type == "notification"]
+    assert len(notification_ids) == 1
+    assert notification_ids == [n["id"] for n in stored if n["relatedId"] == alert["id"]]
+    assert all(user_id == resident_id for user_id, _, _ in pushed)
+
+
+def test_task_cursor_walks_every_task_once(client):
+    _, headers = register(client, "consistency-pager@example.ph", "Paz", "Pager")
+    created = []
+    for i in range(11):
+        created.append(client.post("/api/tasks", json={
+            "title": f"Task {i}", "description": "Paged", "category": "preparedness",
+            "priority": "low", "points": i % 3  # repeated sort values exercise the id tiebreak
+        }, headers=headers).json()["id"])
+
+    for sort in ("-created_at", "points", "-points"):
+        seen = []
+        cursor = None
+        while True:
+            params = {"sort": sort, "limit": 4}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/api/tasks", params=params, headers=headers)
+            assert response.status_code == 200, response.text
+            seen.extend(task["id"] for task in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert sorted(seen) == sorted(created), sort
+        assert len(seen) == len(set(seen)), sort
+
+
+def test_ledger_balances_match_reconcile(client):
+    user_id, headers = register(client, "consistency-ledger@example.ph", "Lea", "Ledger")
+
+    def complete_tasks(count, points):
+        for i in range(count):
+            task_id = client.post("/api/tasks", json={
+                "title": f"Drill {i}", "description": "Earn points", "category": "preparedness",
+                "priority": "medium", "points": points
+            }, headers=headers).json()["id"]
+            response = client.patch(f"/api/tasks/{task_id}", json={"status": "completed"}, headers=headers)
+            assert response.status_code == 200, response.text
+
+    complete_tasks(3, 10)  # applied inline
+    main.points_ledger.start()
+    try:
+        complete_tasks(5, 7)  # queued and applied in batches
+    finally:
+        main.points_ledger.stop()
+
+    reconcile = client.get("/api/points/reconcile", headers=headers).json()
+    assert reconcile == {"consistent": True, "mismatches": [], "pendingAwards": 0}
+    assert client.get("/api/auth/me", headers=headers).json()["points"] == 100 + 3 * 10 + 5 * 7
+
+
+def test_committed_awards_survive_a_crash_before_applying(client):
+    user_id, headers = register(client, "consistency-outbox@example.ph", "Otto", "Outbox")
+    db = main.SessionLocal()
+    try:
+        # The request committed its award, then the process died before notify()
+        main.points_ledger.award(db, user_id, 40, "task_completed", "Completed task: Check the go-bag")
+        db.commit()
+    finally:
+        db.close()
+
+    reconcile = client.get("/api/points/reconcile", headers=headers).json()
+    assert reconcile == {"consistent": True, "mismatches": [], "pendingAwards": 1}
+    assert client.get("/api/auth/me", headers=headers).json()["points"] == 100
+
+    main.points_ledger.start()  # the restarted process drains what was left pending
+    main.points_ledger.stop()
+    reconcile = client.get("/api/points/reconcile", headers=headers).json()
+    assert reconcile == {"consistent": True, "mismatches": [], "pendingAwards": 0}
+    assert client.get("/api/auth/me", headers=headers).json()["points"] == 140
+
+
+def test_leaderboard_catches_up_with_other_workers(client, monkeypatch):
+    profile = {"city": "Iloilo City", "barangay": "Jaro"}
+    _, leader = register(client, "consistency-leader@example.ph", "Lito", "Leader", **profile)
+    chaser_id, chaser = register(client, "consistency-chaser@example.ph", "Chona", "Chaser", **profile)
+    before = client.get("/api/leaderboard?scope=barangay", headers=leader).json()
+    assert [entry["points"] for entry in before["top"]] == [100, 100]
+
+    # Another worker applies the award: its copy moves, this one does not
+    monkeypatch.setattr(main.leaderboard, "set_points", lambda totals, version: None)
+    db = main.SessionLocal()
+    try:
+        main.points_ledger.award(db, chaser_id, 50, "help_response", "Responded to help request: Flooded street")
+        db.commit()
+    finally:
+        db.close()
+    main.points_ledger.apply_pending()
+    monkeypatch.undo()
+
+    after = client.get("/api/leaderboard?scope=barangay", headers=leader).json()
+    assert [(entry["userId"], entry["points"]) for entry in after["top"]][0] == (chaser_id, 150)
+    assert after["me"]["position"] == 2
+
+
+def test_detector_finds_sessions_started_on_other_workers(client):
+    user_id, headers = register(client, "consistency-walker@example.ph", "Wally", "Walker")
+    buddy_id, buddy_headers = register(client, "consistency-watcher@example.ph", "Wanda", "Watcher")
+    # The detector is not running here, as on every worker but one
+    session_id = client.post("/api/buddy/sessions", json={"buddy_id": buddy_id}, headers=headers).json()["id"]
+    assert main.check_in_scheduler.pending_count() == 0
+
+    db = main.SessionLocal()
+    try:
+        db.get(main.BuddySession, session_id).next_check_in = main.datetime.utcnow() - main.timedelta(seconds=1)
+        db.commit()
+    finally:
+        db.close()
+
+    scheduler = main.check_in_scheduler
+    poll_seconds = scheduler.poll_seconds
+    scheduler.poll_seconds = 0.05
+    scheduler.start()
+    try:
+        for _ in range(100):
+            missed = client.get("/api/notifications", headers=buddy_headers).json()
+            if any(n["type"] == "missed_check_in" and n["relatedId"] == session_id for n in missed):
+                break
+            time.sleep(0.05)
+        else:
+            pytest.fail("missed check-in was never detected")
+    finally:
+        scheduler.stop()
+        scheduler.poll_seconds = poll_seconds
+
+    db = main.SessionLocal()
+    try:
+        assert db.get(main.BuddySession, session_id).next_check_in > main.datetime.utcnow()  # re-armed
+    finally:
+        db.close()
+
+
+def test_dispatcher_finds_requests_filed_on_other_workers(client):
+    davao = (7.0731, 125.6128)  # away from every other test's users
+    _, requester = register(client, "consistency-requester@example.ph", "Rita", "Requester")
+    responder_id, responder = register(client, "consistency-responder@example.ph", "Ramon", "Responder")
+    for headers, offset in ((requester, 0), (responder, 0.005)):
+        response = client.put("/api/users/me/location", json={"latitude": davao[0] + offset, "longitude": davao[1]}, headers=headers)
+        assert response.status_code == 200, response.text
+    # The dispatcher is not running here, as on every worker but one
+    request_id = client.post("/api/help-requests", json={
+        "type": "rescue", "title": "Stranded by floodwater", "description": "Two adults",
+        "location": "Davao City", "urgency": "critical"
+    }, headers=requester).json()["id"]
+    assert main.help_request_dispatcher.pending_count() == 0
+
+    dispatcher = main.help_request_dispatcher
+    poll_seconds = dispatcher.poll_seconds
+    dispatcher.poll_seconds = 0.05
+    dispatcher.start()
+    try:
+        for _ in range(100):
+            offered = client.get("/api/help-requests/dispatched", headers=responder).json()
+            if request_id in [help_request["id"] for help_request in offered]:
+                break
+            time.sleep(0.05)
+        else:
+            pytest.fail("help request was never dispatched")
+    finally:
+        dispatcher.stop()
+        dispatcher.poll_seconds = poll_seconds
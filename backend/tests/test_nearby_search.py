@@ -0,0 +1,99 @@
+"""Nearby search must return exactly what a brute-force scan would.
+
+Seeds users scattered around Metro Manila, then pages through
+/api/users/nearby from several origins and radii and compares the ids,
+order and distances with a haversine pass over every user in the table.
+Origins sit on geohash cell edges too, where a wrong prefix set or
+bounding box would silently drop neighbours.
+
+Run from the repository root:
+
+    python -m pytest backend/tests
+"""
+import random
+from math import floor
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, select
+
+import main  # configured by conftest.py
+
+ORIGIN = (14.5995, 120.9842)
+PAGE_SIZE = 7
+
+
+@pytest.fixture(scope="module")
+def searcher():
+    client = TestClient(main.app)
+    response = client.post("/api/auth/register", json={
+        "email": "nearby.searcher@example.ph", "password": "pw123456", "firstName": "Nora", "lastName": "Searcher"
+    })
+    assert response.status_code == 200, response.text
+    body = response.json()
+
+    rng = random.Random(23)
+    rows = []
+    for i in range(400):
+        latitude = ORIGIN[0] + rng.uniform(-0.6, 0.6)
+        longitude = ORIGIN[1] + rng.uniform(-0.6, 0.6)
+        rows.append({
+            "email": f"nearby{i}@example.ph", "hashed_password": "-", "first_name": "Nearby", "last_name": str(i),
+            "latitude": latitude, "longitude": longitude, "geohash": main.geohash_encode(latitude, longitude),
+            "is_active": i % 17 != 0
+        })
+    db = main.SessionLocal()
+    try:
+        db.execute(insert(main.User), rows)
+        db.commit()
+    finally:
+        db.close()
+    return client, body["user"]["id"], {"Authorization": f"Bearer {body['access_token']}"}
+
+
+def brute_force(user_id: int, latitude: float, longitude: float, radius_km: float) -> list:
+    db = main.SessionLocal()
+    try:
+        users = db.execute(
+            select(main.User.id, main.User.latitude, main.User.longitude)
+            .where(main.User.is_active == True, main.User.latitude.is_not(None), main.User.id != user_id)
+        ).all()
+    finally:
+        db.close()
+    within = []
+    for other_id, other_latitude, other_longitude in users:
+        distance = main.haversine_km(latitude, longitude, other_latitude, other_longitude)
+        if distance <= radius_km:
+            within.append((round(distance, 3), other_id))
+    return sorted(within)
+
+
+def walk_pages(client, headers, latitude: float, longitude: float, radius_km: float) -> list:
+    results = []
+    cursor = None
+    while True:
+        params = {"lat": latitude, "lng": longitude, "radius_km": radius_km, "limit": PAGE_SIZE}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/users/nearby", params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        results.extend((row["distance"], row["id"]) for row in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return results
+
+
+def cell_corner(latitude: float, longitude: float, radius_km: float) -> tuple:
+    """The south-west corner of the geohash cell the search is keyed on"""
+    precision = len(next(iter(main.geohash_search_prefixes(latitude, longitude, radius_km))))
+    height, width = main.geohash_cell_degrees(precision)
+    return floor((latitude + 90) / height) * height - 90, floor((longitude + 180) / width) * width - 180
+
+
+@pytest.mark.parametrize("radius_km", [0.5, 2, 5, 12, 40, 100])
+def test_nearby_matches_brute_force(searcher, radius_km):
+    client, user_id, headers = searcher
+    origins = [ORIGIN, (14.676, 121.0437), (14.2, 120.6), cell_corner(*ORIGIN, radius_km)]
+    for latitude, longitude in origins:
+        expected = brute_force(user_id, latitude, longitude, radius_km)
+        assert walk_pages(client, headers, latitude, longitude, radius_km) == expected, (latitude, longitude)
@@ -0,0 +1,68 @@
+"""Login storms beyond the password hashing queue bound are turned away.
+
+Drives concurrent logins through TestClient against the shared test
+database with slow stored hashes, so callers pile up on the pool: those
+past the bound get a 503 with Retry-After instead of waiting, and the
+bound the server starts with can actually be reached from its request
+threadpool.
+
+Run from the repository root:
+
+    python -m pytest backend/tests
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from anyio import to_thread
+from fastapi.testclient import TestClient
+
+import main  # configured by conftest.py
+
+LOGINS = 8
+SLOW_ITERATIONS = 300000  # tenths of a second per verification
+
+
+def test_logins_beyond_the_queue_bound_get_503(monkeypatch):
+    client = TestClient(main.app)
+    response = client.post("/api/auth/register", json={
+        "email": "storm@example.ph", "password": "pw123456", "firstName": "Stella", "lastName": "Storm"
+    })
+    assert response.status_code == 200, response.text
+    db = main.SessionLocal()
+    try:
+        user = db.query(main.User).filter_by(email="storm@example.ph").one()
+        user.hashed_password = main._hash_password_job("pw123456", SLOW_ITERATIONS)
+        db.commit()
+    finally:
+        db.close()
+
+    monkeypatch.setattr(main.password_hasher, "max_queue_depth", main.PASSWORD_HASH_MAX_QUEUE)
+    main.password_hasher.fit_to_threadpool(5)  # a five-thread pool leaves room for two
+    rejected_before = main.password_hasher.stats()["rejected"]
+    start = threading.Barrier(LOGINS)
+
+    def login(_):
+        start.wait()
+        return client.post("/api/auth/login", json={"email": "storm@example.ph", "password": "pw123456"})
+
+    with ThreadPoolExecutor(LOGINS) as pool:
+        responses = list(pool.map(login, range(LOGINS)))
+
+    statuses = sorted(response.status_code for response in responses)
+    assert 200 in statuses and 503 in statuses, statuses
+    assert set(statuses) == {200, 503}, [response.text for response in responses]
+    assert all(response.headers["Retry-After"] == "1" for response in responses if response.status_code == 503)
+    assert main.password_hasher.stats()["rejected"] - rejected_before == statuses.count(503)
+
+
+def test_queue_bound_fits_the_request_threadpool(monkeypatch):
+    monkeypatch.setattr(main.password_hasher, "max_queue_depth", main.PASSWORD_HASH_MAX_QUEUE)
+
+    async def startup():
+        await main.fit_password_hash_queue()
+        return to_thread.current_default_thread_limiter().total_tokens
+
+    threads = asyncio.run(startup())
+    assert main.password_hasher.max_queue_depth == min(main.PASSWORD_HASH_MAX_QUEUE, threads // 2)
+    assert main.password_hasher.max_queue_depth < threads
@@ -3,6 +3,7 @@ import { Search, UserPlus, MessageCircle, Phone, MapPin, Star, CheckCircle } fro
 import { useNavigate, useLocation } from 'react-router-dom';
 import Layout from '../components/layout/Layout';
 import BuddyCard from '../components/buddies/BuddyCard';
+import BuddyMatching from '../components/BuddyMatching';
 import Modal from '../components/ui/Modal';
 import { mockBuddies } from '../data/mockData';
 import { Buddy } from '../types';
@@ -18,6 +19,8 @@ interface SearchableUser {
   isVerified: boolean;
 }
 
+type BuddyMatch = React.ComponentProps<typeof BuddyMatching>['buddies'][number];
+
 const BuddiesPage: React.FC = () => {
   const navigate = useNavigate();
   const location = useLocation();
@@ -31,6 +34,7 @@ const BuddiesPage: React.FC = () => {
   const [activeSessions, setActiveSessions] = useState<any[]>([]);
   const [loading, setLoading] = useState(false);
   const [buddies, setBuddies] = useState<Buddy[]>([]);
+  const [matches, setMatches] = useState<BuddyMatch[]>([]);
   
   // Add buddy search state
   const [buddySearchQuery, setBuddySearchQuery] = useState('');
@@ -75,6 +79,27 @@ const BuddiesPage: React.FC = () => {
     }
   };
 
+  // Share the browser's position so nearby search is centred on where the user is now
+  const shareCurrentLocation = () =>
+    new Promise<void>((resolve) => {
+      if (!navigator.geolocation) {
+        resolve();
+        return;
+      }
+      navigator.geolocation.getCurrentPosition(
+        async (position) => {
+          try {
+            await apiService.updateMyLocation(position.coords.latitude, position.coords.longitude);
+          } catch (error) {
+            console.log('Could not share location (API unavailable)');
+          }
+          resolve();
+        },
+        () => resolve(), // Denied or unavailable: search around the stored location
+        { maximumAge: 5 * 60 * 1000, timeout: 10000 }
+      );
+    });
+
   const fetchBuddies = async () => {
     // Load from localStorage first, fallback to mockBuddies
     const localBuddies = localStorage.getItem('safezoneph_buddies');
@@ -87,7 +112,10 @@ const BuddiesPage: React.FC = () => {
     }
     
     try {
-      const response = await apiService.getBuddies();
+      // Nearby users when the account has a location, otherwise everyone
+      await shareCurrentLocation();
+      const nearby = await apiService.getNearbyBuddies({ radius_km: 50 });
+      const response = nearby.error ? await apiService.getBuddies() : nearby;
       if (response.data && response.data.length > 0) {
         // Convert backend buddy data to frontend Buddy type
         const formattedBuddies: Buddy[] = response.data.map((buddy: any) => ({
@@ -98,8 +126,8 @@ const BuddiesPage: React.FC = () => {
           status: 'offline' as const,
           riskLevel: 'low' as const,
           relationship: 'buddy',
-          isVerified: true,
-          distance: undefined,
+          isVerified: buddy.isVerified ?? true,
+          distance: buddy.distance,
           trustScore: Math.floor(Math.random() * 20) + 80,
           sessionsCompleted: Math.floor(Math.random() * 50),
           responseTime: `${Math.floor(Math.random() * 10) + 1}min`,
@@ -113,8 +141,41 @@ const BuddiesPage: React.FC = () => {
     } catch (error) {
       console.log('Using local buddies (API unavailable)');
     }
+    await fetchMatches();
+  };
+
+  // Ranked suggestions: distance, skills, shared availability, rating and who is online
+  const fetchMatches = async () => {
+    try {
+      const response = await apiService.getBuddyMatches({ radius_km: 50, limit: 10 });
+      if (response.data) {
+        setMatches(response.data.map((match: any) => ({
+          id: match.id.toString(),
+          name: match.name,
+          location: match.location || [match.barangay, match.city].filter(Boolean).join(', '),
+          distance: match.distance,
+          rating: match.rating,
+          reviewCount: match.reviewCount,
+          isVerified: match.isVerified,
+          isOnline: match.isOnline,
+          bio: match.availability.length > 0 ? `Available ${match.availability.join(', ')}` : '',
+          skills: match.skills,
+          availability: match.availability.join(', '),
+          matchScore: match.matchScore,
+        })));
+      }
+    } catch (error) {
+      console.log('Buddy suggestions unavailable');
+    }
   };
 
+  const toSearchableUser = (match: BuddyMatch): SearchableUser => ({
+    id: match.id,
+    name: match.name,
+    location: match.location,
+    isVerified: match.isVerified,
+  });
+
   const filteredBuddies = buddies.filter(buddy => {
     const matchesSearch = buddy.name.toLowerCase().includes(searchQuery.toLowerCase()) ||
       (buddy.location?.toLowerCase().includes(searchQuery.toLowerCase()) || false);
@@ -214,6 +275,20 @@ const BuddiesPage: React.FC = () => {
     setShowProfileModal(true);
   };
 
+  const handleViewMatch = (match: BuddyMatch) => {
+    handleViewProfile({
+      id: match.id,
+      userId: match.id,
+      name: match.name,
+      location: match.location,
+      status: match.isOnline ? 'online' : 'offline',
+      riskLevel: 'low',
+      relationship: 'suggested',
+      isVerified: match.isVerified,
+      skills: match.skills,
+    });
+  };
+
   const handleSubmitCheckIn = async (e: React.FormEvent) => {
     e.preventDefault();
     if (!selectedBuddy) return;
@@ -363,6 +438,24 @@ const BuddiesPage: React.FC = () => {
           </div>
         )}
 
+        {/* Suggested Buddies */}
+        {matches.length > 0 && (
+          <div>
+            <h2 className="font-display text-xl md:text-2xl font-bold text-deep-slate mb-3 md:mb-4">
+              Suggested Buddies
+            </h2>
+            <BuddyMatching
+              buddies={matches}
+              onSelectBuddy={handleViewMatch}
+              onRequestBuddy={(buddyId) => {
+                const match = matches.find(m => m.id === buddyId);
+                if (match) handleAddBuddy(toSearchableUser(match));
+              }}
+              currentUserLocation="you"
+            />
+          </div>
+        )}
+
         {/* Check-in Modal */}
         <Modal
           isOpen={showCheckInModal}
@@ -93,8 +93,11 @@ class ApiService {
     return this.handleResponse(response);
   }
 
-  async getTasks(): Promise<ApiResponse<any[]>> {
-    const response = await fetch(`${API_BASE_URL}/api/tasks`, {
+  async getTasks(filters: Record<string, string | number> = {}): Promise<ApiResponse<any[]>> {
+    const params = new URLSearchParams(
+      Object.entries(filters).map(([key, value]) => [key, String(value)])
+    ).toString();
+    const response = await fetch(`${API_BASE_URL}/api/tasks${params ? `?${params}` : ''}`, {
       method: 'GET',
       headers: this.getHeaders(),
     });
@@ -151,8 +154,13 @@ class ApiService {
   }
 
   // Help Requests
-  async getHelpRequests(): Promise<ApiResponse<any[]>> {
-    const response = await fetch(`${API_BASE_URL}/api/help-requests`, {
+  async getHelpRequests(params: { status?: string; limit?: number; cursor?: string } = {}): Promise<ApiResponse<any[]>> {
+    const query = new URLSearchParams(
+      Object.entries(params)
+        .filter(([, value]) => value !== undefined)
+        .map(([key, value]) => [key, String(value)])
+    ).toString();
+    const response = await fetch(`${API_BASE_URL}/api/help-requests${query ? `?${query}` : ''}`, {
       method: 'GET',
       headers: this.getHeaders(),
     });
@@ -160,6 +168,13 @@ class ApiService {
     return this.handleResponse(response);
   }
 
+  async getDispatchedHelpRequests(): Promise<ApiResponse<any[]>> {
+    const response = await fetch(`${API_BASE_URL}/api/help-requests/dispatched`, {
+      headers: this.getHeaders(),
+    });
+    return this.handleResponse(response);
+  }
+
   async createHelpRequest(requestData: {
     type: string;
     title: string;
@@ -396,8 +411,10 @@ class ApiService {
   // MESSAGING ENDPOINTS
   // ==========================================
 
-  async getConversations(): Promise<ApiResponse<any[]>> {
-    const response = await fetch(`${API_BASE_URL}/api/conversations`, {
+  // Most recent first; page with the X-Next-Cursor header
+  async getConversations(cursor?: string): Promise<ApiResponse<any[]>> {
+    const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+    const response = await fetch(`${API_BASE_URL}/api/conversations${query}`, {
       headers: this.getHeaders(),
     });
     return this.handleResponse(response);
@@ -428,6 +445,40 @@ class ApiService {
     });
     return this.handleResponse(response);
   }
+
+  // Nearest users first, each with `distance` in km; page with the X-Next-Cursor header
+  async getNearbyBuddies(params: { radius_km?: number; limit?: number; cursor?: string; lat?: number; lng?: number } = {}): Promise<ApiResponse<any[]>> {
+    const query = new URLSearchParams(
+      Object.entries(params)
+        .filter(([, value]) => value !== undefined)
+        .map(([key, value]) => [key, String(value)])
+    ).toString();
+    const response = await fetch(`${API_BASE_URL}/api/users/nearby${query ? `?${query}` : ''}`, {
+      headers: this.getHeaders(),
+    });
+    return this.handleResponse(response);
+  }
+
+  async updateMyLocation(latitude: number, longitude: number): Promise<ApiResponse<{ latitude: number; longitude: number }>> {
+    const response = await fetch(`${API_BASE_URL}/api/users/me/location`, {
+      method: 'PUT',
+      headers: this.getHeaders(),
+      body: JSON.stringify({ latitude, longitude }),
+    });
+    return this.handleResponse(response);
+  }
+
+  async getBuddyMatches(params: { radius_km?: number; limit?: number; skills?: string; lat?: number; lng?: number } = {}): Promise<ApiResponse<any[]>> {
+    const query = new URLSearchParams(
+      Object.entries(params)
+        .filter(([, value]) => value !== undefined)
+        .map(([key, value]) => [key, String(value)])
+    ).toString();
+    const response = await fetch(`${API_BASE_URL}/api/users/matches${query ? `?${query}` : ''}`, {
+      headers: this.getHeaders(),
+    });
+    return this.handleResponse(response);
+  }
 }
 
 export const apiService = new ApiService();